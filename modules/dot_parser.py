@@ -0,0 +1,324 @@
+"""Read `terraform graph` DOT output into the graph JSON used by tfwrapper.
+
+`terraform graph` only emits a small DOT subset: a digraph containing graph
+attributes, node/edge default statements, (cluster) subgraphs, node
+statements and edge statements between quoted IDs. This module tokenizes
+that subset in a single pass and builds the same ``{objects, edges}``
+structure that ``dot -Txdot_json`` produces, without a Graphviz subprocess,
+temp file or JSON round-trip.
+
+Numbering follows Graphviz: subgraphs take the first ``_gvid`` values in
+declaration order, nodes follow in creation order, and edge ``_gvid`` values
+are ranked by (tail, head, creation order) while the ``edges`` list itself
+keeps creation order. Layout attributes (positions, sizes) are not produced;
+nothing downstream of ``_build_gvid_table`` reads them.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class DotParseError(ValueError):
+    """Raised when input falls outside the DOT subset this reader supports."""
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<comment>//[^\n]*|\#[^\n]*|/\*.*?\*/)
+    | (?P<quoted>"(?:[^"\\]|\\.)*")
+    | (?P<arrow>->|--)
+    | (?P<punct>[{}\[\];,=:])
+    | (?P<id>[A-Za-z_\x80-\uffff][A-Za-z_0-9\x80-\uffff]*|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?))
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_KEYWORDS = {"strict", "graph", "digraph", "subgraph", "node", "edge"}
+
+
+def _tokenize(text: str) -> Iterator[Tuple[str, str]]:
+    """Yield (kind, value) tokens. Quoted IDs are unescaped to kind 'id'."""
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise DotParseError(f"Unexpected character {text[pos]!r} at {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind in ("ws", "comment"):
+            continue
+        value = match.group()
+        if kind == "quoted":
+            # DOT only unescapes \" and line continuations; other backslash
+            # sequences (\N, \l ...) are kept verbatim like Graphviz does
+            yield "id", value[1:-1].replace('\\"', '"').replace("\\\n", "")
+        elif kind == "id" and value.lower() in _KEYWORDS:
+            yield "keyword", value.lower()
+        else:
+            yield kind, value
+    yield "eof", ""
+
+
+class _Subgraph:
+    def __init__(self, name: str, attrs: Dict[str, str], parent=None):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.gvid = 0
+        self.nodes: set = set()
+        self.edges: set = set()
+        self.directed = True
+        self.strict = False
+        # Default attributes from `node [...]` / `edge [...]` in this scope
+        self.node_defaults: Dict[str, str] = (
+            dict(parent.node_defaults) if parent else {}
+        )
+        self.edge_defaults: Dict[str, str] = (
+            dict(parent.edge_defaults) if parent else {}
+        )
+
+
+class _DotReader:
+    """Recursive-descent reader over the token stream."""
+
+    def __init__(self, tokens: Iterator[Tuple[str, str]]):
+        self._tokens = tokens
+        self._peek: Tuple[str, str] = next(tokens)
+        self.node_index: Dict[str, int] = {}
+        self.node_attrs: List[Dict[str, str]] = []
+        self.node_names: List[str] = []
+        self.edges: List[Tuple[int, int, Dict[str, str]]] = []
+        self.subgraphs: List[_Subgraph] = []
+        self._anonymous = 0
+        self._pending_id = ""
+
+    # -- token helpers -------------------------------------------------
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek
+        if token[0] != "eof":
+            self._peek = next(self._tokens)
+        return token
+
+    def _accept(self, kind: str, value: Optional[str] = None) -> bool:
+        if self._peek[0] == kind and (value is None or self._peek[1] == value):
+            self._next()
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Optional[str] = None) -> str:
+        token = self._next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise DotParseError(f"Expected {value or kind}, found {token[1]!r}")
+        return token[1]
+
+    def _anonymous_name(self) -> str:
+        self._anonymous += 1
+        return f"%{self._anonymous}"
+
+    # -- grammar ---------------------------------------------------------
+
+    def read_graph(self) -> _Subgraph:
+        strict = self._accept("keyword", "strict")
+        kind = self._expect("keyword")
+        if kind not in ("digraph", "graph"):
+            raise DotParseError(f"Expected graph or digraph, found {kind!r}")
+        name = self._next()[1] if self._peek[0] == "id" else self._anonymous_name()
+        root = _Subgraph(name, {})
+        root.directed = kind == "digraph"
+        root.strict = strict
+        self._expect("punct", "{")
+        self._read_stmts(root)
+        self._expect("punct", "}")
+        if self._peek[0] != "eof":
+            raise DotParseError(f"Unexpected {self._peek[1]!r} after graph body")
+        return root
+
+    def _read_stmts(self, scope: _Subgraph) -> None:
+        while not (self._peek[0] == "punct" and self._peek[1] == "}"):
+            if self._peek[0] == "eof":
+                raise DotParseError("Unexpected end of input")
+            self._read_stmt(scope)
+            self._accept("punct", ";")
+
+    def _read_attr_list(self) -> Dict[str, str]:
+        attrs: Dict[str, str] = {}
+        while self._accept("punct", "["):
+            while not self._accept("punct", "]"):
+                key = self._expect("id")
+                value = "true"
+                if self._accept("punct", "="):
+                    value = self._expect("id")
+                attrs[key] = value
+                if not self._accept("punct", ","):
+                    self._accept("punct", ";")
+        return attrs
+
+    def _read_stmt(self, scope: _Subgraph) -> None:
+        kind, value = self._peek
+        if kind == "keyword" and value in ("graph", "node", "edge"):
+            self._next()
+            attrs = self._read_attr_list()
+            if value == "graph":
+                scope.attrs.update(attrs)
+            elif value == "node":
+                scope.node_defaults.update(attrs)
+            else:
+                scope.edge_defaults.update(attrs)
+            return
+        if (
+            kind == "id"
+            or (kind == "keyword" and value == "subgraph")
+            or (kind == "punct" and value == "{")
+        ):
+            first = self._read_endpoint(scope)
+            if first is None and self._accept("punct", "="):
+                # `ID = ID` graph attribute assignment
+                scope.attrs[self._pending_id] = self._expect("id")
+                return
+            if first is None:
+                first = [self._node(self._pending_id, scope)]
+            self._read_edges_or_node(scope, first)
+            return
+        raise DotParseError(f"Unexpected {value!r}")
+
+    def _read_endpoint(self, scope: _Subgraph) -> Optional[List[int]]:
+        """Read a node ID or subgraph.
+
+        Returns the node gvids for a subgraph, or None for a bare ID (kept
+        in self._pending_id so the caller can decide between an attribute
+        assignment and a node statement).
+        """
+        if self._peek[0] == "id":
+            self._pending_id = self._next()[1]
+            # Ports (`"a":p`) carry no meaning for terraform graphs
+            while self._accept("punct", ":"):
+                self._expect("id")
+            return None
+        return sorted(self._read_subgraph(scope).nodes)
+
+    def _read_subgraph(self, parent: _Subgraph) -> _Subgraph:
+        name = None
+        if self._accept("keyword", "subgraph") and self._peek[0] == "id":
+            name = self._next()[1]
+        sub = _Subgraph(name or self._anonymous_name(), dict(parent.attrs), parent)
+        self.subgraphs.append(sub)
+        self._expect("punct", "{")
+        self._read_stmts(sub)
+        self._expect("punct", "}")
+        return sub
+
+    def _node(self, name: str, scope: _Subgraph) -> int:
+        gvid = self.node_index.get(name)
+        if gvid is None:
+            gvid = len(self.node_names)
+            self.node_index[name] = gvid
+            self.node_names.append(name)
+            attrs = {"label": "\\N"}
+            attrs.update(scope.node_defaults)
+            self.node_attrs.append(attrs)
+        sub = scope
+        while sub is not None:
+            sub.nodes.add(gvid)
+            sub = sub.parent
+        return gvid
+
+    def _read_edges_or_node(self, scope: _Subgraph, first: List[int]) -> None:
+        chain = [first]
+        while self._peek[0] == "arrow":
+            self._next()
+            endpoint = self._read_endpoint(scope)
+            if endpoint is None:
+                endpoint = [self._node(self._pending_id, scope)]
+            chain.append(endpoint)
+        attrs = self._read_attr_list()
+        if len(chain) == 1:
+            for gvid in first:
+                self.node_attrs[gvid].update(attrs)
+            return
+        edge_attrs = dict(scope.edge_defaults)
+        edge_attrs.update(attrs)
+        for tails, heads in zip(chain, chain[1:]):
+            for tail in tails:
+                for head in heads:
+                    index = len(self.edges)
+                    self.edges.append((tail, head, edge_attrs))
+                    sub = scope
+                    while sub is not None:
+                        sub.edges.add(index)
+                        sub = sub.parent
+
+
+def parse_dot(text: str) -> Dict[str, Any]:
+    """Parse DOT text into the xdot_json-style ``{objects, edges}`` dict.
+
+    Raises:
+        DotParseError: If the text is not in the supported DOT subset.
+    """
+    reader = _DotReader(_tokenize(text))
+    root = reader.read_graph()
+    subgraph_count = len(reader.subgraphs)
+    for gvid, sub in enumerate(reader.subgraphs):
+        sub.gvid = gvid
+
+    # Edge _gvid is the position in (tail, head, creation) order
+    edge_order = sorted(
+        range(len(reader.edges)),
+        key=lambda i: (reader.edges[i][0], reader.edges[i][1], i),
+    )
+    edge_gvid = [0] * len(reader.edges)
+    for gvid, index in enumerate(edge_order):
+        edge_gvid[index] = gvid
+
+    out_edges: Dict[int, List[int]] = {}
+    for index, (tail, _, _) in enumerate(reader.edges):
+        out_edges.setdefault(tail, []).append(index)
+
+    objects: List[Dict[str, Any]] = []
+    for sub in reader.subgraphs:
+        nodes = sub.nodes
+        # Subgraphs also own edges between their member nodes, as clusters
+        # do once Graphviz has laid the graph out
+        edges = set(sub.edges)
+        for tail in nodes:
+            for index in out_edges.get(tail, []):
+                if reader.edges[index][1] in nodes:
+                    edges.add(index)
+        obj: Dict[str, Any] = {"name": sub.name}
+        obj.update(sub.attrs)
+        obj["_gvid"] = sub.gvid
+        obj["nodes"] = sorted(gvid + subgraph_count for gvid in nodes)
+        obj["edges"] = sorted(edge_gvid[i] for i in edges)
+        objects.append(obj)
+    for gvid, name in enumerate(reader.node_names):
+        obj = {"_gvid": gvid + subgraph_count, "name": name}
+        obj.update(reader.node_attrs[gvid])
+        objects.append(obj)
+
+    edges_out = []
+    for index, (tail, head, attrs) in enumerate(reader.edges):
+        edge = {
+            "_gvid": edge_gvid[index],
+            "tail": tail + subgraph_count,
+            "head": head + subgraph_count,
+        }
+        edge.update(attrs)
+        edges_out.append(edge)
+
+    graph: Dict[str, Any] = {
+        "name": root.name,
+        "directed": root.directed,
+        "strict": root.strict,
+    }
+    graph.update(root.attrs)
+    graph["_subgraph_cnt"] = subgraph_count
+    graph["objects"] = objects
+    graph["edges"] = edges_out
+    return graph
+
+
+def parse_dot_file(path: str) -> Dict[str, Any]:
+    """Read and parse a DOT file written by `terraform graph`."""
+    with open(path, "r", encoding="utf8") as f:
+        return parse_dot(f.read())
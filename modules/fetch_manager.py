@@ -0,0 +1,204 @@
+"""Pooled HTTP access for module registry lookups, downloads and clones.
+
+fileparser resolves the modules found in each parse wave on a thread pool
+(TERRAVISION_FETCH_WORKERS), so several registry lookups, archive downloads
+and git clones can run at once. Routing them through this module gives
+them:
+
+- one ``requests.Session`` per scheme and host, so connections are kept
+  alive and reused across lookups instead of reopened for every call;
+- a per-host concurrency limit, so a burst of modules from one registry or
+  Git host does not trip its rate limiting;
+- de-duplication of identical in-flight GET/HEAD requests: threads asking
+  for the same URL while a request is running wait for it and share its
+  response.
+
+Environment overrides:
+
+    TERRAVISION_FETCH_PER_HOST=4    concurrent requests/clones per host
+"""
+
+import contextlib
+import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_PER_HOST = 4
+
+# git@github.com:org/repo.git
+_SCP_HOST_RE = re.compile(r"^(?:[\w.-]+@)?([\w.-]+):(?!//)")
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_inflight: Dict[Tuple[Any, ...], Future] = {}
+
+
+def per_host_limit() -> int:
+    """Return the per-host concurrency limit from TERRAVISION_FETCH_PER_HOST."""
+    try:
+        return max(1, int(os.environ.get("TERRAVISION_FETCH_PER_HOST", "")))
+    except ValueError:
+        return DEFAULT_PER_HOST
+
+
+def host_key(url: str) -> str:
+    """Return 'scheme://host[:port]' for url, or '' for local paths.
+
+    SCP-style git addresses (git@host:org/repo) map to 'ssh://host'.
+    """
+    for prefix in ("git::", "s3::", "gcs::"):
+        if url.startswith(prefix):
+            url = url[len(prefix) :]
+    if "://" in url:
+        parsed = urlparse(url)
+        if parsed.scheme == "file" or not parsed.netloc:
+            return ""
+        return f"{parsed.scheme}://{parsed.netloc.rsplit('@', 1)[-1]}".lower()
+    match = _SCP_HOST_RE.match(url)
+    if match and not os.path.exists(url):
+        return f"ssh://{match.group(1)}".lower()
+    return ""
+
+
+def session_for(url: str) -> requests.Session:
+    """Return the shared session for url's host, creating it on first use."""
+    key = host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=per_host_limit())
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+    return session
+
+
+@contextlib.contextmanager
+def host_slot(url: str) -> Iterator[None]:
+    """Hold one of the per-host concurrency slots for url's host.
+
+    Local paths are not limited.
+    """
+    key = host_key(url)
+    if not key:
+        yield
+        return
+    with _lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            slot = _host_slots[key] = threading.BoundedSemaphore(per_host_limit())
+    with slot:
+        yield
+
+
+def _request_key(method: str, url: str, kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+    headers = tuple(sorted((kwargs.get("headers") or {}).items()))
+    return (
+        method,
+        url,
+        headers,
+        kwargs.get("allow_redirects", True),
+        repr(kwargs.get("params")),
+    )
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Send a request through the host's shared session.
+
+    GET and HEAD requests without ``stream=True`` are de-duplicated: a
+    caller asking for a request that is already running waits for it and
+    receives the same response object. Treat responses as read-only.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        **kwargs: Passed to ``requests.Session.request``
+
+    Returns:
+        The response
+
+    Raises:
+        requests.RequestException: As raised by requests
+    """
+    method = method.upper()
+    if method not in ("GET", "HEAD") or kwargs.get("stream"):
+        with host_slot(url):
+            return session_for(url).request(method, url, **kwargs)
+
+    key = _request_key(method, url, kwargs)
+    with _lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        with host_slot(url):
+            response = session_for(url).request(method, url, **kwargs)
+        future.set_result(response)
+        return response
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Shorthand for request('GET', url, ...)."""
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs: Any) -> requests.Response:
+    """Shorthand for request('HEAD', url, ...)."""
+    return request("HEAD", url, **kwargs)
+
+
+@contextlib.contextmanager
+def stream(url: str, **kwargs: Any) -> Iterator[requests.Response]:
+    """GET url with stream=True, holding a host slot until the body is read.
+
+    Yields:
+        The response; read it with iter_content() or response.raw
+
+    Raises:
+        requests.RequestException: On connection errors or an HTTP error status
+    """
+    with host_slot(url):
+        with session_for(url).get(url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            yield response
+
+
+def download(
+    url: str, fileobj: IO[bytes], chunk_size: int = 1 << 16, **kwargs: Any
+) -> requests.Response:
+    """Stream url's body into fileobj.
+
+    Raises:
+        requests.RequestException: On connection errors or an HTTP error status
+    """
+    with stream(url, **kwargs) as response:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            fileobj.write(chunk)
+    return response
+
+
+def close() -> None:
+    """Close every pooled session (they are recreated on next use)."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _host_slots.clear()
+    for session in sessions:
+        session.close()
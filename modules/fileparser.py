@@ -5,31 +5,31 @@ and annotation files (YAML). It discovers files from local directories or Git
 repositories, parses HCL2 syntax, and extracts resources, modules, and variables.
 """
 
-import io
+import functools
 import json
+import multiprocessing
 import os
 import re
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from sys import exit
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Deque, Dict, Iterable, List, Set, Tuple, Any, Optional
 
 import click
 import yaml
-import hcl2
 
 import modules.gitlibs as gitlibs
+import modules.hcl_parser as hcl_parser
+import modules.parse_cache as parse_cache
+import modules.source_walker as source_walker
 
 # Global module-level variables
 annotations: Dict[str, Any] = dict()
 ai_annotations: Dict[str, Any] = dict()
-# Comments harvested from raw .tf files. Keyed by "<type>.<name>" when a
-# comment block sits directly above a resource declaration; bare module
-# /file-level intent is parked in tf_unattached_comments. Both buckets
-# accumulate across iterative_parse() calls so a project with multiple
-# nested modules collects everything.
-tf_comments: Dict[str, str] = dict()
-tf_unattached_comments: List[str] = list()
 start_dir: Path = Path.cwd()
 temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory(
     dir=tempfile.gettempdir()
@@ -53,6 +53,10 @@ EXTRACT: List[str] = [
     "provider",
 ]
 
+# A parse wave with fewer files than this is parsed in-process; below it the
+# cost of starting worker processes outweighs the parallel speedup.
+PARALLEL_PARSE_MIN_FILES: int = 8
+
 
 # Match a `resource "<type>" "<name>" {` declaration. We deliberately do
 # not try to handle every HCL edge case — quoted braces inside attribute
@@ -135,6 +139,64 @@ def _extract_comments_from_tf(
     return per_resource, unattached
 
 
+@functools.lru_cache(maxsize=4096)
+def _file_comments(
+    filename: str, mtime_ns: int, size: int
+) -> Tuple[Tuple[Tuple[str, str], ...], Tuple[str, ...]]:
+    """Harvest one file's comments; keyed on mtime and size so edits miss."""
+    try:
+        with open(filename, "r", encoding="utf8") as f:
+            per_resource, unattached = _extract_comments_from_tf(f.read())
+    except (OSError, UnicodeDecodeError):
+        return (), ()
+    return tuple(per_resource.items()), tuple(unattached)
+
+
+def harvest_comments(filenames: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Collect human-authored comments from Terraform files.
+
+    Python-hcl2 drops comments, so they are read from the raw files with
+    _extract_comments_from_tf. Only the AI annotation context needs them,
+    so this runs on demand rather than during parsing. Results are cached
+    per file until its mtime or size changes.
+
+    Args:
+        filenames: Terraform files, in parse order
+
+    Returns:
+        Tuple of (resource key to comment, with the first file's comment
+        winning for a key; comment lines not bound to a resource)
+    """
+    per_resource: Dict[str, str] = {}
+    unattached: List[str] = []
+    for filename in filenames:
+        try:
+            info = os.stat(filename)
+        except OSError:
+            continue
+        comments, lines = _file_comments(filename, info.st_mtime_ns, info.st_size)
+        for key, comment in comments:
+            per_resource.setdefault(key, comment)
+        unattached.extend(lines)
+    return per_resource, unattached
+
+
+def ensure_comments(tfdata: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill tfdata["tf_comments"] and ["tf_unattached_comments"] if missing.
+
+    Harvests the files recorded in tfdata["source_files"] during parsing.
+    Comments already present (e.g. in a replayed tfdata.json) are kept.
+
+    Returns:
+        tfdata
+    """
+    if "tf_comments" not in tfdata or "tf_unattached_comments" not in tfdata:
+        comments, unattached = harvest_comments(tfdata.get("source_files") or [])
+        tfdata.setdefault("tf_comments", comments)
+        tfdata.setdefault("tf_unattached_comments", unattached)
+    return tfdata
+
+
 def _load_terraform_modules_json(source_dir: str) -> Dict[str, str]:
     """Load Terraform's modules.json and return module key to directory mapping.
 
@@ -265,16 +327,14 @@ def find_tf_files(
                 yaml_detected = True
                 annotations = yaml.safe_load(fh)
 
-    # Recursively search subdirectories if requested
+    # Recursively search subdirectories if requested, skipping ignored
+    # folders (.terraform, .git, .terraformignore entries, ...)
     if recursive:
-        for root, dir, files in os.walk(source_location):
-            for d in dir:
-                subdir = os.path.join(root, d)
-                for file in os.listdir(subdir):
-                    if file.lower().endswith(".tf") or file.lower().endswith(
-                        "auto.tfvars"
-                    ):
-                        paths.append(os.path.join(subdir, file))
+        for found in source_walker.walk(
+            source_location, suffixes=(".tf", "auto.tfvars")
+        ):
+            if "/" in found.relpath:
+                paths.append(found.path)
 
     # Validate that files were found
     if len(paths) == 0:
@@ -334,6 +394,261 @@ def handle_module(
     return {"tf_file_paths": tf_file_paths, "module_source_dict": module_source_dict}
 
 
+def _parse_workers() -> int:
+    """Return the HCL parse pool size.
+
+    Read from TERRAVISION_PARSE_WORKERS, defaulting to the CPU count. A value
+    of 1 parses every file in-process.
+    """
+    try:
+        workers = int(os.environ.get("TERRAVISION_PARSE_WORKERS", "0"))
+    except ValueError:
+        workers = 0
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _parse_tf_file(filename: str) -> Dict[str, Any]:
+    """Read, comment-scan and parse one Terraform file.
+
+    Runs in parse pool workers, so it only touches its arguments and returns
+    plain picklable data. Errors are returned rather than raised so the
+    parent can report them in file order. Results are looked up in and
+    stored to the parsed-HCL cache (modules/parse_cache.py) by content hash.
+    Comments are not harvested here; see harvest_comments().
+
+    Args:
+        filename: Path to the .tf or .tfvars file
+
+    Returns:
+        Dict with 'read_error', or with 'hcl' and 'parse_error' (hcl is
+        None when both parse attempts failed)
+    """
+    try:
+        with click.open_file(filename, "r", encoding="utf8") as f:
+            raw_content = f.read()
+    except OSError as read_err:
+        return {"read_error": read_err}
+
+    cache_key = parse_cache.cache_key(raw_content) if parse_cache.is_enabled() else ""
+    if cache_key:
+        cached = parse_cache.load(cache_key)
+        if cached is not None:
+            return cached
+
+    result: Dict[str, Any] = {"hcl": None, "parse_error": None}
+    # Attempt to parse HCL2 content
+    try:
+        result["hcl"] = hcl_parser.loads(raw_content)
+    except Exception:
+        # Retry with preprocessed content to fix known parser limitations
+        try:
+            preprocessed = _preprocess_hcl(raw_content)
+            result["hcl"] = hcl_parser.loads(preprocessed)
+        except Exception as error:
+            result["parse_error"] = str(error)
+    if cache_key:
+        parse_cache.store(cache_key, result)
+    return result
+
+
+def _start_parse_pool(start_workers: bool = False) -> Optional[ProcessPoolExecutor]:
+    """Create the HCL parse pool, or return None to parse in-process.
+
+    Args:
+        start_workers: Start the worker processes now rather than on the
+            first parse, e.g. before threads that must not be forked exist
+    """
+    workers = _parse_workers()
+    if workers < 2:
+        return None
+    # Load the parser before workers fork so they inherit it
+    hcl_parser.get_parser()
+    context = None
+    if threading.active_count() > 1 and (
+        "forkserver" in multiprocessing.get_all_start_methods()
+    ):
+        # Forking while other threads run can deadlock the child
+        context = multiprocessing.get_context("forkserver")
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        if start_workers:
+            executor.submit(int).result()
+    except (BrokenProcessPool, OSError, NotImplementedError):
+        # No working multiprocessing primitives (e.g. no /dev/shm)
+        return None
+    return executor
+
+
+def _parse_files(
+    filenames: List[str], executor: Optional[ProcessPoolExecutor]
+) -> Tuple[List[Dict[str, Any]], Optional[ProcessPoolExecutor]]:
+    """Parse files with _parse_tf_file, in the pool when one is given.
+
+    Results are returned in the order of filenames. If the pool cannot run
+    (workers killed, process creation refused) it is shut down and the files
+    are parsed in-process instead.
+
+    Returns:
+        Tuple of (results, executor to use for later waves)
+    """
+    if executor is not None:
+        chunksize = max(1, len(filenames) // (_parse_workers() * 4))
+        try:
+            return (
+                list(executor.map(_parse_tf_file, filenames, chunksize=chunksize)),
+                executor,
+            )
+        except (BrokenProcessPool, OSError, NotImplementedError):
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = None
+    return [_parse_tf_file(filename) for filename in filenames], executor
+
+
+def _merge_parsed_file(
+    filename: str,
+    result: Dict[str, Any],
+    hcl_dict: Dict[str, Any],
+    extract_sections: List[str],
+    tfdata: Dict[str, Any],
+    tf_mod_dir: str,
+) -> List[Tuple[str, str, str]]:
+    """Merge one parsed file into tfdata and list the modules it calls.
+
+    Args:
+        filename: Path of the parsed file
+        result: Output of _parse_tf_file for filename
+        hcl_dict: Dictionary to store parsed HCL content
+        extract_sections: List of section names to extract
+        tfdata: Main data dictionary to populate with parsed content
+        tf_mod_dir: Directory containing Terraform modules
+
+    Returns:
+        (module_name, modpath, version_constraint) for each module block, in
+        declaration order, for the caller to discover the module's files
+    """
+    click.echo(f"  Parsing {filename}")
+    if "read_error" in result:
+        print("Could not read Terraform file:", filename, result["read_error"])
+        return []
+
+    # Kept so comments can be harvested later if they are asked for
+    tfdata.setdefault("source_files", []).append(filename)
+
+    if result["hcl"] is None:
+        click.echo(
+            click.style(
+                f"    WARNING: HCL parsing error in {filename} "
+                f"({result['parse_error']}); "
+                "resources declared in this file will be skipped",
+                fg="yellow",
+            )
+        )
+        return []
+    hcl_dict[filename] = result["hcl"]
+
+    modules_found: List[Tuple[str, str, str]] = []
+    # Extract specified sections from parsed HCL
+    for section in extract_sections:
+        if section in hcl_dict[filename]:
+            section_name = "all_" + section
+            if section_name not in tfdata.keys():
+                tfdata[section_name] = {}
+            tfdata[section_name][filename] = hcl_dict[filename][section]
+            click.echo(
+                click.style(
+                    f"    Found {len(hcl_dict[filename][section])} {section} stanza(s)",
+                    fg="green",
+                )
+            )
+
+            # Discover nested modules
+            if section == "module":
+                for mod_dict in hcl_dict[filename]["module"]:
+                    module_name = next(iter(mod_dict))
+                    modpath = os.path.join(tf_mod_dir, module_name)
+                    sourcemod = mod_dict[module_name]["source"]
+                    version_constraint = mod_dict[module_name].get("version", "")
+
+                    # Handle relative module paths. Resolved without chdir,
+                    # which would move the cwd under running fetch threads.
+                    if sourcemod.startswith("."):
+                        modpath = os.path.abspath(
+                            os.path.join(os.path.dirname(filename), sourcemod)
+                        )
+
+                    # Fallback to source if module directory doesn't exist
+                    if not os.path.isdir(modpath):
+                        modpath = mod_dict[module_name]["source"]
+
+                    modules_found.append((module_name, modpath, version_constraint))
+                    # Store source path for downstream module matching.
+                    # Local modules use the resolved absolute path (matches
+                    # file paths for resource-to-module association).
+                    # Remote modules store the source string (preserves
+                    # existing behavior where plan/graph data provides
+                    # module prefixes).
+                    if sourcemod.startswith("."):
+                        tfdata["module_source_dict"][module_name] = str(modpath)
+                    else:
+                        tfdata["module_source_dict"][module_name] = sourcemod
+    return modules_found
+
+
+def _fetch_workers() -> int:
+    """Return how many remote modules may be fetched at once.
+
+    Read from TERRAVISION_FETCH_WORKERS (default 8).
+    """
+    try:
+        workers = int(os.environ.get("TERRAVISION_FETCH_WORKERS", "8"))
+    except ValueError:
+        workers = 8
+    return max(workers, 1)
+
+
+def _discover_module(
+    module_name: str,
+    modpath: str,
+    version_constraint: str,
+    terraform_modules: Dict[str, str],
+    fetches: Dict[Tuple[str, str, str], "Future[List[str]]"],
+    fetch_pool: ThreadPoolExecutor,
+) -> "Future[List[str]]":
+    """Start finding a module's files.
+
+    Local module folders are listed straight away. Remote modules are
+    fetched on fetch_pool, so several clones and downloads run while the
+    caller keeps parsing. A remote module that was already requested with
+    the same name and version reuses that fetch.
+
+    Returns:
+        Future of the module's file paths
+    """
+    if os.path.isdir(modpath):
+        future: "Future[List[str]]" = Future()
+        future.set_result(
+            find_tf_files(
+                modpath,
+                [],
+                module_name,
+                version=version_constraint,
+                terraform_modules=terraform_modules,
+            )
+        )
+        return future
+    key = (modpath, module_name, version_constraint)
+    if key not in fetches:
+        fetches[key] = fetch_pool.submit(
+            find_tf_files,
+            modpath,
+            [],
+            module_name,
+            version=version_constraint,
+            terraform_modules=terraform_modules,
+        )
+    return fetches[key]
+
+
 def iterative_parse(
     tf_file_paths: List[str],
     hcl_dict: Dict[str, Any],
@@ -375,108 +690,69 @@ def iterative_parse(
             f"{len(terraform_modules)} module(s)"
         )
 
-    # Parse each Terraform file
-    for filename in tf_file_paths:
-        filepath = Path(filename)
-        fname = filepath.parent.name + "/" + filepath.name
-        click.echo(f"  Parsing {filename}")
-
-        # Read the raw text once so we can both parse it as HCL AND
-        # harvest line comments out of it. python-hcl2 strips comments
-        # during parsing, so the only way to surface human documentation
-        # to downstream consumers (the AI annotation context block in
-        # particular) is to scan the raw source ourselves before handing
-        # it to the parser.
-        try:
-            with click.open_file(filename, "r", encoding="utf8") as f:
-                raw_content = f.read()
-        except OSError as read_err:
-            print("Could not read Terraform file:", filename, read_err)
-            continue
-
-        per_resource, unattached = _extract_comments_from_tf(raw_content)
-        if per_resource:
-            for key, comment in per_resource.items():
-                tf_comments.setdefault(key, comment)
-        if unattached:
-            tf_unattached_comments.extend(unattached)
-
-        # Attempt to parse HCL2 content
-        try:
-            hcl_dict[filename] = hcl2.load(io.StringIO(raw_content))
-        except Exception:
-            # Retry with preprocessed content to fix known parser limitations
-            try:
-                preprocessed = _preprocess_hcl(raw_content)
-                hcl_dict[filename] = hcl2.load(io.StringIO(preprocessed))
-            except Exception as error:
-                click.echo(
-                    click.style(
-                        f"    WARNING: HCL parsing error in {filename} ({error}); "
-                        "resources declared in this file will be skipped",
-                        fg="yellow",
-                    )
-                )
-                continue
-
-        # Extract specified sections from parsed HCL
-        for section in extract_sections:
-            if section in hcl_dict[filename]:
-                section_name = "all_" + section
-                if section_name not in tfdata.keys():
-                    tfdata[section_name] = {}
-                tfdata[section_name][filename] = hcl_dict[filename][section]
-                click.echo(
-                    click.style(
-                        f"    Found {len(hcl_dict[filename][section])} {section} stanza(s)",
-                        fg="green",
-                    )
-                )
-
-                # Discover and process nested modules
-                if section == "module":
-                    for mod_dict in hcl_dict[filename]["module"]:
-                        module_name = next(iter(mod_dict))
-                        modpath = os.path.join(tf_mod_dir, module_name)
-                        sourcemod = mod_dict[module_name]["source"]
-                        version_constraint = mod_dict[module_name].get("version", "")
-
-                        # Handle relative module paths
-                        if sourcemod.startswith("."):
-                            curdir = os.getcwd()
-                            os.chdir(os.path.dirname(filename))
-                            modpath = os.path.abspath(sourcemod)
-                            os.chdir(curdir)
-
-                        # Fallback to source if module directory doesn't exist
-                        if not os.path.isdir(modpath):
-                            modpath = mod_dict[module_name]["source"]
-
-                        # Recursively find files in module directory
-                        source_files_list = find_tf_files(
-                            modpath,
-                            [],
-                            module_name,
-                            version=version_constraint,
-                            terraform_modules=terraform_modules,
+    # Breadth-first work queue. Files are parsed in waves: each wave is every
+    # file queued but not parsed yet, parsed concurrently, then merged in
+    # list order. Modules found while merging are discovered in the
+    # background; their files join the queue in discovery order (deduped
+    # with a seen-set), as soon as the fetches ahead of them are done, so
+    # tfdata and console output match a one-file-at-a-time parse.
+    seen = set(tf_file_paths)
+    discovered: Deque["Future[List[str]]"] = deque()
+    fetches: Dict[Tuple[str, str, str], "Future[List[str]]"] = dict()
+    fetch_pool: Optional[ThreadPoolExecutor] = None
+    executor: Optional[ProcessPoolExecutor] = None
+    pool_started = False
+    parsed_count = 0
+    try:
+        while True:
+            # Block on the oldest fetch only when nothing is left to parse
+            while discovered and (
+                discovered[0].done() or parsed_count == len(tf_file_paths)
+            ):
+                for path in discovered.popleft().result():
+                    if path not in seen:
+                        seen.add(path)
+                        tf_file_paths.append(path)
+            if parsed_count == len(tf_file_paths):
+                break
+            wave = tf_file_paths[parsed_count:]
+            parsed_count = len(tf_file_paths)
+            if not pool_started and len(wave) >= PARALLEL_PARSE_MIN_FILES:
+                # Started at most once; a pool that broke stays off
+                executor = _start_parse_pool()
+                pool_started = True
+            results, executor = _parse_files(wave, executor)
+            for filename, result in zip(wave, results):
+                for module_name, modpath, version_constraint in _merge_parsed_file(
+                    filename, result, hcl_dict, extract_sections, tfdata, tf_mod_dir
+                ):
+                    if fetch_pool is None and not os.path.isdir(modpath):
+                        if not pool_started:
+                            # Fork parse workers before fetch threads exist
+                            executor = _start_parse_pool(start_workers=True)
+                            pool_started = True
+                        fetch_pool = ThreadPoolExecutor(
+                            max_workers=_fetch_workers(),
+                            thread_name_prefix="module-fetch",
                         )
-                        existing_files = list(tf_file_paths)
-                        tf_file_paths.extend(
-                            x for x in source_files_list if x not in existing_files
+                    discovered.append(
+                        _discover_module(
+                            module_name,
+                            modpath,
+                            version_constraint,
+                            terraform_modules,
+                            fetches,
+                            fetch_pool,
                         )
-                        # Store source path for downstream module matching.
-                        # Local modules use the resolved absolute path (matches
-                        # file paths for resource-to-module association).
-                        # Remote modules store the source string (preserves
-                        # existing behavior where plan/graph data provides
-                        # module prefixes).
-                        if sourcemod.startswith("."):
-                            tfdata["module_source_dict"][module_name] = str(modpath)
-                        else:
-                            tfdata["module_source_dict"][module_name] = sourcemod
+                    )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if fetch_pool is not None:
+            fetch_pool.shutdown(cancel_futures=True)
 
     # Handle duplicate module references
-    oldpath: List[str] = []
+    oldpath: Set[str] = set()
     for module, modpath in tfdata["module_source_dict"].items():
         if modpath in oldpath:
             # Module called multiple times - duplicate resources
@@ -487,7 +763,7 @@ def iterative_parse(
                         tfdata["all_resource"][filepath][0]
                     )
         else:
-            oldpath.append(modpath)
+            oldpath.add(modpath)
 
     return tfdata
 
@@ -511,7 +787,7 @@ def load_varfile_values(varfile_list: List[str]) -> Dict[str, Any]:
     for varfile in varfile_list:
         try:
             with click.open_file(varfile, encoding="utf8", mode="r") as f:
-                variable_values = hcl2.load(f)
+                variable_values = hcl_parser.loads(f.read())
         except Exception as exc:
             click.echo(
                 click.style(
@@ -550,15 +826,6 @@ def read_tfsource(
     """
     global annotations
     global ai_annotations
-    global tf_comments
-    global tf_unattached_comments
-
-    # Reset the comment buckets at the start of each parse run so a
-    # second invocation in the same Python process doesn't ship stale
-    # comments from a previous source. The annotation globals are
-    # intentionally NOT reset (existing behaviour for backwards compat).
-    tf_comments = dict()
-    tf_unattached_comments = list()
 
     click.echo(click.style("\nParsing Terraform Source Files..", fg="white", bold=True))
 
@@ -615,6 +882,9 @@ def read_tfsource(
     if len(varfile_list) == 0 and tfdata.get("all_variable"):
         varfile_list = list(tfdata["all_variable"].keys())
 
+    if parse_cache.is_enabled():
+        parse_cache.prune()
+
     tfdata["varfile_list"] = varfile_list
     # Capture varfile values now so --debug tfdata.json dumps embed them and
     # JSON replays can re-apply overrides without the original .tfvars files
@@ -622,8 +892,6 @@ def read_tfsource(
     tfdata["tempdir"] = temp_dir
     tfdata["annotations"] = annotations
     tfdata["ai_annotations"] = ai_annotations
-    tfdata["tf_comments"] = tf_comments
-    tfdata["tf_unattached_comments"] = tf_unattached_comments
 
     return tfdata
 
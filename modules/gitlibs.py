@@ -5,15 +5,19 @@ including Git repositories (GitHub, GitLab, Bitbucket), Terraform Registry, and
 Terraform Enterprise. Supports SSH, HTTPS, and registry URL formats.
 """
 
+import errno
+import functools
 import os
+import posixpath
+import re
 import shutil
 import stat
-import tarfile
 import tempfile
-import zipfile
+import threading
+import time
 from pathlib import Path
 from sys import exit
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Set, Tuple, Any, Optional
 from urllib.parse import urlparse
 
 import click
@@ -22,7 +26,14 @@ import requests
 from git import RemoteProgress
 from tqdm import tqdm
 
+import modules.archives as archives
+import modules.fetch_manager as fetch_manager
+import modules.hcl_parser as hcl_parser
 import modules.helpers as helpers
+import modules.materialize as materialize
+import modules.mirror as mirror
+import modules.module_cache as module_cache
+import modules.registry_cache as registry_cache
 from modules.helpers import *
 
 
@@ -42,8 +53,16 @@ def _resolve_version_constraint(constraint: str, versions: List[str]) -> Optiona
 
     Supports ~>, >=, <=, >, <, = operators and comma-separated constraints.
     Returns the latest version satisfying all constraints, or None.
+    Results are memoized, since many module blocks share a source and
+    constraint.
     """
-    constraint = constraint.strip()
+    return _resolve_version_constraint_cached(constraint.strip(), tuple(versions))
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_version_constraint_cached(
+    constraint: str, versions: Tuple[str, ...]
+) -> Optional[str]:
     if not constraint or not versions:
         return None
 
@@ -110,6 +129,14 @@ annotations: Dict[str, Any] = dict()
 abspath: str = os.path.abspath(__file__)
 dname: str = os.path.dirname(abspath)
 MODULE_DIR: str = str(Path(Path.home(), ".terravision", "module_cache"))
+# (source, version constraint) -> (resolved at, get_clone_url result) for
+# registry modules, reused by every module block with the same source
+_registry_resolutions: Dict[Tuple[str, str], Tuple[float, Tuple[str, str, str]]] = {}
+_registry_resolutions_lock = threading.Lock()
+# Module store key of each archive URL resolved through a registry's
+# /download endpoint: the registry module and version. Private registries
+# sign these URLs, so the URL changes on every request.
+_registry_store_keys: Dict[str, str] = {}
 
 # Create module cache directory if it doesn't exist
 if not os.path.exists(MODULE_DIR):
@@ -188,82 +215,93 @@ def _is_http_archive(url: str) -> bool:
     return any(clean.endswith(ext) for ext in ARCHIVE_EXTENSIONS)
 
 
-def _download_and_extract_archive(url: str, destination: str) -> None:
+def _download_and_extract_archive(
+    url: str, destination: str, subfolder: str = "", local_file: str = ""
+) -> str:
     """Download an archive from HTTP URL and extract it to destination.
 
     Supports .zip, .tar.gz, .tgz, .tar.bz2, .tbz2, .tar.xz, .txz, and .tar.
-    Handles s3:: and gcs:: prefixed URLs by stripping the prefix.
+    Handles s3:: and gcs:: prefixed URLs by stripping the prefix. Tarballs
+    are extracted while downloading (see modules/archives.py). A
+    ``?checksum=<type>:<hex>`` query parameter is verified.
 
     Args:
         url: HTTP URL to download the archive from
         destination: Local directory to extract archive contents into
+        subfolder: Extract only this archive folder, plus folders its modules
+            reference through relative sources ('' for everything)
+        local_file: Read the archive from this file (a mirrored copy)
+            instead of downloading it
+
+    Returns:
+        'sha256:<hex>' digest of the downloaded archive
     """
     # Strip s3::/gcs:: prefixes — the underlying URL is plain HTTP
     for prefix in ("s3::", "gcs::"):
         if url.startswith(prefix):
             url = url[len(prefix) :]
 
-    # Remove ?ref= or other query params from download URL
-    download_url = url.split("?")[0]
-
-    click.echo(f"  Downloading archive: {download_url}")
-
+    # Remove ?ref=, ?checksum= or other query params from download URL
     try:
-        resp = requests.get(download_url, stream=True, timeout=120)
-        resp.raise_for_status()
-    except Exception as e:
-        click.echo(
-            click.style(
-                f"\nERROR: Failed to download archive from {download_url}: {e}",
-                fg="red",
-                bold=True,
-            )
-        )
+        download_url, checksum = archives.parse_checksum(url)
+    except ValueError as e:
+        click.echo(click.style(f"\nERROR: {e} in {url}", fg="red", bold=True))
         exit(1)
 
-    # Write to a temp file, then extract
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        for chunk in resp.iter_content(chunk_size=8192):
-            tmp.write(chunk)
-        tmp_path = tmp.name
-
-    try:
-        os.makedirs(destination, exist_ok=True)
-
-        if download_url.endswith(".zip"):
-            with zipfile.ZipFile(tmp_path, "r") as zf:
-                zf.extractall(destination)
-        elif any(
-            download_url.endswith(ext)
-            for ext in (
-                ".tar.gz",
-                ".tgz",
-                ".tar.bz2",
-                ".tbz2",
-                ".tar.xz",
-                ".txz",
-                ".tar",
+    folders = {subfolder.strip("/")} if subfolder.strip("/") else set()
+    os.makedirs(destination, exist_ok=True)
+    while True:
+        try:
+            if local_file:
+                click.echo(f"  Extracting mirrored archive: {local_file}")
+                with open(local_file, "rb") as f:
+                    digest = archives.extract_stream(
+                        f, download_url, destination, folders, checksum
+                    )
+            else:
+                click.echo(f"  Downloading archive: {download_url}")
+                with fetch_manager.stream(download_url, timeout=120) as resp:
+                    resp.raw.decode_content = True
+                    digest = archives.extract_stream(
+                        resp.raw, download_url, destination, folders, checksum
+                    )
+        except archives.ChecksumError as e:
+            click.echo(
+                click.style(
+                    f"\nERROR: Archive {download_url} failed checksum verification: {e}",
+                    fg="red",
+                    bold=True,
+                )
             )
-        ):
-            with tarfile.open(tmp_path, "r:*") as tf:
-                try:
-                    tf.extractall(destination, filter="data")
-                except TypeError:
-                    # Python < 3.12 has no filter= parameter
-                    tf.extractall(destination)
-        else:
+            exit(1)
+        except ValueError as e:
+            click.echo(click.style(f"\nERROR: {e}", fg="red", bold=True))
+            exit(1)
+        except Exception as e:
             click.echo(
                 click.style(
-                    f"\nERROR: Unsupported archive format: {download_url}",
+                    f"\nERROR: Failed to download archive from {download_url}: {e}",
                     fg="red",
                     bold=True,
                 )
             )
             exit(1)
-
-        click.echo(click.style(f"  Extracted archive to {destination}", fg="green"))
-    finally:
-        os.unlink(tmp_path)
+        # Modules in the subfolder may use sibling folders ("../common");
+        # fetch again including them (rare, but the archive is not kept)
+        missing = set()
+        for folder in folders:
+            for target in _relative_module_dirs(destination, folder):
+                if not any(
+                    target == f or (f != "." and target.startswith(f + "/"))
+                    for f in folders
+                ):
+                    missing.add(target)
+        if not missing:
+            break
+        folders |= missing
+
+    click.echo(click.style(f"  Extracted archive to {destination}", fg="green"))
+    return digest
 
 
 def _is_git_hosting_url(sourceURL: str) -> bool:
@@ -309,6 +347,15 @@ def _select_registry_version(
 
     When no constraint is provided, returns the latest parseable version.
     """
+    return _select_registry_version_cached(
+        version_constraint, tuple(available_versions)
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _select_registry_version_cached(
+    version_constraint: str, available_versions: Tuple[str, ...]
+) -> Optional[str]:
     if not available_versions:
         return None
 
@@ -331,18 +378,25 @@ def _resolve_registry_download_url(
 
     Supports Artifactory's Terraform registry protocol, which returns the real
     archive URL via X-Terraform-Get on the /<version>/download endpoint.
+
+    This endpoint bypasses the registry cache: private registries (Artifactory,
+    TFC/TFE) answer with short-lived signed URLs that must not be replayed.
     """
     download_endpoint = f"{domain}{gitaddress}/{resolved_version}/download"
+    if registry_cache.is_offline():
+        raise registry_cache.OfflineError(
+            f"Offline mode: not requesting {download_endpoint}"
+        )
 
     try:
-        response = requests.head(
+        response = fetch_manager.head(
             download_endpoint,
             headers=headers,
             allow_redirects=False,
             timeout=10,
         )
     except requests.RequestException:
-        response = requests.get(
+        response = fetch_manager.get(
             download_endpoint,
             headers=headers,
             allow_redirects=False,
@@ -370,6 +424,58 @@ def _resolve_registry_download_url(
     return None
 
 
+def _resolve_registry_archive(
+    domain: str,
+    gitaddress: str,
+    resolved_version: str,
+    headers: Dict[str, str],
+    subfolder: str = "",
+) -> Optional[str]:
+    """Return the download URL of a registry module version for clone_files.
+
+    clone_files stores the module under the registry module and version
+    rather than under the download URL. In offline mode the download URL is
+    not requested; the version resolves to that store key if the module
+    store already holds it.
+
+    Raises:
+        registry_cache.OfflineError: In offline mode when the module store
+            does not hold this version
+    """
+    store_key = f"{domain}{gitaddress}/{resolved_version}"
+    if registry_cache.is_offline():
+        if not _stored_tree(store_key, "", subfolder):
+            raise registry_cache.OfflineError(
+                f"Offline mode: {gitaddress} {resolved_version} is not in the "
+                f"module store"
+            )
+        download_url: Optional[str] = store_key
+    else:
+        download_url = _resolve_registry_download_url(
+            domain, gitaddress, resolved_version, headers
+        )
+    if download_url:
+        with _registry_resolutions_lock:
+            _registry_store_keys[download_url] = store_key
+    return download_url
+
+
+def _is_git_prefix_url(sourceURL: str) -> bool:
+    """Check if a URL is an explicit git source (git::, git@git...)."""
+    return (
+        sourceURL.startswith("git::ssh://")
+        or sourceURL.startswith("git@git")
+        or "git::" in sourceURL
+    )
+
+
+def _is_registry_source(sourceURL: str) -> bool:
+    """Check if get_clone_url resolves a URL through a module registry."""
+    if _is_http_archive(sourceURL) or _is_git_prefix_url(sourceURL):
+        return False
+    return not (helpers.check_for_domain(sourceURL) and _is_git_hosting_url(sourceURL))
+
+
 def get_clone_url(sourceURL: str, version_constraint: str = "") -> Tuple[str, str, str]:
     """Parse source URL and extract git clone URL, subfolder, and tag.
 
@@ -389,12 +495,7 @@ def get_clone_url(sourceURL: str, version_constraint: str = "") -> Tuple[str, st
         return _handle_http_archive_url(sourceURL)
 
     # Check for git:: prefix (SSH or HTTPS git URLs)
-    is_git_prefix = (
-        sourceURL.startswith("git::ssh://")
-        or sourceURL.startswith("git@git")
-        or "git::" in sourceURL
-    )
-    if is_git_prefix:
+    if _is_git_prefix_url(sourceURL):
         return _handle_git_prefix_url(sourceURL)
 
     # Check for direct domain URLs (GitHub, GitLab, Bitbucket, etc.)
@@ -404,7 +505,45 @@ def get_clone_url(sourceURL: str, version_constraint: str = "") -> Tuple[str, st
         return _handle_domain_url(sourceURL)
 
     # Default to Terraform Registry (public or private) or plain HTTP Module URLs
-    return _handle_registry_url(sourceURL, version_constraint)
+    if mirror.is_enabled():
+        return _mirrored_registry_resolution(sourceURL, version_constraint)
+    memo_key = (sourceURL, version_constraint)
+    with _registry_resolutions_lock:
+        memo = _registry_resolutions.get(memo_key)
+    if memo and time.time() - memo[0] < registry_cache.default_ttl():
+        return memo[1]
+    resolved = _handle_registry_url(sourceURL, version_constraint)
+    with _registry_resolutions_lock:
+        _registry_resolutions[memo_key] = (time.time(), resolved)
+    return resolved
+
+
+def _mirrored_registry_resolution(
+    sourceURL: str, version_constraint: str = ""
+) -> Tuple[str, str, str]:
+    """Return the registry resolution recorded in the active mirror.
+
+    Exits with an error if the mirror has none; mirror mode never asks
+    the registry.
+    """
+    try:
+        resolved = mirror.lookup_registry(sourceURL, version_constraint)
+    except mirror.MirrorError as e:
+        click.echo(click.style(f"\nERROR: {e}", fg="red", bold=True))
+        exit(1)
+    if resolved is None:
+        constraint = f" (version {version_constraint})" if version_constraint else ""
+        click.echo(
+            click.style(
+                f"\nERROR: Registry module {sourceURL}{constraint} is not in the "
+                f"module mirror at {mirror.mirror_dir()}. Run 'terravision mirror "
+                f"sync' with network access to add it.",
+                fg="red",
+                bold=True,
+            )
+        )
+        exit(1)
+    return resolved
 
 
 def _handle_git_prefix_url(sourceURL: str) -> Tuple[str, str, str]:
@@ -489,8 +628,9 @@ def _handle_http_archive_url(sourceURL: str) -> Tuple[str, str, str]:
         remaining = url[protocol_end:]
         if "//" in remaining:
             repo_part, subfolder = remaining.split("//", 1)
-            subfolder = subfolder.split("?")[0]
-            url = url[:protocol_end] + repo_part
+            # Keep the query (e.g. ?checksum=) on the download URL
+            subfolder, _, query = subfolder.partition("?")
+            url = url[:protocol_end] + repo_part + (f"?{query}" if query else "")
 
     return url, subfolder, ""
 
@@ -589,7 +729,7 @@ def _handle_registry_url(
         # Terraform service discovery
         discovery_url = f"https://{hostname}/.well-known/terraform.json"
         try:
-            disc_resp = requests.get(discovery_url, timeout=10)
+            disc_resp = registry_cache.get(discovery_url, timeout=10)
             disc_resp.raise_for_status()
             discovery = disc_resp.json()
         except (requests.RequestException, ValueError):
@@ -657,7 +797,7 @@ def _handle_registry_url(
     # Fetch module source URL from registry API
     r: Optional[requests.Response] = None
     try:
-        r = requests.get(domain + gitaddress, headers=headers, timeout=10)
+        r = registry_cache.get(domain + gitaddress, headers=headers, timeout=10)
         resp_json = r.json()
         githubURL = resp_json.get("source", "")
     except (requests.RequestException, ValueError):
@@ -670,7 +810,9 @@ def _handle_registry_url(
     if not githubURL:
         versions_endpoint = f"{domain}{gitaddress}/versions"
         try:
-            versions_resp = requests.get(versions_endpoint, headers=headers, timeout=10)
+            versions_resp = registry_cache.get(
+                versions_endpoint, headers=headers, timeout=10
+            )
             versions_resp.raise_for_status()
             versions_json = versions_resp.json()
             available_versions = _extract_registry_versions(versions_json)
@@ -678,8 +820,8 @@ def _handle_registry_url(
                 version_constraint, available_versions
             )
             if resolved_version:
-                download_url = _resolve_registry_download_url(
-                    domain, gitaddress, resolved_version, headers
+                download_url = _resolve_registry_archive(
+                    domain, gitaddress, resolved_version, headers, subfolder
                 )
                 if download_url:
                     click.echo(
@@ -713,8 +855,11 @@ def _handle_registry_url(
         if resolved:
             # Fetch the specific version to get its git tag
             try:
-                ver_resp = requests.get(
-                    domain + gitaddress + "/" + resolved, headers=headers, timeout=10
+                ver_resp = registry_cache.get(
+                    domain + gitaddress + "/" + resolved,
+                    headers=headers,
+                    ttl=registry_cache.IMMUTABLE_TTL_SECONDS,
+                    timeout=10,
                 )
                 ver_tag = ver_resp.json().get("tag", "")
                 if ver_tag:
@@ -855,8 +1000,10 @@ def clone_files(
     )
     codepath = os.path.join(MODULE_DIR, reponame) + f";{module};"
 
-    # Return cached module if it exists
-    if os.path.exists(codepath):
+    # Return a module folder populated by an earlier release or copied from
+    # Terraform's module directory. Views onto the module store are symlinks
+    # and are re-pointed below in case the resolved version changed.
+    if os.path.isdir(codepath) and not os.path.islink(codepath):
         return _handle_cached_module(codepath, tempdir, module, reponame, subfolder)
 
     # Use terraform's already-downloaded module if available (from terraform init)
@@ -866,31 +1013,322 @@ def clone_files(
             click.echo(
                 f"  Using Terraform-cached module for '{module}': {tf_cached_dir}"
             )
+            if os.path.islink(codepath):
+                os.unlink(codepath)
             target_dir = os.path.join(codepath, subfolder) if subfolder else codepath
-            shutil.copytree(tf_cached_dir, target_dir)
+            # Not a symlink: the copy must outlive the project's .terraform
+            materialize.materialize(tf_cached_dir, target_dir, writable=True)
             return os.path.join(codepath, subfolder)
 
-    # Clone new module
-    if module != "main":
-        click.echo(f"  Processing External Module named '{module}': {sourceURL}")
-
-    # Determine if source is an HTTP archive, remote URL, or local directory
-    if _is_http_archive(githubURL) or _is_http_archive(sourceURL):
-        # HTTP archive (e.g., .tgz, .zip from S3, GCS, or any HTTP server)
-        _download_and_extract_archive(githubURL, codepath)
-    elif helpers.check_for_domain(str(sourceURL)):
-        # Remote source: clone the repository
-        _clone_full_repo(githubURL, subfolder, git_tag, codepath)
+    # Fetch into the shared module store, keyed by resolved URL and ref. A
+    # full checkout of the same ref also serves any of its subfolders.
+    # Sparse clones and archive extractions are limited to the subfolder.
+    # Registry downloads are keyed by module version, not the signed URL.
+    with _registry_resolutions_lock:
+        store_url = _registry_store_keys.get(githubURL, githubURL)
+    is_archive = _is_http_archive(githubURL) or _is_http_archive(sourceURL)
+    store_ref = "" if is_archive else git_tag
+    sparse_subdir = (
+        subfolder.strip("/") if subfolder and _sparse_clone_enabled() else ""
+    )
+    tree = _stored_tree(store_url, store_ref, subfolder)
+    if tree:
+        click.echo(
+            f"  Skipping download of module {reponame}, "
+            f"found existing folder in module cache"
+        )
     else:
-        # Local path or registry URL: clone the repository
-        _clone_full_repo(githubURL, subfolder, git_tag, codepath)
+        # Clone new module
+        if module != "main":
+            click.echo(f"  Processing External Module named '{module}': {sourceURL}")
+
+        # In mirror mode fetch from the local copy; the store entry is still
+        # keyed by the remote URL, so it is shared with online runs
+        local_copy = _mirrored_source(githubURL) if mirror.is_enabled() else ""
+        if is_archive:
+            # HTTP archive (e.g., .tgz, .zip from S3, GCS, or any HTTP server)
+            tree = module_cache.get_or_fetch(
+                store_url,
+                store_ref,
+                lambda dest: _download_and_extract_archive(
+                    githubURL, dest, sparse_subdir, local_file=local_copy
+                ),
+                subdir=sparse_subdir,
+            )
+        else:
+            # Remote, local path or registry URL: clone the repository
+            tree = module_cache.get_or_fetch(
+                store_url,
+                store_ref,
+                lambda dest: _clone_into_store(
+                    local_copy or githubURL,
+                    subfolder,
+                    git_tag,
+                    dest,
+                    sparse=bool(sparse_subdir),
+                ),
+                subdir=sparse_subdir,
+            )
+            if not helpers.check_for_domain(str(sourceURL)):
+                click.echo(
+                    click.style(
+                        f"  Retrieved code from registry source: {sourceURL}",
+                        fg="green",
+                    )
+                )
+
+    _link_module_view(tree, codepath)
+    return os.path.join(codepath, subfolder)
+
+
+def _stored_tree(url: str, ref: str, subfolder: str = "") -> Optional[str]:
+    """Return the module store tree clone_files would use for url, or None."""
+    tree = module_cache.lookup(url, ref)
+    sparse_subdir = (
+        subfolder.strip("/") if subfolder and _sparse_clone_enabled() else ""
+    )
+    if not tree and sparse_subdir:
+        tree = module_cache.lookup(url, ref, subdir=sparse_subdir)
+    return tree
+
+
+def _mirrored_source(githubURL: str) -> str:
+    """Return the active mirror's local copy of a git repository or archive.
+
+    Exits with an error if the mirror has none.
+    """
+    try:
+        found = mirror.lookup_source(githubURL)
+    except mirror.MirrorError as e:
+        click.echo(click.style(f"\nERROR: {e}", fg="red", bold=True))
+        exit(1)
+    if found is None:
         click.echo(
             click.style(
-                f"  Retrieved code from registry source: {sourceURL}", fg="green"
+                f"\nERROR: {githubURL} is not in the module mirror at "
+                f"{mirror.mirror_dir()}. Run 'terravision mirror sync' with "
+                f"network access to add it.",
+                fg="red",
+                bold=True,
             )
         )
+        exit(1)
+    return found[1]
 
-    return os.path.join(codepath, subfolder)
+
+def _clone_into_store(
+    githubURL: str, subfolder: str, tag: str, dest: str, sparse: bool = False
+) -> str:
+    """Clone a repository into a module store staging folder.
+
+    Args:
+        githubURL: Git repository URL
+        subfolder: Subfolder path within repository
+        tag: Git tag or branch to checkout (empty for default branch)
+        dest: Staging folder to clone into
+        sparse: Fetch only subfolder (see _clone_sparse), falling back to a
+            full clone if the server or local git cannot
+
+    Returns:
+        Commit hash of the checked out revision ('' if it cannot be read)
+    """
+    with fetch_manager.host_slot(githubURL):
+        if not (sparse and _clone_sparse(githubURL, subfolder, tag, dest)):
+            _clone_full_repo(githubURL, subfolder, tag, dest)
+    try:
+        return git.Repo(dest).head.commit.hexsha
+    except Exception:
+        return ""
+
+
+def _sparse_clone_enabled() -> bool:
+    """Return False when TERRAVISION_SPARSE_CLONE switches sparse clones off."""
+    setting = os.environ.get("TERRAVISION_SPARSE_CLONE", "on").strip().lower()
+    return setting not in ("0", "off", "false", "no")
+
+
+# Relative module sources ("./x", "../x") inside a module's .tf files
+_RELATIVE_SOURCE_RE = re.compile(r'^\s*source\s*=\s*"(\.\.?/[^"]*)"', re.MULTILINE)
+
+
+def _relative_module_dirs(root: str, folder: str) -> Set[str]:
+    """Return repository folders referenced by relative module sources.
+
+    Args:
+        root: Repository checkout
+        folder: Repository-relative folder whose .tf files are scanned
+
+    Returns:
+        Repository-relative folders (POSIX separators) that stay inside root
+    """
+    found: Set[str] = set()
+    try:
+        names = os.listdir(os.path.join(root, folder))
+    except OSError:
+        return found
+    for name in names:
+        if not name.endswith(".tf"):
+            continue
+        try:
+            with open(os.path.join(root, folder, name), encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for source in _RELATIVE_SOURCE_RE.findall(text):
+            target = posixpath.normpath(posixpath.join(folder, source))
+            if target != ".." and not target.startswith("../"):
+                found.add(target)
+    return found
+
+
+def _write_sparse_patterns(repo: git.Repo, folders: Set[str]) -> None:
+    sparse_file = os.path.join(repo.git_dir, "info", "sparse-checkout")
+    os.makedirs(os.path.dirname(sparse_file), exist_ok=True)
+    with open(sparse_file, "w") as f:
+        for folder in sorted(folders):
+            f.write("/*\n!/*/\n" if folder == "." else f"/{folder}/\n")
+
+
+def _clone_sparse(githubURL: str, subfolder: str, tag: str, dest: str) -> bool:
+    """Fetch only the files under subfolder at a single commit.
+
+    Uses a depth-1 fetch with a blob:none partial clone filter, so only the
+    commit's trees are downloaded up front, and a sparse checkout so only
+    blobs under subfolder are fetched. Folders the module references through
+    relative sources ("../other") are added to the checkout until none are
+    missing. Servers that ignore the filter still send the depth-1 commit.
+
+    Args:
+        githubURL: Git repository URL
+        subfolder: Subfolder path within repository
+        tag: Git tag or branch to checkout (empty for the remote's HEAD)
+        dest: Empty destination folder
+
+    Returns:
+        True on success; False if the caller should fall back to a full
+        clone (dest is emptied again)
+    """
+    subfolder = subfolder.strip("/")
+    try:
+        repo = git.Repo.init(dest)
+        origin = repo.create_remote("origin", githubURL)
+        with repo.config_writer() as config:
+            config.set_value("core", "sparseCheckout", "true")
+            # Register origin as a promisor so blobs left out by the filter
+            # are fetched on demand at checkout
+            config.set_value("extensions", "partialClone", "origin")
+            config.set_value('remote "origin"', "promisor", "true")
+            config.set_value('remote "origin"', "partialclonefilter", "blob:none")
+        folders = {subfolder}
+        _write_sparse_patterns(repo, folders)
+        origin.fetch(
+            tag or "HEAD", depth=1, filter="blob:none", progress=CloneProgress()
+        )
+        repo.git.checkout("--detach", "FETCH_HEAD")
+        pending = [subfolder]
+        while pending:
+            missing = set()
+            for folder in pending:
+                for target in _relative_module_dirs(dest, folder):
+                    # "." covers only the repository's top-level files
+                    if not any(
+                        target == f or (f != "." and target.startswith(f + "/"))
+                        for f in folders | missing
+                    ):
+                        missing.add(target)
+            if not missing:
+                break
+            folders |= missing
+            _write_sparse_patterns(repo, folders)
+            repo.git.read_tree("-mu", "HEAD")
+            pending = sorted(missing)
+    except Exception as e:
+        click.echo(
+            f"  Sparse fetch of {githubURL} failed ({type(e).__name__}), "
+            "falling back to a full clone"
+        )
+        shutil.rmtree(dest, ignore_errors=True)
+        os.makedirs(dest, exist_ok=True)
+        return False
+    if not os.path.isdir(os.path.join(dest, subfolder)):
+        click.echo(
+            click.style(
+                f"  WARNING: Subfolder '{subfolder}' not found in {githubURL}",
+                fg="yellow",
+            )
+        )
+    return True
+
+
+def _symlinks_unsupported(error: BaseException) -> bool:
+    """Return True if error means this platform or filesystem has no symlinks."""
+    if isinstance(error, NotImplementedError):
+        return True
+    # ERROR_PRIVILEGE_NOT_HELD: Windows without developer mode
+    if getattr(error, "winerror", None) == 1314:
+        return True
+    return getattr(error, "errno", None) in (errno.EPERM, errno.EOPNOTSUPP)
+
+
+def _link_module_view(tree: str, codepath: str) -> None:
+    """Point a per-module cache folder at a module store entry.
+
+    Uses a symlink, so module blocks sharing a source share one copy. The
+    link is created under a temporary name and renamed over codepath, so
+    concurrent runs never see the view missing. Falls back to hard links or
+    a copy where symlinks are not permitted (Windows without developer mode).
+
+    Args:
+        tree: Module store tree folder
+        codepath: Per-module folder (MODULE_DIR/<source>;<module>;)
+    """
+    if os.path.islink(codepath) and os.readlink(codepath) == tree:
+        return
+    parent, name = os.path.split(codepath)
+    staging = os.path.join(parent, f".tmp-{os.getpid()}-{threading.get_ident()}-{name}")
+    try:
+        os.symlink(tree, staging, target_is_directory=True)
+    except (NotImplementedError, OSError) as e:
+        if not _symlinks_unsupported(e):
+            raise
+        shutil.rmtree(staging, ignore_errors=True)
+        materialize.materialize(tree, staging, writable=True)
+    try:
+        try:
+            os.replace(staging, codepath)
+        except OSError:
+            # Directories (and links on Windows) cannot be replaced in one
+            # step: move the old view aside first
+            if not os.path.lexists(codepath):
+                raise
+            aside = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+            try:
+                os.rename(codepath, os.path.join(aside, name))
+            except FileNotFoundError:
+                pass  # Another run moved it first
+            shutil.rmtree(aside, ignore_errors=True)
+            os.replace(staging, codepath)
+    finally:
+        if os.path.islink(staging):
+            os.unlink(staging)
+        elif os.path.isdir(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def module_view_root(path: str) -> str:
+    """Return the per-module folder (MODULE_DIR/<source>;<module>;) holding path.
+
+    Returns path itself when it is not inside MODULE_DIR.
+    """
+    path = os.path.normpath(path)
+    module_dir = os.path.normpath(MODULE_DIR)
+    root = path
+    while os.path.dirname(root) != module_dir:
+        parent = os.path.dirname(root)
+        if parent == root:
+            return path
+        root = parent
+    return root
 
 
 def _handle_cached_module(
@@ -930,7 +1368,7 @@ def _handle_cached_module(
     if not os.path.exists(temp_module_path):
         if not os.path.exists(codepath_module):
             codepath_module = codepath
-        shutil.copytree(codepath_module, temp_module_path)
+        materialize.materialize(codepath_module, temp_module_path)
 
     # When subfolder is specified, navigate from codepath root (matches fresh clone behavior)
     if subfolder:
@@ -953,8 +1391,9 @@ def _clone_full_repo(githubURL: str, subfolder: str, tag: str, codepath: str) ->
     Returns:
         Subfolder path within cloned repository
     """
-    # Parse URL if not already a domain URL
-    if not helpers.check_for_domain(githubURL):
+    # Parse URL if not already a domain URL or a local repository
+    is_local = os.path.isdir(githubURL)
+    if not helpers.check_for_domain(githubURL) and not is_local:
         githubURL, subfolder, tag = get_clone_url(githubURL)
 
     # Helper function for Windows read-only file removal
@@ -971,6 +1410,9 @@ def _clone_full_repo(githubURL: str, subfolder: str, tag: str, codepath: str) ->
     options: List[str] = []
     if tag:
         options.append("--branch " + tag)
+    if is_local:
+        # Borrow the local repository's objects instead of copying them
+        options.append("--shared")
 
     # Attempt to clone repository
     try:
@@ -995,3 +1437,102 @@ def _clone_full_repo(githubURL: str, subfolder: str, tag: str, codepath: str) ->
         exit(1)
 
     return subfolder
+
+
+def _is_local_source(source: str) -> bool:
+    return source.startswith((".", "/", "\\"))
+
+
+def _module_calls(folder: str) -> List[Tuple[str, str, str]]:
+    """Return (module name, source, version) for each module block in folder.
+
+    Files that do not parse are reported and skipped.
+    """
+    calls = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if not name.lower().endswith(".tf") or not os.path.isfile(path):
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                parsed = hcl_parser.loads(f.read())
+        except Exception as e:
+            click.echo(
+                click.style(
+                    f"  WARNING: Skipping {path}: {type(e).__name__}", fg="yellow"
+                )
+            )
+            continue
+        for block in parsed.get("module", []):
+            for module_name, attrs in block.items():
+                source = attrs.get("source")
+                if isinstance(source, str) and source:
+                    calls.append((module_name, source, str(attrs.get("version", ""))))
+    return calls
+
+
+def sync_mirror(source: str, directory: str) -> List[str]:
+    """Populate a module mirror with every remote module a source uses.
+
+    Module blocks are followed through local module folders and into each
+    remote module, so nested modules are mirrored too. Registry sources are
+    resolved online and the resolution is recorded in the mirror's index;
+    git repositories are mirrored as bare repositories (existing ones are
+    updated) and archives downloaded. Each module is then loaded, from the
+    mirror unless the module store already has it, to find the modules it
+    calls.
+
+    Args:
+        source: Local folder of Terraform code or a remote module source
+        directory: Mirror folder (created if missing)
+
+    Returns:
+        Remote module sources added or updated, in the order visited
+
+    Raises:
+        mirror.MirrorError: If a repository or archive cannot be mirrored
+    """
+    directory = os.path.abspath(os.path.expanduser(directory))
+    os.makedirs(directory, exist_ok=True)
+    pending: List[Tuple[str, str, str]] = []
+    folders_seen: Set[str] = set()
+    synced: List[str] = []
+    seen: Set[Tuple[str, str]] = set()
+
+    def visit_folder(folder: str) -> None:
+        folder = os.path.realpath(folder)
+        if folder in folders_seen or not os.path.isdir(folder):
+            return
+        folders_seen.add(folder)
+        for module_name, module_source, version in _module_calls(folder):
+            if _is_local_source(module_source):
+                visit_folder(os.path.join(folder, module_source))
+            else:
+                pending.append((module_name, module_source, version))
+
+    if os.path.isdir(source):
+        visit_folder(source)
+    else:
+        pending.append(("main", source, ""))
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        while pending:
+            module_name, module_source, version = pending.pop(0)
+            if (module_source, version) in seen:
+                continue
+            seen.add((module_source, version))
+            click.echo(f"  Mirroring {module_source} {version}".rstrip())
+            with mirror.suspended():
+                resolved = get_clone_url(module_source, version)
+            if _is_registry_source(module_source):
+                mirror.record_registry(module_source, version, resolved, directory)
+            githubURL = resolved[0]
+            if _is_http_archive(githubURL) or _is_http_archive(module_source):
+                mirror.add_archive(githubURL, directory)
+            else:
+                mirror.add_git(githubURL, directory)
+            synced.append(module_source)
+            with mirror.activated(directory):
+                module_path = clone_files(module_source, tempdir, module_name, version)
+            visit_folder(module_path)
+    return synced
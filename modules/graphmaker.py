@@ -1045,7 +1045,14 @@ def _get_metadata_generator(node: str, nodename: str, tfdata: Dict[str, Any]):
             return dict_generator(tfdata["original_metadata"][node])
         # No metadata available for this node; return empty generator
         return iter([])
-    return dict_generator(tfdata["meta_data"][nodename])
+    # Nested blocks are scanned as one text per attribute, as they were
+    # before metadata resolution started keeping their structure
+    return dict_generator(
+        {
+            key: str(value) if isinstance(value, (dict, list, tuple)) else value
+            for key, value in tfdata["meta_data"][nodename].items()
+        }
+    )
 
 
 def _process_connection_pairs(
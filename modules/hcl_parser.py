@@ -0,0 +1,117 @@
+"""Fast HCL2 parsing with a pre-built LALR parser for the bundled grammar.
+
+``hcl2.load`` builds its Lark parser from the grammar when python-hcl2 is
+first imported and tracks token positions on every parse. TerraVision ships
+its own grammar (``hcl2/hcl2.lark``) and a serialized LALR parser built from
+it (``hcl2/hcl2.lark.bin``, regenerated by ``scripts/build_hcl_parser.py``).
+Loading the serialized parser takes milliseconds, and it skips position
+tracking, which nothing in TerraVision reads.
+
+The serialized file is only used when its header matches the grammar, the
+lark version and the parser options. It does not depend on the Python
+version: ``Lark.save`` pickles plain data at a protocol every supported
+Python reads. Otherwise the parser is built once and saved under
+~/.terravision/hcl_parser for later runs. Files the parser rejects are handed to ``hcl2.loads`` so behaviour
+never falls below python-hcl2's.
+"""
+
+import functools
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import hcl2
+import lark
+from hcl2.transformer import DictTransformer
+from lark import Lark
+
+_REPO_GRAMMAR = Path(__file__).resolve().parent.parent / "hcl2" / "hcl2.lark"
+# Wheels install the bundled grammar into the hcl2 package directory
+GRAMMAR_FILE = str(
+    _REPO_GRAMMAR
+    if _REPO_GRAMMAR.is_file()
+    else Path(hcl2.__file__).with_name("hcl2.lark")
+)
+SHIPPED_PARSER_FILE = GRAMMAR_FILE + ".bin"
+USER_PARSER_DIR = str(Path(Path.home(), ".terravision", "hcl_parser"))
+
+# Must stay in line with the options hcl2's transformer expects, minus
+# propagate_positions (only needed for hcl2.load(..., with_meta=True))
+PARSER_OPTIONS: Dict[str, Any] = {"parser": "lalr", "propagate_positions": False}
+
+
+@functools.lru_cache(maxsize=None)
+def parser_key() -> str:
+    """Return a hash of everything a serialized parser depends on."""
+    digest = hashlib.sha256()
+    with open(GRAMMAR_FILE, "rb") as f:
+        digest.update(f.read())
+    digest.update(f"lark={lark.__version__}\n".encode())
+    digest.update(f"options={sorted(PARSER_OPTIONS.items())}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_serialized(path: str) -> Optional[Lark]:
+    """Load a serialized parser, or return None if missing or stale."""
+    try:
+        with open(path, "rb") as f:
+            if f.readline().strip().decode("ascii", "ignore") != parser_key():
+                return None
+            return Lark.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or written by an incompatible lark release
+        return None
+
+
+def write_serialized(parser: Lark, path: str) -> None:
+    """Save parser to path atomically, prefixed with its parser_key()."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(parser_key().encode("ascii") + b"\n")
+            parser.save(f)
+        os.replace(staging, path)
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+
+
+def build_parser() -> Lark:
+    """Build the LALR parser from the grammar file."""
+    return Lark.open(GRAMMAR_FILE, **PARSER_OPTIONS)
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser() -> Lark:
+    """Return the parser, loading the serialized form when it is current."""
+    user_file = os.path.join(USER_PARSER_DIR, parser_key() + ".bin")
+    for path in (SHIPPED_PARSER_FILE, user_file):
+        parser = _read_serialized(path)
+        if parser is not None:
+            return parser
+    parser = build_parser()
+    try:
+        write_serialized(parser, user_file)
+    except OSError:
+        pass
+    return parser
+
+
+def loads(text: str) -> Dict[str, Any]:
+    """Parse HCL2 text into the same dict ``hcl2.loads`` returns.
+
+    Raises:
+        Exception: Whatever ``hcl2.loads`` raises when both parsers fail
+    """
+    try:
+        # Same trailing newline workaround as hcl2.loads
+        tree = get_parser().parse(text + "\n")
+        return DictTransformer().transform(tree)
+    except Exception:
+        return hcl2.loads(text)
@@ -158,8 +158,13 @@ def export_tfdata(tfdata: Dict[str, Any]) -> None:
     """Export Terraform data dictionary to tfdata.json for debugging.
 
     Tolerant of partial state: missing keys and non-serializable values are
-    skipped so early-failure dumps still produce a usable file.
+    skipped so early-failure dumps still produce a usable file. Comments are
+    harvested into the dump, as replays cannot read remote module sources.
     """
+    if tfdata.get("source_files"):
+        from modules.fileparser import ensure_comments
+
+        ensure_comments(tfdata)
     if "tempdir" in tfdata and tfdata["tempdir"] is not None:
         tfdata["tempdir"] = str(tfdata["tempdir"])
     out_path = (Path.cwd() / "tfdata.json").resolve()
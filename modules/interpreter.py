@@ -26,6 +26,19 @@ def _coerce_output_value(val: Any) -> str:
     return json.dumps(val)
 
 
+# Reference patterns used by find_replace_values, one per reference kind
+_REFERENCE_PATTERNS = {
+    "var": re.compile(r"var\.[A-Za-z0-9_\-]+"),
+    "varobject": re.compile(r"var\.[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+"),
+    "data": re.compile(r"data\.[A-Za-z0-9_\-\.\[\]]+"),
+    "local": re.compile(r"local\.[A-Za-z0-9_\-\.\[\]]+"),
+    "module": re.compile(r"module\.[A-Za-z0-9_\-\.\[\]]+"),
+}
+# Every position where one of the patterns above could start
+_REFERENCE_START = re.compile(r"(?=(var|data|local|module)\.)")
+_MODULE_RESOURCE_REF = re.compile(r"module\.[\w-]+\.aws_")
+_MODULE_RESOURCE_REF_NO_DASH = re.compile(r"module\.\w+\.aws_")
+
 # "data.aws_availability_zones": ["AZ1", "AZ2", "AZ3"],
 DATA_REPLACEMENTS = {
     "data.aws_availability_zones_names": ["us-east-1a", "us-east-1b", "us-east-1c"],
@@ -54,6 +67,8 @@ def resolve_all_variables(
     tfdata = extract_locals(tfdata)
     # Create metadata view from nested TF file resource attributes
     tfdata = merge_metadata(tfdata)
+    # Warn about reference cycles between locals and module outputs
+    report_reference_cycles(tfdata)
     # Replace metadata (resource attributes) variables and locals with actual values
     tfdata = handle_metadata_vars(tfdata)
     # Inject parent module variables that are referenced downstream in sub modules
@@ -80,12 +95,10 @@ def handle_module_vars(eval_string: str, tfdata: Dict[str, Any]) -> str:
     # Extract output name and module name from reference
     outputname = helpers.find_between(eval_string, splitlist[1] + ".", " ")
     mod = helpers.find_between(eval_string, splitlist[0] + ".", ".")
-    # Search through all output files for matching module
-    for file in tfdata["all_output"].keys():
+    # Search through the module's output files
+    for file in _module_index(tfdata).output_files(mod):
         for i in tfdata["all_output"][file]:
-            if outputname in i.keys() and helpers.output_file_matches_module(
-                file, mod, tfdata
-            ):
+            if outputname in i.keys():
                 outvalue = i[outputname]["value"]
                 # Module outputs can be object/map/list literals (e.g.
                 # `output "vpc" { value = { id = ..., cidr = ... } }`).
@@ -155,63 +168,121 @@ def inject_module_variables(tfdata: Dict[str, Any]) -> Dict[str, Any]:
                     # Add resolved value to variable map for downstream use
                     if key != "source" and key != "version":
                         tfdata["variable_map"][module][key] = value
+                        _module_index(tfdata).add_variable(module, key)
     return tfdata
 
 
+def _has_references(value: str) -> bool:
+    """Return True if value still holds references find_replace_values resolves."""
+    return (
+        "var." in value
+        or "local." in value
+        or "data." in value
+        or ("module." in value and not _MODULE_RESOURCE_REF.search(value))
+    )
+
+
+def _resolve_string(
+    value: str, module: str, resolver: "_VariableResolver", label: str
+) -> Any:
+    """Resolve the references in one string to a fixed point.
+
+    Args:
+        value: String holding references
+        module: Module the string belongs to
+        resolver: Memoized resolver for this tfdata
+        label: resource.attribute name used in warnings
+
+    Returns:
+        The resolved value; a string, or a list when a data source reference
+        stands for a whole list
+    """
+    # Track seen values to detect cycles (e.g. local.A → local.B → local.A)
+    # where find_replace_values keeps producing a different string each
+    # iteration without ever fully resolving it. The `value == old_value`
+    # guard only catches fixed points, not cycles.
+    seen_values: set = set()
+    while isinstance(value, str) and _has_references(value):
+        if value in seen_values:
+            click.echo(
+                click.style(
+                    f"   WARNING: Cannot fully resolve {label}, unresolved references remain",
+                    fg="yellow",
+                )
+            )
+            break
+        seen_values.add(value)
+        old_value = value
+        value = resolver.resolve(value, module)
+        if value == old_value:
+            click.echo(
+                click.style(
+                    f"   WARNING: Cannot fully resolve {label}, unresolved references remain",
+                    fg="yellow",
+                )
+            )
+            break
+    return value
+
+
+def _resolve_structure(
+    value: Any, module: str, resolver: "_VariableResolver", label: str
+) -> Any:
+    """Resolve the string leaves of a nested attribute value.
+
+    Dicts, lists and tuples are walked and only the strings that hold
+    references are resolved; every other leaf keeps its type. Containers
+    are copied only when one of their leaves changes, so values shared
+    with all_resource or original_metadata are never modified.
+    """
+    if isinstance(value, str):
+        if not _has_references(value):
+            return value
+        return _resolve_string(value, module, resolver, label)
+    if isinstance(value, dict):
+        resolved = {
+            k: _resolve_structure(v, module, resolver, label) for k, v in value.items()
+        }
+        if all(resolved[k] is value[k] for k in value):
+            return value
+        return resolved
+    if isinstance(value, (list, tuple)):
+        items = [_resolve_structure(v, module, resolver, label) for v in value]
+        if all(new is old for new, old in zip(items, value)):
+            return value
+        return type(value)(items)
+    return value
+
+
 def handle_metadata_vars(tfdata: Dict[str, Any]) -> Dict[str, Any]:
     """Replace variables in resource metadata with actual values.
 
+    Nested blocks keep their shape: dicts and lists are walked and only the
+    strings inside them that hold references are substituted, instead of
+    resolving the repr of the whole block. Top-level scalars are still
+    stored as strings, as count and flag checks downstream expect.
+
     Args:
         tfdata: Terraform data dictionary
 
     Returns:
         Updated tfdata with resolved metadata variables
     """
+    resolver = _VariableResolver(tfdata)
     # Loop through each resource's metadata attributes
     for resource, attr_list in tfdata["meta_data"].items():
+        mod = attr_list.get("module")
         for key, orig_value in attr_list.items():
-            value = str(orig_value)
-            # Iteratively resolve all variable references.
-            # Track seen values to detect cycles (e.g. local.A → local.B → local.A)
-            # where find_replace_values keeps producing a different string each
-            # iteration without ever fully resolving it. The existing `value ==
-            # old_value` guard only catches fixed points, not cycles.
-            _seen_values: set = set()
-            while (
-                (
-                    "var." in value
-                    or "local." in value
-                    or "data." in value
-                    or (
-                        "module." in value
-                        and not re.search(r"module\.[\w-]+\.aws_", value)
-                    )
-                )
-                and key != "depends_on"
-                and key != "original_count"
-            ):
-                if value in _seen_values:
-                    click.echo(
-                        click.style(
-                            f"   WARNING: Cannot fully resolve {resource}.{key}, unresolved references remain",
-                            fg="yellow",
-                        )
-                    )
-                    break
-                _seen_values.add(value)
-                mod = attr_list["module"]
-                old_value = value
-                value = find_replace_values(value, mod, tfdata)
-                if value == old_value:
-                    click.echo(
-                        click.style(
-                            f"   WARNING: Cannot fully resolve {resource}.{key}, unresolved references remain",
-                            fg="yellow",
-                        )
+            if isinstance(orig_value, (dict, list, tuple)):
+                if key != "depends_on":
+                    attr_list[key] = _resolve_structure(
+                        orig_value, mod, resolver, f"{resource}.{key}"
                     )
-                    break
-            # Update metadata with resolved value
-            tfdata["meta_data"][resource][key] = value
+                continue
+            value = str(orig_value)
+            if key != "original_count":
+                value = _resolve_string(value, mod, resolver, f"{resource}.{key}")
+            attr_list[key] = value
     return tfdata
 
 
@@ -328,64 +399,61 @@ def replace_module_vars(
             oldvalue = value
             mod = value.split("module.")[1].split(".")[0]
             # Search through output files for matching module
-            for ofile in tfdata["all_output"].keys():
-                if helpers.output_file_matches_module(ofile, mod, tfdata):
-                    # Found the right output file for this module
-                    for i in tfdata["all_output"][ofile]:
-                        if outputname in i.keys():
-                            out_val = _coerce_output_value(i[outputname]["value"])
-                            # Check if this is a module output reference (not a resource)
-                            if "module." in module_var and not re.search(
-                                r"module\.[\w-]+\.aws_", module_var
-                            ):
-                                # Handle specific array index references
-                                if (
-                                    "[" in module_var
-                                    and "[*]" not in module_var
-                                    and "*.id" in out_val
-                                ):
-                                    value = value.replace(
-                                        module_var, f"module.{mod}.{module_var}"
-                                    )
-                                    value = value.replace(module_var, out_val)
-                                    index = helpers.find_between(
-                                        module_var, "[", "]"
-                                    ).replace(" ", "")
-                                    value = helpers.strip_var_curlies(
-                                        value.replace(".*.id", f"[{index}]")
-                                    ).strip()
-                                    continue
-                            # Recursively resolve if output contains other variables
+            for ofile in _module_index(tfdata).output_files(mod):
+                # Found the right output file for this module
+                for i in tfdata["all_output"][ofile]:
+                    if outputname in i.keys():
+                        out_val = _coerce_output_value(i[outputname]["value"])
+                        # Check if this is a module output reference (not a resource)
+                        if "module." in module_var and not (
+                            _MODULE_RESOURCE_REF.search(module_var)
+                        ):
+                            # Handle specific array index references
                             if (
-                                (
-                                    "module." in out_val
-                                    and not not re.search(
-                                        r"module\.\w+\.aws_", module_var
-                                    )
-                                )
-                                or "var." in out_val
-                                or "local." in out_val
+                                "[" in module_var
+                                and "[*]" not in module_var
+                                and "*.id" in out_val
                             ):
-                                value = find_replace_values(
-                                    value, mod, tfdata, recursion_depth + 1
+                                value = value.replace(
+                                    module_var, f"module.{mod}.{module_var}"
                                 )
-                                continue
-                            else:
-                                # Direct replacement with output value
-                                if (
-                                    not f"module.{mod}.{module_var}" in value
-                                    and f"module.{mod}.{module_var}" not in module_var
-                                ):
-                                    value = value.replace(
-                                        module_var, f"module.{mod}.{module_var}"
-                                    )
                                 value = value.replace(module_var, out_val)
-                                value = helpers.remove_terraform_functions(value)
-                                value = helpers.cleanup_curlies(value).strip()
-                else:
-                    continue
+                                index = helpers.find_between(
+                                    module_var, "[", "]"
+                                ).replace(" ", "")
+                                value = helpers.strip_var_curlies(
+                                    value.replace(".*.id", f"[{index}]")
+                                ).strip()
+                                continue
+                        # Recursively resolve if output contains other variables
+                        if (
+                            (
+                                "module." in out_val
+                                and not not _MODULE_RESOURCE_REF_NO_DASH.search(
+                                    module_var
+                                )
+                            )
+                            or "var." in out_val
+                            or "local." in out_val
+                        ):
+                            value = find_replace_values(
+                                value, mod, tfdata, recursion_depth + 1
+                            )
+                            continue
+                        else:
+                            # Direct replacement with output value
+                            if (
+                                not f"module.{mod}.{module_var}" in value
+                                and f"module.{mod}.{module_var}" not in module_var
+                            ):
+                                value = value.replace(
+                                    module_var, f"module.{mod}.{module_var}"
+                                )
+                            value = value.replace(module_var, out_val)
+                            value = helpers.remove_terraform_functions(value)
+                            value = helpers.cleanup_curlies(value).strip()
             # Mark as unknown if no resolution found
-            if value == oldvalue and not re.search(r"module\.[\w-]+\.aws_", module_var):
+            if value == oldvalue and not _MODULE_RESOURCE_REF.search(module_var):
                 # Try plan-based fallback (terraform plan JSON has resolved values)
                 plan_value = resolve_module_ref_from_plan(module_var, tfdata)
                 if plan_value is not None:
@@ -405,6 +473,136 @@ def replace_module_vars(
     return value
 
 
+class _ModuleIndex:
+    """Module hierarchy and variable lookups for one variable_map.
+
+    Replaces scanning every module's variables (helpers.list_of_parents)
+    for each unresolved reference. Holds:
+
+    - each module's parent: the module whose files declare it, from the
+      ';name;' path convention of remote modules or the longest matching
+      module_source_dict folder for local ones, else main;
+    - variable name -> modules that define it, in variable_map order;
+    - module -> its all_output files, built on first use.
+
+    The index is not checked against tfdata on lookup: writes to
+    variable_map go through add_variable, and phases that rebuild
+    variable_map or all_output call invalidate_module_index().
+    """
+
+    def __init__(self, tfdata: Dict[str, Any]):
+        self._tfdata = tfdata
+        self.parents: Dict[str, str] = {}
+        for file, module_list in (tfdata.get("all_module") or {}).items():
+            owner = self._file_module(file)
+            for module_items in module_list:
+                for module in module_items:
+                    if module != owner:
+                        self.parents.setdefault(module, owner)
+        # Dicts used as ordered sets, for O(1) membership tests
+        self.variables: Dict[str, Dict[str, None]] = {}
+        for module, variables in (tfdata.get("variable_map") or {}).items():
+            for name in variables:
+                self.variables.setdefault(name, {})[module] = None
+        self._output_files: Dict[str, List[str]] = {}
+        self.generation = _module_index_generation
+
+    def _file_module(self, file: str) -> str:
+        if ";" in file:
+            return file.split(";")[1]
+        matches = [
+            module
+            for module in self._tfdata.get("module_source_dict") or {}
+            if helpers.output_file_matches_module(file, module, self._tfdata)
+        ]
+        if not matches:
+            return "main"
+        return max(
+            matches, key=lambda m: len(str(self._tfdata["module_source_dict"][m]))
+        )
+
+    def ancestors(self, module: str) -> List[str]:
+        """Return module's parent, grandparent and so on up to main."""
+        chain: List[str] = []
+        while module in self.parents and module != "main":
+            module = self.parents[module]
+            if module in chain:
+                break
+            chain.append(module)
+        if "main" not in chain:
+            chain.append("main")
+        return chain
+
+    def add_variable(self, module: str, name: str) -> None:
+        """Record that variable name was set in variable_map[module]."""
+        self.variables.setdefault(name, {})[module] = None
+
+    def module_defining(self, name: str, module: str) -> Any:
+        """Return the module to take variable name from, seen from module.
+
+        The nearest ancestor that defines it wins; otherwise the first
+        module that defines it. None if no module does.
+        """
+        modules = self.variables.get(name)
+        if not modules:
+            return None
+        if module in modules:
+            return module
+        for ancestor in self.ancestors(module):
+            if ancestor in modules:
+                return ancestor
+        return next(iter(modules))
+
+    def output_files(self, module: str) -> List[str]:
+        """Return the all_output files that belong to module."""
+        if module not in self._output_files:
+            self._output_files[module] = [
+                ofile
+                for ofile in self._tfdata.get("all_output") or {}
+                if helpers.output_file_matches_module(ofile, module, self._tfdata)
+            ]
+        return self._output_files[module]
+
+
+# Index of the variable_map last looked up, with the dicts it was built from
+_module_index_cache: Dict[str, Any] = {}
+# Bumped by invalidate_module_index(); an index from an older generation is
+# rebuilt on its next lookup
+_module_index_generation = 0
+
+
+def invalidate_module_index() -> None:
+    """Drop the cached _ModuleIndex.
+
+    Call after rebuilding variable_map or all_output, or after changing
+    them in place other than through _ModuleIndex.add_variable.
+    """
+    global _module_index_generation
+    _module_index_generation += 1
+
+
+def _module_index(tfdata: Dict[str, Any]) -> _ModuleIndex:
+    """Return the _ModuleIndex for tfdata, rebuilding it when stale.
+
+    The index is rebuilt when variable_map, all_module, all_output or
+    module_source_dict is replaced, or after invalidate_module_index().
+    """
+    sources = tuple(
+        tfdata.get(key)
+        for key in ("variable_map", "all_module", "all_output", "module_source_dict")
+    )
+    cached = _module_index_cache
+    if (
+        cached
+        and cached["index"].generation == _module_index_generation
+        and all(a is b for a, b in zip(cached["sources"], sources))
+    ):
+        return cached["index"]
+    index = _ModuleIndex(tfdata)
+    cached.update(sources=sources, index=index)
+    return index
+
+
 def replace_var_values(
     found_list: List[str],
     varobject_found_list: List[str],
@@ -493,13 +691,8 @@ def replace_var_values(
                 )
             break
         # Search parent modules for variable
-        elif helpers.list_of_parents(tfdata["variable_map"], lookup):
-            module_list = helpers.list_of_parents(tfdata["variable_map"], lookup)
-            module_name = (
-                [m for m in module_list if m == module][0]
-                if [m for m in module_list if m == module]
-                else module_list[0]
-            )
+        elif _module_index(tfdata).module_defining(lookup, module):
+            module_name = _module_index(tfdata).module_defining(lookup, module)
             value = value.replace(
                 varitem, str(tfdata["variable_map"][module_name].get(lookup)), 1
             )
@@ -528,6 +721,71 @@ def replace_var_values(
     return value
 
 
+def _find_references(value: str) -> Dict[str, List[str]]:
+    """List the var/data/local/module references in a string in one scan.
+
+    Returns the same lists as running re.findall with each of
+    _REFERENCE_PATTERNS over value: candidate start positions are found
+    once, and each kind keeps its own scan position so overlapping matches
+    of different kinds (e.g. ``var.x`` inside ``data.var.x``) are kept.
+    """
+    found: Dict[str, List[str]] = {kind: [] for kind in _REFERENCE_PATTERNS}
+    if "." not in value:
+        return found
+    scanned_to = dict.fromkeys(_REFERENCE_PATTERNS, 0)
+    for start in _REFERENCE_START.finditer(value):
+        pos = start.start()
+        keyword = start.group(1)
+        kinds = ("var", "varobject") if keyword == "var" else (keyword,)
+        for kind in kinds:
+            if pos < scanned_to[kind]:
+                continue
+            match = _REFERENCE_PATTERNS[kind].match(value, pos)
+            if match:
+                found[kind].append(match.group())
+                scanned_to[kind] = match.end()
+    return found
+
+
+class _VariableResolver:
+    """Memoized find_replace_values for one tfdata.
+
+    handle_metadata_vars resolves every attribute of every resource to a
+    fixed point, so the same strings (``var.environment``, ``local.tags``)
+    are resolved over and over. Results are remembered per (string,
+    module). Lookups depend on variable_map and all_locals: the memo is
+    dropped when either is replaced, and invalidate() must be called after
+    changing them in place. Only string results are kept, so callers never
+    share a list or dict between resources.
+    """
+
+    def __init__(self, tfdata: Dict[str, Any]):
+        self._tfdata = tfdata
+        self._memo: Dict[Tuple[str, Any], str] = {}
+        self._bound_to = self._inputs()
+
+    def _inputs(self) -> Tuple[Any, Any]:
+        return self._tfdata.get("variable_map"), self._tfdata.get("all_locals")
+
+    def invalidate(self) -> None:
+        self._memo.clear()
+        self._bound_to = self._inputs()
+
+    def resolve(self, varstring: str, module: str) -> Any:
+        inputs = self._inputs()
+        if inputs[0] is not self._bound_to[0] or inputs[1] is not self._bound_to[1]:
+            self.invalidate()
+        if not isinstance(varstring, str):
+            return find_replace_values(varstring, module, self._tfdata)
+        key = (varstring, module)
+        if key in self._memo:
+            return self._memo[key]
+        value = find_replace_values(varstring, module, self._tfdata)
+        if isinstance(value, str):
+            self._memo[key] = value
+        return value
+
+
 def find_replace_values(
     varstring: str, module: str, tfdata: Dict[str, Any], recursion_depth: int = 0
 ) -> str:
@@ -551,14 +809,12 @@ def find_replace_values(
 
     # Regex string matching to create lists of different variable markers found
     value = helpers.strip_var_curlies(str(varstring))
-    # Find all variable types using regex patterns
-    var_found_list = re.findall(r"var\.[A-Za-z0-9_\-]+", value)
-    data_found_list = re.findall(r"data\.[A-Za-z0-9_\-\.\[\]]+", value)
-    varobject_found_list = re.findall(r"var\.[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+", value)
-    local_found_list = re.findall(r"local\.[A-Za-z0-9_\-\.\[\]]+", value)
-    modulevar_found_list = [
-        m.rstrip("[") for m in re.findall(r"module\.[A-Za-z0-9_\-\.\[\]]+", value)
-    ]
+    references = _find_references(value)
+    var_found_list = references["var"]
+    data_found_list = references["data"]
+    varobject_found_list = references["varobject"]
+    local_found_list = references["local"]
+    modulevar_found_list = [m.rstrip("[") for m in references["module"]]
     # Replace found variable strings with actual values in order
     value = replace_data_values(data_found_list, value, tfdata)
     value = replace_module_vars(
@@ -602,6 +858,152 @@ def extract_locals(tfdata: Dict[str, Any]) -> Dict[str, Any]:
     return tfdata
 
 
+def _local_scope(tfdata: Dict[str, Any], module: str, lookup: str) -> Any:
+    """Return the module whose local `lookup` a reference in module resolves to.
+
+    Mirrors replace_local_values: the module's own locals first, then the
+    main module's. Returns None when the local is not defined.
+    """
+    all_locals = tfdata.get("all_locals") or {}
+    if lookup in all_locals.get(module, {}):
+        return module
+    if lookup in all_locals.get("main", {}):
+        return "main"
+    return None
+
+
+def _format_symbol(symbol: Tuple[str, str]) -> str:
+    scope, ref = symbol
+    return f"{ref} ({scope})" if scope else ref
+
+
+def _symbol_references(
+    value: Any, module: str, tfdata: Dict[str, Any]
+) -> List[Tuple[str, str]]:
+    """Return the locals and module outputs a value in module refers to."""
+    references = _find_references(str(value))
+    symbols = []
+    for item in references["local"]:
+        lookup = helpers.cleanup(item.split("local.")[1])
+        scope = _local_scope(tfdata, module, lookup)
+        if scope is not None:
+            symbols.append((scope, "local." + lookup))
+    for item in references["module"]:
+        parts = item.rstrip("[").split(".")
+        if len(parts) >= 3:
+            symbols.append(("", ".".join(parts[:3])))
+    return symbols
+
+
+def _module_output_value(tfdata: Dict[str, Any], module: str, name: str) -> Any:
+    """Return the value of output name in module, or None if it is not declared."""
+    for ofile in _module_index(tfdata).output_files(module):
+        for output in tfdata["all_output"][ofile]:
+            params = output.get(name)
+            if params is not None:
+                return params.get("value") if isinstance(params, dict) else None
+    return None
+
+
+def build_symbol_graph(
+    tfdata: Dict[str, Any]
+) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
+    """Map each local, and each module output a local uses, to its references.
+
+    Symbols are (module, reference) pairs such as ("main", "local.tags");
+    module outputs are global and use an empty module. Only locals and
+    module outputs are included: variables and data sources come from
+    .tfvars files, defaults and DATA_REPLACEMENTS and cannot be part of a
+    cycle. Module outputs are only added when a local reaches them,
+    directly or through other outputs.
+
+    Args:
+        tfdata: Terraform data dictionary after extract_locals
+
+    Returns:
+        Dictionary of symbol to the symbols it depends on
+    """
+    graph: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+    for module, local_values in (tfdata.get("all_locals") or {}).items():
+        for name, value in local_values.items():
+            graph[(module, "local." + name)] = _symbol_references(value, module, tfdata)
+    pending = [
+        dependency
+        for dependencies in graph.values()
+        for dependency in dependencies
+        if dependency[1].startswith("module.")
+    ]
+    while pending:
+        symbol = pending.pop()
+        if symbol in graph:
+            continue
+        _, module, name = symbol[1].split(".", 2)
+        value = _module_output_value(tfdata, module, name)
+        graph[symbol] = _symbol_references(value, module, tfdata)
+        pending.extend(d for d in graph[symbol] if d[1].startswith("module."))
+    return graph
+
+
+def _reference_cycles(
+    graph: Dict[Tuple[str, str], List[Tuple[str, str]]],
+) -> List[List[Tuple[str, str]]]:
+    """Return the reference cycles in graph.
+
+    Each cycle is a path that starts and ends with the same symbol.
+    """
+    cycles: List[List[Tuple[str, str]]] = []
+    # 1 while a symbol is on the DFS path, 2 once all its dependencies are done
+    state: Dict[Tuple[str, str], int] = {}
+    for root in graph:
+        if root in state:
+            continue
+        state[root] = 1
+        path = [root]
+        stack = [iter(graph[root])]
+        while stack:
+            dependency = next(stack[-1], None)
+            if dependency is None:
+                stack.pop()
+                state[path.pop()] = 2
+                continue
+            if dependency not in graph or state.get(dependency) == 2:
+                continue
+            if state.get(dependency) == 1:
+                cycles.append(path[path.index(dependency) :] + [dependency])
+                continue
+            state[dependency] = 1
+            path.append(dependency)
+            stack.append(iter(graph[dependency]))
+    return cycles
+
+
+def report_reference_cycles(tfdata: Dict[str, Any]) -> List[List[Tuple[str, str]]]:
+    """Warn once about each reference cycle between locals and module outputs.
+
+    Without this, a cycle only shows up as one "Cannot fully resolve"
+    warning per attribute that uses it, after handle_metadata_vars has
+    rescanned the attribute until its values repeat. Resolution itself is
+    unchanged.
+
+    Args:
+        tfdata: Terraform data dictionary after extract_locals
+
+    Returns:
+        The cycles found, each as a path that starts and ends with the same
+        symbol
+    """
+    cycles = _reference_cycles(build_symbol_graph(tfdata))
+    for cycle in cycles:
+        click.echo(
+            click.style(
+                "   WARNING: Circular reference "
+                + " -> ".join(_format_symbol(symbol) for symbol in cycle),
+                fg="yellow",
+            )
+        )
+    return cycles
+
+
 def prefix_module_names(tfdata: Dict[str, Any]) -> Dict[str, Any]:
     """Add module prefix to resource names within modules.
 
@@ -910,5 +1312,6 @@ def get_variable_values(
     # Store results in tfdata
     tfdata["variable_list"] = var_data
     tfdata["variable_map"] = var_mappings
+    invalidate_module_index()
 
     return tfdata
@@ -38,6 +38,7 @@ import ollama
 import requests
 import yaml
 
+import modules.fileparser as fileparser
 from modules.config_loader import load_config
 from modules.provider_detector import get_primary_provider_or_default
 
@@ -450,8 +451,10 @@ def _extract_context_block(
         name, environment, team ownership)
 
     Hard-capped at ``max_chars`` characters so a giant repo cannot blow
-    up the prompt budget.
+    up the prompt budget. Comments are harvested here, on first use, rather
+    than during parsing (see fileparser.ensure_comments).
     """
+    fileparser.ensure_comments(tfdata)
     parts: List[str] = []
 
     # Single README from the source directory, if present.
@@ -0,0 +1,212 @@
+"""Cheap copies of module folders.
+
+Cached modules are copied into per-run or per-module folders in a few
+places, and ``shutil.copytree`` rewrote every byte of large module repos
+each time. ``materialize`` tries cheaper strategies first and falls back
+in order when the filesystem or platform does not support one:
+
+    reflink    copy-on-write clones (Linux FICLONE on btrfs/XFS/bcachefs,
+               macOS clonefile on APFS); independent files, no data copied
+    hardlink   a tree of hard links to the source files
+    symlink    one directory symlink to the source (read-only uses only)
+    copy       shutil.copytree
+
+Hard links share content with the source, so writers must replace files
+(write a new file and rename it over the old one) rather than edit them in
+place. Callers that write into the result pass ``writable=True``, which
+rules out the symlink strategy.
+
+The order can be overridden, e.g. to force full copies:
+
+    TERRAVISION_MATERIALIZE=copy
+    TERRAVISION_MATERIALIZE=hardlink,copy
+"""
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import shutil
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STRATEGIES = ("reflink", "hardlink", "symlink", "copy")
+
+# From linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def default_strategies(system: Optional[str] = None) -> List[str]:
+    """Return the strategy order for a platform (default: this one).
+
+    Windows has no reflink API here, and creating symlinks needs developer
+    mode or admin rights, so it starts with hard links (NTFS).
+    """
+    system = system or platform.system()
+    if system == "Windows":
+        return ["hardlink", "symlink", "copy"]
+    return list(STRATEGIES)
+
+
+def configured_strategies() -> List[str]:
+    """Return the strategy order, honouring TERRAVISION_MATERIALIZE."""
+    setting = os.environ.get("TERRAVISION_MATERIALIZE", "").strip().lower()
+    if setting and setting != "auto":
+        chosen = [s.strip() for s in setting.split(",") if s.strip() in STRATEGIES]
+        if chosen:
+            return chosen
+    return default_strategies()
+
+
+def _reflink_file(src: str, dst: str) -> None:
+    """Clone one file with FICLONE (Linux)."""
+    if fcntl is None or platform.system() != "Linux":
+        raise OSError("reflink copies are not supported on this platform")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+
+def _clonefile_tree(src: str, dest: str) -> None:
+    """Clone a whole folder with one clonefile(2) call (macOS APFS)."""
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    # CLONE_NOFOLLOW: clone symlinks themselves
+    if libc.clonefile(os.fsencode(src), os.fsencode(dest), 0x0001) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno), src)
+
+
+def _tree(src: str, dest: str, copy_function: Callable[[str, str], None]) -> None:
+    shutil.copytree(src, dest, symlinks=True, copy_function=copy_function)
+
+
+def _reflink(src: str, dest: str) -> None:
+    if platform.system() == "Darwin":
+        _clonefile_tree(src, dest)
+    else:
+        _tree(src, dest, _reflink_file)
+
+
+def _hardlink(src: str, dest: str) -> None:
+    _tree(src, dest, os.link)
+
+
+def _symlink(src: str, dest: str) -> None:
+    os.symlink(os.path.abspath(src), dest, target_is_directory=True)
+
+
+def _copy(src: str, dest: str) -> None:
+    shutil.copytree(src, dest, symlinks=True)
+
+
+_IMPLEMENTATIONS: Dict[str, Callable[[str, str], None]] = {
+    "reflink": _reflink,
+    "hardlink": _hardlink,
+    "symlink": _symlink,
+    "copy": _copy,
+}
+
+
+_FILE_FUNCTIONS: Dict[str, Callable[[str, str], None]] = {
+    "reflink": _reflink_file,
+    "hardlink": os.link,
+}
+# (strategy, source device, destination device) -> supported
+_probe_results: Dict[tuple, bool] = {}
+
+
+def _first_file(src: str) -> Optional[str]:
+    for dirpath, _, filenames in os.walk(src):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if not os.path.islink(path):
+                return path
+    return None
+
+
+def _supported(strategy: str, src: str, parent: str) -> bool:
+    """Try a per-file strategy on one file before committing to the tree.
+
+    copytree keeps going after a failed copy, so an unsupported strategy
+    would otherwise fail once per file.
+    """
+    file_function = _FILE_FUNCTIONS.get(strategy)
+    if file_function is None or platform.system() == "Darwin":
+        return True
+    try:
+        key = (strategy, os.stat(src).st_dev, os.stat(parent).st_dev)
+    except OSError:
+        return False
+    if key not in _probe_results:
+        sample = _first_file(src)
+        if sample is None:
+            return True
+        probe = os.path.join(parent, f".materialize-probe-{os.getpid()}")
+        try:
+            file_function(sample, probe)
+            _probe_results[key] = True
+        except OSError:
+            _probe_results[key] = False
+        finally:
+            if os.path.lexists(probe):
+                os.remove(probe)
+    return _probe_results[key]
+
+
+def _discard(path: str) -> None:
+    if os.path.islink(path):
+        os.unlink(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def materialize(
+    src: str,
+    dest: str,
+    writable: bool = False,
+    strategies: Optional[Sequence[str]] = None,
+) -> str:
+    """Make dest a copy of the folder src using the cheapest working strategy.
+
+    Args:
+        src: Existing folder
+        dest: Folder to create; must not exist
+        writable: Caller will write into dest, so never symlink it to src
+        strategies: Order to try (default: configured_strategies()). The
+            copy strategy is always tried last.
+
+    Returns:
+        Name of the strategy that produced dest
+
+    Raises:
+        FileExistsError: If dest exists
+        OSError: If even a full copy fails
+    """
+    if os.path.lexists(dest):
+        raise FileExistsError(dest)
+    order = [
+        s
+        for s in (strategies or configured_strategies())
+        if s in _IMPLEMENTATIONS and not (writable and s == "symlink")
+    ]
+    if "copy" not in order:
+        order.append("copy")
+    parent = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(parent, exist_ok=True)
+    for strategy in order:
+        if strategy != "copy" and not _supported(strategy, src, parent):
+            continue
+        try:
+            _IMPLEMENTATIONS[strategy](src, dest)
+            return strategy
+        except (OSError, shutil.Error, AttributeError):
+            # Unsupported here (EXDEV, EOPNOTSUPP, EPERM, no clonefile...);
+            # remove the partial result and try the next strategy
+            if strategy == "copy":
+                raise
+            _discard(dest)
+    raise OSError(f"Could not materialize {src}")  # pragma: no cover
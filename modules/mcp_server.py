@@ -1,8 +1,10 @@
 """Model Context Protocol server exposing TerraVision to AI agents.
 
 Registers one tool per TerraVision command --- ``graphdata``, ``draw`` and
-``visualise`` --- as thin wrappers over :mod:`modules.mcp_service`, which does
-the actual work and holds the server-safety guards. Nothing here reimplements
+``visualise`` --- plus ``get_code_comments``, which returns the source comments
+used as AI annotation context. All are thin wrappers over
+:mod:`modules.mcp_service`, which does the actual work and holds the
+server-safety guards. Nothing here reimplements
 pipeline behaviour, so the tools cannot drift from the equivalent commands.
 
 Requires the optional ``mcp`` dependency::
@@ -24,9 +26,10 @@ from modules import mcp_service
 _INSTRUCTIONS = """\
 TerraVision turns Terraform code into cloud architecture diagrams.
 
-Every tool runs `terraform init` and `terraform plan` against the source unless
-you supply `planfile`/`graphfile`, so a first call against a real repository can
-take minutes. Calls are executed one at a time.
+The graph and diagram tools run `terraform init` and `terraform plan` against
+the source unless you supply `planfile`/`graphfile`, so a first call against a
+real repository can take minutes. get_code_comments only reads the .tf files.
+Calls are executed one at a time.
 
 Start with generate_architecture_graph(services_only=True) for a cheap overview
 of what a stack contains, then request the full graph or a diagram if needed.
@@ -241,6 +244,24 @@ def build_server() -> MCPServer:
             iconsize=iconsize,
         )
 
+    @mcp.tool()
+    def get_code_comments(source: str) -> Dict[str, Any]:
+        """Collect the comments developers wrote in Terraform code.
+
+        Reads the .tf files directly and never runs Terraform, so it is fast
+        and needs no credentials. Comments often say what a resource is for
+        and who owns it, which the graph alone does not.
+
+        Args:
+            source: Terraform directory or Git URL.
+
+        Returns:
+            {"resource_comments", "project_comments", "file_count"}, where
+            resource_comments maps "<type>.<name>" to the comment above that
+            resource and project_comments lists the remaining comment lines.
+        """
+        return mcp_service.run_code_comments(source=source)
+
     return mcp
 
 
@@ -573,3 +573,35 @@ def run_interactive_html(
             )
 
         return {"path": str(produced), "provider": provider}
+
+
+def run_code_comments(source: str) -> Dict[str, Any]:
+    """Collect the human-authored comments in a Terraform source.
+
+    Reads the .tf files under the source (skipping ``.terraform``, ``.git``
+    and ``.terraformignore`` entries) without running Terraform, so it needs
+    no binaries or credentials. These are the comments the AI annotation
+    backend is given as project context.
+
+    Returns:
+        ``{"resource_comments", "project_comments", "file_count"}``, where
+        resource_comments maps ``<type>.<name>`` to the comment block above
+        that resource and project_comments lists the other comment lines,
+        de-duplicated in file order.
+    """
+    import modules.fileparser as fileparser
+    import modules.gitlibs as gitlibs
+    import modules.source_walker as source_walker
+
+    with _guarded(change_dir=False):
+        if os.path.isdir(source):
+            location = source
+        else:
+            location = gitlibs.clone_files(source, fileparser.temp_dir.name)
+        files = [f.path for f in source_walker.walk(location, suffixes=(".tf",))]
+        resource_comments, lines = fileparser.harvest_comments(files)
+        return {
+            "resource_comments": resource_comments,
+            "project_comments": list(dict.fromkeys(line for line in lines if line)),
+            "file_count": len(files),
+        }
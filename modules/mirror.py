@@ -0,0 +1,340 @@
+"""Local mirror of remote module sources for air-gapped runs.
+
+A mirror is a folder of bare git repositories and archive files, plus an
+index (mirror.json) that maps the sources Terraform code refers to onto
+them. When TERRAVISION_MIRROR points at a mirror, gitlibs resolves every
+remote module from it and never touches the network:
+
+- registry sources are answered from the resolutions recorded in the index
+  (source and version constraint to git URL, subfolder and ref), so the
+  version picked does not drift between runs;
+- git sources are cloned from the local bare repository (``git clone
+  --shared``, which copies no objects);
+- archive sources are extracted from the local file, still verifying any
+  ``?checksum=`` the source carries.
+
+``terravision mirror sync`` populates a mirror from a Terraform source on a
+machine with network access (see gitlibs.sync_mirror). The index can also
+be edited by hand to point sources at existing repositories; relative
+paths are resolved against the mirror folder::
+
+    {
+      "version": 1,
+      "sources": {
+        "https://github.com/org/repo": {"kind": "git", "path": "git/repo.git"}
+      },
+      "registry": {
+        "terraform-aws-modules/vpc/aws ~> 5.0": {
+          "url": "https://github.com/terraform-aws-modules/terraform-aws-vpc",
+          "subfolder": "",
+          "ref": "v5.8.1"
+        }
+      }
+    }
+
+Environment overrides:
+
+    TERRAVISION_MIRROR=/path/to/mirror    resolve modules from this mirror
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import git
+
+import modules.archives as archives
+import modules.fetch_manager as fetch_manager
+
+INDEX_FILE = "mirror.json"
+INDEX_FORMAT_VERSION = 1
+GIT_DIR = "git"
+ARCHIVE_DIR = "archives"
+
+_lock = threading.Lock()
+# Set while `mirror sync` works on a mirror that is not TERRAVISION_MIRROR
+# (or suspends mirror mode to resolve sources online); False means disabled
+_override: Optional[Any] = None
+_index_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+class MirrorError(Exception):
+    """Raised when a source cannot be added to or found in the mirror."""
+
+
+def mirror_dir() -> Optional[str]:
+    """Return the active mirror folder, or None when mirror mode is off."""
+    if _override is not None:
+        return _override or None
+    setting = os.environ.get("TERRAVISION_MIRROR", "").strip()
+    return os.path.abspath(os.path.expanduser(setting)) if setting else None
+
+
+def is_enabled() -> bool:
+    """Return True when modules are resolved from a local mirror."""
+    return mirror_dir() is not None
+
+
+@contextlib.contextmanager
+def activated(directory: str) -> Iterator[None]:
+    """Resolve modules from directory for the duration of the block."""
+    global _override
+    previous, _override = _override, os.path.abspath(directory)
+    try:
+        yield
+    finally:
+        _override = previous
+
+
+@contextlib.contextmanager
+def suspended() -> Iterator[None]:
+    """Turn mirror mode off for the duration of the block."""
+    global _override
+    previous, _override = _override, False
+    try:
+        yield
+    finally:
+        _override = previous
+
+
+def source_key(url: str) -> str:
+    """Return the index key for a git or archive URL.
+
+    Forced-getter prefixes, query strings (archive checksums are verified
+    against the local file instead), trailing slashes and a '.git' suffix
+    are dropped, so equivalent spellings share an entry.
+    """
+    for prefix in ("git::", "s3::", "gcs::"):
+        if url.startswith(prefix):
+            url = url[len(prefix) :]
+    url = url.split("?", 1)[0].rstrip("/")
+    return url[: -len(".git")] if url.endswith(".git") else url
+
+
+def registry_key(source: str, version_constraint: str = "") -> str:
+    """Return the index key for a registry source and version constraint."""
+    return f"{source.strip()} {version_constraint.strip()}".strip()
+
+
+def _index_path(directory: str) -> str:
+    return os.path.join(directory, INDEX_FILE)
+
+
+def load_index(directory: Optional[str] = None) -> Dict[str, Any]:
+    """Read a mirror's index (an empty index if it has none yet).
+
+    Args:
+        directory: Mirror folder (default: the active mirror)
+
+    Raises:
+        MirrorError: If the index exists but cannot be parsed
+    """
+    directory = directory or mirror_dir()
+    empty = {"version": INDEX_FORMAT_VERSION, "sources": {}, "registry": {}}
+    if not directory:
+        return empty
+    path = _index_path(directory)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return empty
+    with _lock:
+        cached = _index_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        raise MirrorError(f"Cannot read mirror index {path}: {e}")
+    if not isinstance(index, dict):
+        raise MirrorError(f"Mirror index {path} is not a JSON object")
+    index.setdefault("sources", {})
+    index.setdefault("registry", {})
+    with _lock:
+        _index_cache[path] = (mtime, index)
+    return index
+
+
+def _save_index(directory: str, index: Dict[str, Any]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(staging, _index_path(directory))
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+
+
+def _update_index(directory: str, section: str, key: str, value: Any) -> None:
+    with _lock:
+        _index_cache.pop(_index_path(directory), None)
+    # load_index hands out a shared cached dict; update a copy
+    index = dict(load_index(directory), version=INDEX_FORMAT_VERSION)
+    index[section] = dict(index[section])
+    index[section][key] = value
+    _save_index(directory, index)
+
+
+def lookup_registry(
+    source: str, version_constraint: str = "", directory: Optional[str] = None
+) -> Optional[Tuple[str, str, str]]:
+    """Return the recorded (url, subfolder, ref) for a registry source."""
+    entry = load_index(directory)["registry"].get(
+        registry_key(source, version_constraint)
+    )
+    if not entry:
+        return None
+    return entry["url"], entry.get("subfolder", ""), entry.get("ref", "")
+
+
+def lookup_source(
+    url: str, directory: Optional[str] = None
+) -> Optional[Tuple[str, str]]:
+    """Return (kind, local path) of a mirrored git repository or archive.
+
+    Args:
+        url: Git or archive URL as returned by gitlibs.get_clone_url
+        directory: Mirror folder (default: the active mirror)
+
+    Returns:
+        ('git', path to a bare repository) or ('archive', path to the
+        file), or None if url is not mirrored or its files are missing
+    """
+    directory = directory or mirror_dir()
+    if not directory:
+        return None
+    entry = load_index(directory)["sources"].get(source_key(url))
+    if not entry:
+        return None
+    path = os.path.join(directory, os.path.expanduser(entry["path"]))
+    if not os.path.exists(path):
+        return None
+    return entry.get("kind", "git"), path
+
+
+def record_registry(
+    source: str,
+    version_constraint: str,
+    resolved: Tuple[str, str, str],
+    directory: str,
+) -> None:
+    """Record how a registry source resolved, for use in mirror mode."""
+    url, subfolder, ref = resolved
+    _update_index(
+        directory,
+        "registry",
+        registry_key(source, version_constraint),
+        {"url": url, "subfolder": subfolder, "ref": ref},
+    )
+
+
+def _local_name(url: str) -> str:
+    """Return a readable, collision-free file name for a mirrored URL."""
+    key = source_key(url)
+    digest = hashlib.sha256(key.encode()).hexdigest()[:12]
+    base = re.sub(r"[^A-Za-z0-9._-]+", "_", key.rsplit("/", 1)[-1]) or "source"
+    return f"{digest}-{base}"
+
+
+def add_git(url: str, directory: str) -> str:
+    """Mirror a git repository into directory, or update an existing mirror.
+
+    The bare repository allows partial clone filters, so sparse clones from
+    it work as they do against a hosted remote.
+
+    Args:
+        url: Git repository URL
+        directory: Mirror folder
+
+    Returns:
+        Path to the bare repository
+
+    Raises:
+        MirrorError: If the repository cannot be cloned or fetched
+    """
+    existing = lookup_source(url, directory)
+    if existing and existing[0] == "git":
+        path = existing[1]
+        try:
+            git.Repo(path).git.remote("update", "--prune")
+        except Exception as e:
+            raise MirrorError(f"Cannot update mirror of {url}: {e}")
+        return path
+
+    relative = os.path.join(GIT_DIR, _local_name(url) + ".git")
+    path = os.path.join(directory, relative)
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=directory)
+    try:
+        with fetch_manager.host_slot(url):
+            repo = git.Repo.clone_from(url, staging, multi_options=["--mirror"])
+        with repo.config_writer() as config:
+            config.set_value("uploadpack", "allowFilter", "true")
+            config.set_value("uploadpack", "allowAnySHA1InWant", "true")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+    except Exception as e:
+        raise MirrorError(f"Cannot mirror {url}: {e}")
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    _update_index(
+        directory, "sources", source_key(url), {"kind": "git", "path": relative}
+    )
+    return path
+
+
+def add_archive(url: str, directory: str) -> str:
+    """Download an archive module into directory.
+
+    Args:
+        url: Archive URL, possibly with a go-getter ?checksum= parameter
+        directory: Mirror folder
+
+    Returns:
+        Path to the archive file
+
+    Raises:
+        MirrorError: If the download fails or does not match its checksum
+    """
+    existing = lookup_source(url, directory)
+    if existing and existing[0] == "archive":
+        return existing[1]
+
+    download_url = source_key(url)
+    try:
+        _, checksum = archives.parse_checksum(url)
+    except ValueError as e:
+        raise MirrorError(str(e))
+    relative = os.path.join(ARCHIVE_DIR, _local_name(download_url))
+    path = os.path.join(directory, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            fetch_manager.download(download_url, f, timeout=120)
+        if checksum:
+            with open(staging, "rb") as f:
+                reader = archives.HashingReader(f, [checksum[0]])
+                while reader.read(archives.CHUNK_SIZE):
+                    pass
+            archives.verify(reader, checksum)
+        os.replace(staging, path)
+    except Exception as e:
+        raise MirrorError(f"Cannot mirror {download_url}: {e}")
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+    _update_index(
+        directory, "sources", source_key(url), {"kind": "archive", "path": relative}
+    )
+    return path
@@ -0,0 +1,410 @@
+"""Content-addressed store for remote module sources.
+
+Every git clone and archive download lands in one store entry keyed by the
+resolved source URL and ref, shared by all module blocks that use it. The
+per-module folders under ``~/.terravision/module_cache`` (named
+``<source>;<module>;``, which downstream code relies on) are views onto
+store entries rather than separate clones.
+
+Entries are populated in a staging folder and renamed into place under a
+per-entry file lock, so concurrent runs never see a half-written entry.
+``meta.json`` records the source, the commit (for git sources) and a digest
+of the tree; its mtime is the entry's last use for LRU eviction. A run
+that added entries prunes the store to a size cap once it is done with
+its modules (prune_pending), so it never evicts entries its own views
+still point at. Environment overrides:
+
+    TERRAVISION_MODULE_CACHE_MAX_MB=2048   total size cap
+
+``terravision cache stat|prune|verify`` manage the store from the CLI.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+STORE_DIR = str(Path(Path.home(), ".terravision", "module_store"))
+# Bump when the entry layout changes so old entries are rebuilt
+CACHE_FORMAT_VERSION = "1"
+DEFAULT_MAX_MB = 2048
+
+TREE_DIR = "tree"
+META_FILE = "meta.json"
+_LOCK_SUFFIX = ".lock"
+_STAGING_PREFIX = ".tmp-"
+# Staging folders older than this were left by a crashed run
+_STALE_STAGING_SECONDS = 3600
+# Not part of the module content: skipped by tree_digest
+_DIGEST_IGNORED_DIRS = {".git"}
+# Stores that gained entries in this run, pruned by prune_pending()
+_pending_prune: Set[str] = set()
+
+
+def entry_key(url: str, ref: str = "", subdir: str = "") -> str:
+    """Return the store key for a source URL and ref (tag, branch or commit).
+
+    subdir is set for sparse entries holding only part of a repository, so
+    they never stand in for a full checkout or for another subfolder.
+    """
+    normalized = url.strip().rstrip("/")
+    if normalized.endswith(".git"):
+        normalized = normalized[: -len(".git")]
+    key = f"{CACHE_FORMAT_VERSION}\n{normalized}\n{ref.strip()}"
+    if subdir:
+        key += f"\nsubdir={subdir.strip('/')}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def entry_path(key: str, store_dir: Optional[str] = None) -> str:
+    return os.path.join(store_dir or STORE_DIR, key)
+
+
+def tree_path(key: str, store_dir: Optional[str] = None) -> str:
+    """Return the folder holding an entry's module files."""
+    return os.path.join(entry_path(key, store_dir), TREE_DIR)
+
+
+def _try_lock(handle: Any, blocking: bool) -> bool:
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(handle.fileno(), flags)
+        except BlockingIOError:
+            return False
+        return True
+    mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+    while True:
+        try:
+            msvcrt.locking(handle.fileno(), mode, 1)
+            return True
+        except OSError:
+            # LK_LOCK gives up after ~10 seconds; keep waiting
+            if not blocking:
+                return False
+
+
+def _unlock(handle: Any) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def entry_lock(
+    key: str, store_dir: Optional[str] = None, blocking: bool = True
+) -> Iterator[bool]:
+    """Hold the entry's exclusive file lock.
+
+    Yields:
+        True if the lock is held; False if blocking is off and another
+        process or thread holds it
+    """
+    store_dir = store_dir or STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, key + _LOCK_SUFFIX), "a+b") as handle:
+        locked = _try_lock(handle, blocking)
+        try:
+            yield locked
+        finally:
+            if locked:
+                _unlock(handle)
+
+
+def tree_digest(path: str) -> Tuple[str, int, int]:
+    """Hash every file under path (relative names and contents).
+
+    Returns:
+        Tuple of (hex digest, file count, total bytes)
+    """
+    digest = hashlib.sha256()
+    files = 0
+    size = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = sorted(d for d in dirnames if d not in _DIGEST_IGNORED_DIRS)
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, path).replace(os.sep, "/")
+            digest.update(f"file:{rel}\n".encode())
+            if os.path.islink(full):
+                digest.update(f"link:{os.readlink(full)}\n".encode())
+                continue
+            with open(full, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+                    size += len(chunk)
+            files += 1
+    return digest.hexdigest(), files, size
+
+
+def _read_meta(key: str, store_dir: Optional[str]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(entry_path(key, store_dir), META_FILE)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def lookup(
+    url: str, ref: str = "", store_dir: Optional[str] = None, subdir: str = ""
+) -> Optional[str]:
+    """Return the tree folder of a complete entry and mark it used, or None."""
+    key = entry_key(url, ref, subdir)
+    if _read_meta(key, store_dir) is None:
+        return None
+    try:
+        os.utime(os.path.join(entry_path(key, store_dir), META_FILE))
+    except OSError:
+        pass
+    return tree_path(key, store_dir)
+
+
+def get_or_fetch(
+    url: str,
+    ref: str,
+    fetch: Callable[[str], Optional[str]],
+    store_dir: Optional[str] = None,
+    subdir: str = "",
+) -> str:
+    """Return the tree folder for (url, ref), fetching it on a miss.
+
+    The entry lock is held while checking and populating, so concurrent
+    callers for the same source fetch it once and the others wait.
+
+    Args:
+        url: Resolved source URL (git remote or archive URL)
+        ref: Tag, branch or version ('' for the default branch)
+        fetch: Called with an empty staging folder to fill with the module
+            files. Returns the commit hash for git sources or the archive
+            digest for downloads, recorded as the entry's 'commit'.
+        store_dir: Store location (default: STORE_DIR)
+        subdir: Subfolder a sparse fetch was limited to ('' for the full tree)
+
+    Returns:
+        Path to the entry's tree folder
+    """
+    store_dir = store_dir or STORE_DIR
+    key = entry_key(url, ref, subdir)
+    with entry_lock(key, store_dir):
+        cached = lookup(url, ref, store_dir, subdir)
+        if cached:
+            return cached
+        staging = tempfile.mkdtemp(prefix=_STAGING_PREFIX, dir=store_dir)
+        try:
+            staging_tree = os.path.join(staging, TREE_DIR)
+            os.makedirs(staging_tree)
+            commit = fetch(staging_tree)
+            digest, files, size = tree_digest(staging_tree)
+            meta = {
+                "format": CACHE_FORMAT_VERSION,
+                "url": url,
+                "ref": ref,
+                "subdir": subdir,
+                "commit": commit or "",
+                "digest": digest,
+                "files": files,
+                "bytes": size,
+                "created": time.time(),
+            }
+            # Recorded so pruning does not have to walk every entry
+            meta["disk_bytes"] = _dir_size(staging)
+            with open(os.path.join(staging, META_FILE), "w") as f:
+                json.dump(meta, f, indent=2)
+            entry = entry_path(key, store_dir)
+            if os.path.isdir(entry):
+                # Incomplete entry left by an interrupted run
+                shutil.rmtree(entry, ignore_errors=True)
+            os.rename(staging, entry)
+        finally:
+            if os.path.isdir(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+    _pending_prune.add(store_dir)
+    return tree_path(key, store_dir)
+
+
+def list_entries(store_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return metadata of every store entry, least recently used first.
+
+    Each dict carries the stored meta.json fields (including 'disk_bytes')
+    plus 'key' and 'last_used' (epoch seconds). Entries without readable metadata
+    are reported with 'incomplete': True.
+    """
+    store_dir = store_dir or STORE_DIR
+    if not os.path.isdir(store_dir):
+        return []
+    entries = []
+    for name in os.listdir(store_dir):
+        path = os.path.join(store_dir, name)
+        if name.startswith(".") or not os.path.isdir(path):
+            continue
+        meta = _read_meta(name, store_dir)
+        info: Dict[str, Any] = dict(meta or {"incomplete": True})
+        info["key"] = name
+        meta_file = os.path.join(path, META_FILE)
+        info["last_used"] = os.path.getmtime(
+            meta_file if os.path.exists(meta_file) else path
+        )
+        if "disk_bytes" not in info:
+            info["disk_bytes"] = _dir_size(path)
+        entries.append(info)
+    entries.sort(key=lambda e: (e["last_used"], e["key"]))
+    return entries
+
+
+def _remove_entry(key: str, store_dir: str) -> bool:
+    """Delete an entry unless another process holds its lock."""
+    with entry_lock(key, store_dir, blocking=False) as locked:
+        if not locked:
+            return False
+        shutil.rmtree(entry_path(key, store_dir), ignore_errors=True)
+    try:
+        os.remove(os.path.join(store_dir, key + _LOCK_SUFFIX))
+    except OSError:
+        pass
+    return True
+
+
+def max_bytes_setting() -> int:
+    """Return the size cap from TERRAVISION_MODULE_CACHE_MAX_MB."""
+    try:
+        max_mb = float(
+            os.environ.get("TERRAVISION_MODULE_CACHE_MAX_MB", DEFAULT_MAX_MB)
+        )
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024)
+
+
+def _remove_stale_staging(store_dir: str) -> None:
+    cutoff = time.time() - _STALE_STAGING_SECONDS
+    try:
+        names = os.listdir(store_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(store_dir, name)
+        if not name.startswith(_STAGING_PREFIX):
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def prune(
+    store_dir: Optional[str] = None, max_bytes: Optional[int] = None
+) -> List[str]:
+    """Evict least recently used entries until the store fits in max_bytes.
+
+    Incomplete entries and staging folders left by crashed runs are always
+    removed. Entries locked by a running fetch are skipped.
+
+    Returns:
+        List of evicted keys
+    """
+    store_dir = store_dir or STORE_DIR
+    if max_bytes is None:
+        max_bytes = max_bytes_setting()
+    _remove_stale_staging(store_dir)
+    entries = list_entries(store_dir)
+    total = sum(e["disk_bytes"] for e in entries)
+    evicted = []
+    for entry in entries:
+        if not entry.get("incomplete") and total <= max_bytes:
+            continue
+        if _remove_entry(entry["key"], store_dir):
+            total -= entry["disk_bytes"]
+            evicted.append(entry["key"])
+    return evicted
+
+
+def prune_pending() -> List[str]:
+    """Prune every store that gained entries since the last call.
+
+    Called once a run has finished reading its modules, so entries fetched
+    early in the run are not evicted while later modules are fetched.
+
+    Returns:
+        List of evicted keys
+    """
+    evicted = []
+    while _pending_prune:
+        evicted.extend(prune(_pending_prune.pop()))
+    return evicted
+
+
+def verify(store_dir: Optional[str] = None, fix: bool = False) -> List[Tuple[str, str]]:
+    """Check every entry's tree against the digest recorded when it was stored.
+
+    Args:
+        store_dir: Store location (default: STORE_DIR)
+        fix: Remove entries that fail the check
+
+    Returns:
+        List of (key, problem) for entries that failed
+    """
+    store_dir = store_dir or STORE_DIR
+    problems = []
+    for entry in list_entries(store_dir):
+        key = entry["key"]
+        if entry.get("incomplete"):
+            problem = "missing or unreadable meta.json"
+        elif not os.path.isdir(tree_path(key, store_dir)):
+            problem = "missing tree folder"
+        elif tree_digest(tree_path(key, store_dir))[0] != entry.get("digest"):
+            problem = "content does not match recorded digest"
+        else:
+            continue
+        problems.append((key, problem))
+        if fix:
+            _remove_entry(key, store_dir)
+    return problems
+
+
+def remove_dangling_links(directory: str) -> List[str]:
+    """Remove symlinks in directory whose target no longer exists.
+
+    Used for per-module views whose store entry was evicted.
+
+    Returns:
+        Names of the removed links
+    """
+    removed = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    for name in names:
+        path = os.path.join(directory, name)
+        if os.path.islink(path) and not os.path.exists(path):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            removed.append(name)
+    return removed
@@ -0,0 +1,178 @@
+"""On-disk cache of parsed HCL files.
+
+Registry modules such as terraform-aws-modules/vpc are parsed on every run
+and in every project that calls them, although their files never change.
+Entries hold the ``hcl2.load`` result for one file. They are keyed by a
+SHA-256 of the raw file content plus a parser fingerprint (python-hcl2 and
+lark versions, grammar files and the cache format), so a hit never runs
+the parser.
+
+Entries are single marshal files under ~/.terravision/parse_cache, written
+atomically so parse pool workers can store concurrently. The cache is
+pruned once per run, least recently used first, to a total size cap.
+Environment overrides:
+
+    TERRAVISION_PARSE_CACHE=off             disable the cache
+    TERRAVISION_PARSE_CACHE_MAX_MB=256      total size cap
+"""
+
+import functools
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import hcl2
+import lark
+
+import modules.hcl_parser as hcl_parser
+
+PARSE_CACHE_DIR = str(Path(Path.home(), ".terravision", "parse_cache"))
+# Bump when the cached value or the code producing it (_preprocess_hcl)
+# changes so stale entries miss.
+CACHE_FORMAT_VERSION = "2"
+DEFAULT_MAX_MB = 256
+
+_ENTRY_SUFFIX = ".bin"
+
+
+def is_enabled() -> bool:
+    """Return False when the cache is switched off via TERRAVISION_PARSE_CACHE."""
+    setting = os.environ.get("TERRAVISION_PARSE_CACHE", "on").strip().lower()
+    return setting not in ("0", "off", "false", "no")
+
+
+@functools.lru_cache(maxsize=None)
+def parser_fingerprint() -> str:
+    """Return a hash identifying the parser that produces cached entries."""
+    digest = hashlib.sha256()
+    digest.update(f"format={CACHE_FORMAT_VERSION}\n".encode())
+    digest.update(f"hcl2={getattr(hcl2, '__version__', '')}\n".encode())
+    digest.update(f"lark={lark.__version__}\n".encode())
+    # marshal output is only readable by the same marshal version
+    digest.update(f"marshal={marshal.version}\n".encode())
+    digest.update(f"python={sys.version_info[0]}.{sys.version_info[1]}\n".encode())
+    # Both grammars: hcl_parser's, and python-hcl2's used as its fallback
+    for grammar in (
+        Path(hcl_parser.GRAMMAR_FILE),
+        Path(hcl2.__file__).with_name("hcl2.lark"),
+    ):
+        if grammar.is_file():
+            digest.update(grammar.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(content: str) -> str:
+    """Return the entry key for raw file content."""
+    digest = hashlib.sha256(parser_fingerprint().encode())
+    digest.update(content.encode("utf8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: Optional[str]) -> str:
+    return os.path.join(cache_dir or PARSE_CACHE_DIR, key + _ENTRY_SUFFIX)
+
+
+def load(key: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the cached parse result for key, or None on a miss."""
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, "rb") as f:
+            value = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError):
+        # Corrupt or truncated entry: drop it and treat as a miss
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    if not isinstance(value, dict):
+        return None
+    try:
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+
+def store(key: str, value: Dict[str, Any], cache_dir: Optional[str] = None) -> bool:
+    """Write an entry atomically.
+
+    Failures are ignored; the cache must never break a parse.
+
+    Returns:
+        True if the entry was written
+    """
+    cache_dir = cache_dir or PARSE_CACHE_DIR
+    try:
+        data = marshal.dumps(value)
+    except ValueError:
+        # Value holds a type marshal cannot write; not worth caching
+        return False
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=".tmp-", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(staging, _entry_path(key, cache_dir))
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+    except OSError:
+        return False
+    return True
+
+
+def prune(
+    cache_dir: Optional[str] = None, max_bytes: Optional[int] = None
+) -> List[str]:
+    """Evict least recently used entries until the cache fits in max_bytes.
+
+    Returns:
+        List of evicted cache keys
+    """
+    cache_dir = cache_dir or PARSE_CACHE_DIR
+    if max_bytes is None:
+        try:
+            max_mb = float(
+                os.environ.get("TERRAVISION_PARSE_CACHE_MAX_MB", DEFAULT_MAX_MB)
+            )
+        except ValueError:
+            max_mb = DEFAULT_MAX_MB
+        max_bytes = int(max_mb * 1024 * 1024)
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+    except OSError:
+        return []
+    total = sum(size for _, _, size in entries)
+    if total <= max_bytes:
+        return []
+    # Oldest (least recently used) first
+    entries.sort()
+    evicted = []
+    for _, name, size in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError:
+            continue
+        total -= size
+        evicted.append(name[: -len(_ENTRY_SUFFIX)])
+    return evicted
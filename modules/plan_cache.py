@@ -0,0 +1,275 @@
+"""On-disk cache of terraform plan and graph output for local sources.
+
+Running init/plan/show/graph on an unchanged stack is the slowest part of a
+render. Entries are keyed by a hash of everything that can change the plan:
+the source tree (and any local modules it references), var files, TF_VAR_*
+environment variables, workspace and the terraform binary version. A hit
+returns the decoded plan JSON and the converted graph JSON directly.
+
+Entries live under ~/.terravision/plan_cache and are evicted by age and by
+total size (least recently used first). Environment overrides:
+
+    TERRAVISION_PLAN_CACHE=off              disable the cache
+    TERRAVISION_PLAN_CACHE_MAX_MB=1024      total size cap
+    TERRAVISION_PLAN_CACHE_MAX_AGE_DAYS=7   maximum entry age
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+import modules.helpers as helpers
+
+PLAN_CACHE_DIR = str(Path(Path.home(), ".terravision", "plan_cache"))
+# Bump when the stored layout or key inputs change so stale entries miss.
+CACHE_FORMAT_VERSION = "1"
+DEFAULT_MAX_MB = 1024
+DEFAULT_MAX_AGE_DAYS = 7
+
+# Directories that never contribute to a plan
+IGNORED_DIRS = {".terraform", ".git", ".terragrunt-cache", "node_modules"}
+# Files terravision itself writes into the source folder during a run
+IGNORED_FILES = {"terravision_override.tf", "tfdata.json"}
+
+_LOCAL_SOURCE_RE = re.compile(r'\bsource\s*=\s*"(\.{1,2}/[^"]*)"')
+_PLAN_FILE = "plan.json"
+_GRAPH_FILE = "graph.json"
+_MODULES_DIR = "modules"
+
+
+def is_enabled() -> bool:
+    """Return False when the cache is switched off via TERRAVISION_PLAN_CACHE."""
+    setting = os.environ.get("TERRAVISION_PLAN_CACHE", "on").strip().lower()
+    return setting not in ("0", "off", "false", "no")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _tf_version() -> str:
+    """Return the first line of `<binary> -v`, or '' if it cannot be run."""
+    try:
+        result = subprocess.run(
+            [helpers.get_tf_binary(), "-v"], capture_output=True, text=True
+        )
+    except OSError:
+        return ""
+    return result.stdout.split("\n")[0].strip()
+
+
+def _iter_source_files(root: str):
+    """Yield files under root in a stable order, skipping ignored entries."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS)
+        for name in sorted(filenames):
+            if name in IGNORED_FILES or name.endswith(".terravision.bak"):
+                continue
+            yield os.path.join(dirpath, name)
+
+
+def _hash_file(digest: Any, path: str) -> None:
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def _local_module_dirs(tf_file: str) -> List[str]:
+    """Return directories of local `source = "./..."` modules in a .tf file."""
+    try:
+        with open(tf_file, "r", encoding="utf8", errors="ignore") as f:
+            content = f.read()
+    except OSError:
+        return []
+    base = os.path.dirname(tf_file)
+    return [
+        os.path.normpath(os.path.join(base, src.split("//")[0]))
+        for src in _LOCAL_SOURCE_RE.findall(content)
+    ]
+
+
+def _is_within(path: str, roots: List[str]) -> bool:
+    return any(path == r or path.startswith(r + os.sep) for r in roots)
+
+
+def hash_run_settings(digest: Any, varfiles: List[str], workspace: str) -> None:
+    """Feed the binary version, workspace, TF_VAR_* and var files into digest."""
+    digest.update(f"format={CACHE_FORMAT_VERSION}\n".encode())
+    digest.update(f"binary={helpers.get_tf_binary()}\n".encode())
+    digest.update(f"version={_tf_version()}\n".encode())
+    digest.update(f"workspace={workspace}\n".encode())
+    for name in sorted(k for k in os.environ if k.startswith("TF_VAR_")):
+        digest.update(f"env:{name}={os.environ[name]}\n".encode())
+    for vf in varfiles:
+        digest.update(f"varfile:{vf}\n".encode())
+        if os.path.isfile(vf):
+            _hash_file(digest, vf)
+
+
+def hash_source_tree(digest: Any, codepath: str) -> None:
+    """Feed every file under codepath into digest.
+
+    Local modules referenced from outside the folder (e.g.
+    `source = "../modules/vpc"`) are followed and hashed as well.
+    """
+    codepath = os.path.abspath(codepath)
+    roots = [codepath]
+    index = 0
+    while index < len(roots):
+        root = roots[index]
+        index += 1
+        for path in _iter_source_files(root):
+            digest.update(f"file:{os.path.relpath(path, codepath)}\n".encode())
+            _hash_file(digest, path)
+            if path.endswith(".tf"):
+                for module_dir in _local_module_dirs(path):
+                    if os.path.isdir(module_dir) and not _is_within(module_dir, roots):
+                        roots.append(module_dir)
+
+
+def cache_key(codepath: str, varfiles: List[str], workspace: str) -> str:
+    """Compute the content hash that identifies a plan for this source."""
+    digest = hashlib.sha256()
+    hash_run_settings(digest, varfiles, workspace)
+    hash_source_tree(digest, codepath)
+    return digest.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: Optional[str]) -> str:
+    return os.path.join(cache_dir or PLAN_CACHE_DIR, key)
+
+
+def load(
+    key: str, tf_data_dir: str, cache_dir: Optional[str] = None
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Return (plandata, graphdata) for key, or None on a miss.
+
+    Modules terraform downloaded during the original init are restored into
+    tf_data_dir so read_tfsource finds them through modules.json as usual.
+    """
+    entry = _entry_path(key, cache_dir)
+    if not os.path.isdir(entry):
+        return None
+    try:
+        with open(os.path.join(entry, _PLAN_FILE)) as f:
+            plandata = json.load(f)
+        with open(os.path.join(entry, _GRAPH_FILE)) as f:
+            graphdata = json.load(f)
+        cached_modules = os.path.join(entry, _MODULES_DIR)
+        if os.path.isdir(cached_modules):
+            shutil.copytree(
+                cached_modules,
+                os.path.join(tf_data_dir, _MODULES_DIR),
+                dirs_exist_ok=True,
+            )
+    except (OSError, ValueError):
+        # Corrupt or half-removed entry: drop it and treat as a miss
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    # Mark as recently used for LRU eviction
+    os.utime(entry)
+    return plandata, graphdata
+
+
+def store(
+    key: str,
+    plandata: Dict[str, Any],
+    graphdata: Dict[str, Any],
+    tf_data_dir: str,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Write an entry atomically, then evict old entries.
+
+    Failures only produce a warning; the cache must never break a render.
+    """
+    cache_dir = cache_dir or PLAN_CACHE_DIR
+    entry = _entry_path(key, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+        try:
+            with open(os.path.join(staging, _PLAN_FILE), "w") as f:
+                json.dump(plandata, f)
+            with open(os.path.join(staging, _GRAPH_FILE), "w") as f:
+                json.dump(graphdata, f)
+            tf_modules = os.path.join(tf_data_dir, _MODULES_DIR)
+            if os.path.isdir(tf_modules):
+                shutil.copytree(
+                    tf_modules, os.path.join(staging, _MODULES_DIR), symlinks=True
+                )
+            if os.path.isdir(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            os.rename(staging, entry)
+        finally:
+            if os.path.isdir(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+        prune(cache_dir)
+    except OSError as e:
+        click.echo(
+            click.style(f"  WARNING: Could not write plan cache: {e}", fg="yellow")
+        )
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def prune(
+    cache_dir: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    max_age: Optional[float] = None,
+) -> List[str]:
+    """Evict entries older than max_age seconds, then least recently used
+    entries until the cache fits in max_bytes.
+
+    Returns:
+        List of evicted cache keys
+    """
+    cache_dir = cache_dir or PLAN_CACHE_DIR
+    if max_bytes is None:
+        max_bytes = int(
+            _env_number("TERRAVISION_PLAN_CACHE_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024
+        )
+    if max_age is None:
+        max_age = (
+            _env_number("TERRAVISION_PLAN_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)
+            * 86400
+        )
+    if not os.path.isdir(cache_dir):
+        return []
+    now = time.time()
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith(".") or not os.path.isdir(path):
+            continue
+        entries.append((os.path.getmtime(path), name, _dir_size(path)))
+    # Oldest (least recently used) first
+    entries.sort()
+    evicted = []
+    total = sum(size for _, _, size in entries)
+    for mtime, name, size in entries:
+        if now - mtime > max_age or total > max_bytes:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+            total -= size
+            evicted.append(name)
+    return evicted
@@ -14,9 +14,13 @@ Strategy:
    to obtain the final resolved attribute value.
 4. For nested ``module.X.Y`` references inside an output expression,
    recurse with the fully-qualified absolute path.
+
+The plan is walked once into a PlanIndex (module path to configuration
+and outputs, resource address to planned resource), so each lookup is a
+dict access however deeply modules are nested.
 """
 
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 
 # HCL built-in function names that can false-positive as module attributes
@@ -86,6 +90,66 @@ def is_hcl_function_suffix(module_var: str) -> bool:
     return last in _HCL_FUNCTION_NAMES
 
 
+class PlanIndex:
+    """Lookups into one plan JSON, built in a single pass.
+
+    Module paths are tuples of module call names without instance keys
+    (``("eks", "node_group")``), matching how module_calls nest in the
+    configuration.
+    """
+
+    def __init__(self, plan: Dict[str, Any]):
+        self.plan = plan
+        # Module path -> configuration node (the "module" of its call)
+        self.configs: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        # Module path -> its output definitions
+        self.outputs: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        # Resource address -> planned resource (address, values, ...)
+        self.resources: Dict[str, Dict[str, Any]] = {}
+
+        root = (plan.get("configuration") or {}).get("root_module") or {}
+        pending: List[Tuple[Tuple[str, ...], Dict[str, Any]]] = [((), root)]
+        while pending:
+            path, node = pending.pop()
+            self.configs[path] = node
+            self.outputs[path] = node.get("outputs") or {}
+            for name, call in (node.get("module_calls") or {}).items():
+                pending.append((path + (name,), call.get("module") or {}))
+
+        planned_root = (plan.get("planned_values") or {}).get("root_module") or {}
+        for resource in planned_root.get("resources") or []:
+            self._add_resource(resource)
+        # Depth-first, so the first module listed under an address wins as
+        # it did when child_modules were searched per lookup
+        stack = list(reversed(planned_root.get("child_modules") or []))
+        while stack:
+            child = stack.pop()
+            for resource in child.get("resources") or []:
+                self._add_resource(resource)
+            stack.extend(reversed(child.get("child_modules") or []))
+
+    def _add_resource(self, resource: Dict[str, Any]) -> None:
+        address = resource.get("address")
+        if address is not None:
+            self.resources.setdefault(address, resource)
+
+
+# Index of the plan last looked up; kept out of tfdata so --debug dumps of
+# tfdata stay plain JSON
+_plan_index_cache: Dict[str, Any] = {}
+
+
+def plan_index(tfdata: Dict[str, Any]) -> PlanIndex:
+    """Return the PlanIndex for ``tfdata["plandata"]``, building it once."""
+    plan = tfdata.get("plandata") or {}
+    cached = _plan_index_cache.get("index")
+    if cached is not None and cached.plan is plan:
+        return cached
+    index = PlanIndex(plan)
+    _plan_index_cache["index"] = index
+    return index
+
+
 def resolve_module_ref_from_plan(
     module_var: str,
     tfdata: Dict[str, Any],
@@ -113,31 +177,24 @@ def resolve_module_ref_from_plan(
         return None
     _visited = _visited | {module_var}
 
-    plan = tfdata.get("plandata") or {}
-    config_root = (plan.get("configuration") or {}).get("root_module") or {}
-    planned = plan.get("planned_values") or {}
-
     parts = module_var.split(".")
     if len(parts) < 3 or parts[0] != "module":
         return None
 
-    current_config = config_root
+    index = plan_index(tfdata)
+    path: Tuple[str, ...] = ()
     module_path_parts: List[str] = []
     i = 1
     while i < len(parts) - 1:
-        name = parts[i].split("[")[0]
-        mc = current_config.get("module_calls") or {}
-        if name not in mc:
+        child = path + (parts[i].split("[")[0],)
+        if child not in index.configs:
             break
-        current_config = mc[name].get("module") or {}
+        path = child
         module_path_parts.append(parts[i])
         i += 1
 
-    if i >= len(parts):
-        return None
-
     output_name = parts[i]
-    outputs = current_config.get("outputs") or {}
+    outputs = index.outputs[path]
     if output_name not in outputs:
         return None
 
@@ -157,7 +214,7 @@ def resolve_module_ref_from_plan(
 
     for ref in refs:
         resolved = _resolve_reference(
-            ref, module_address, planned, tfdata, prefer, _visited
+            ref, module_address, index, tfdata, prefer, _visited
         )
         if resolved is not None:
             return resolved
@@ -175,7 +232,7 @@ def resolve_module_ref_to_value(
 def _resolve_reference(
     ref: str,
     module_address: str,
-    planned_values: Dict[str, Any],
+    index: PlanIndex,
     tfdata: Dict[str, Any],
     prefer: str,
     visited: Set[str],
@@ -200,52 +257,25 @@ def _resolve_reference(
         else f"{resource_type}.{resource_name}"
     )
 
-    # Address-preferred mode: return target address even if values are empty.
-    # Graph code (add_relations) needs the address to create edges; a
-    # computed-after-apply null in planned_values shouldn't block that.
+    # Address-preferred mode: return target address even if values are empty
+    # or the plan didn't surface the resource. Graph code (add_relations)
+    # needs the address to create edges; a computed-after-apply null in
+    # planned_values shouldn't block that.
     if prefer == "address":
-        resources = _find_module_resources(module_address, planned_values)
-        for r in resources:
-            if r.get("address") == target_addr:
-                return target_addr
-        # Resource not found in planned_values — still return the address;
-        # it's a valid reference even if the plan didn't surface the resource.
         return target_addr
 
     # Value-preferred mode: return the resolved attribute value.
-    resources = _find_module_resources(module_address, planned_values)
-    for r in resources:
-        if r.get("address") != target_addr:
-            continue
-        values = r.get("values") or {}
-        if attr:
-            val = values.get(attr)
-            if val is not None:
-                return str(val)
-        # Either no attr requested, or attr was null (known-after-apply).
-        # Try common identifying attrs as fallback.
-        for candidate in ("id", "arn", "name", "cidr_block"):
-            if candidate in values and values[candidate] is not None:
-                return str(values[candidate])
+    resource = index.resources.get(target_addr)
+    if resource is None:
         return None
+    values = resource.get("values") or {}
+    if attr:
+        val = values.get(attr)
+        if val is not None:
+            return str(val)
+    # Either no attr requested, or attr was null (known-after-apply).
+    # Try common identifying attrs as fallback.
+    for candidate in ("id", "arn", "name", "cidr_block"):
+        if candidate in values and values[candidate] is not None:
+            return str(values[candidate])
     return None
-
-
-def _find_module_resources(
-    module_address: str, planned_values: Dict[str, Any]
-) -> List[Dict[str, Any]]:
-    """Return the resources list for ``module_address`` in planned_values."""
-    root = planned_values.get("root_module") or {}
-    if not module_address:
-        return root.get("resources") or []
-
-    def walk(node: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
-        for cm in node.get("child_modules") or []:
-            if cm.get("address") == module_address:
-                return cm.get("resources") or []
-            sub = walk(cm)
-            if sub is not None:
-                return sub
-        return None
-
-    return walk(root) or []
@@ -0,0 +1,228 @@
+"""On-disk cache of Terraform registry API responses.
+
+Resolving a registry module takes up to four requests (service discovery,
+module metadata or versions, version details, download URL), and each run
+repeated them for every module. Responses are now kept under
+~/.terravision/registry_cache as one JSON file per request and reused while
+fresh. Stale entries are revalidated with If-None-Match / If-Modified-Since
+when the registry sent an ETag or Last-Modified header, so an unchanged
+response costs a 304 with no body.
+
+Requests for a specific module version never change and are kept for
+IMMUTABLE_TTL_SECONDS; everything else for the TTL below. If the registry
+cannot be reached, a stale entry is used rather than failing the run. In
+offline mode only cached responses are used and nothing is sent.
+Environment overrides:
+
+    TERRAVISION_REGISTRY_CACHE=off          disable the cache
+    TERRAVISION_REGISTRY_CACHE_TTL=3600     freshness in seconds
+    TERRAVISION_OFFLINE=1                   never contact the registry
+
+Entries are keyed by method, URL and a hash of the Authorization header, so
+responses seen with one token are not served for another. The token itself
+is never written to disk.
+
+The download URL request is not sent through this cache: private
+registries answer it with short-lived signed URLs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import click
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import modules.fetch_manager as fetch_manager
+
+REGISTRY_CACHE_DIR = str(Path(Path.home(), ".terravision", "registry_cache"))
+CACHE_FORMAT_VERSION = "1"
+DEFAULT_TTL_SECONDS = 3600
+IMMUTABLE_TTL_SECONDS = 7 * 24 * 3600
+
+# Response headers callers read; everything else is dropped
+_KEPT_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Location",
+    "X-Terraform-Get",
+)
+
+
+class OfflineError(requests.ConnectionError):
+    """Raised in offline mode when a response is not cached."""
+
+
+def is_enabled() -> bool:
+    """Return False when the cache is switched off via TERRAVISION_REGISTRY_CACHE."""
+    setting = os.environ.get("TERRAVISION_REGISTRY_CACHE", "on").strip().lower()
+    return setting not in ("0", "off", "false", "no")
+
+
+def is_offline() -> bool:
+    """Return True when TERRAVISION_OFFLINE is set."""
+    setting = os.environ.get("TERRAVISION_OFFLINE", "").strip().lower()
+    return setting in ("1", "on", "true", "yes")
+
+
+def default_ttl() -> float:
+    """Return the freshness period from TERRAVISION_REGISTRY_CACHE_TTL."""
+    try:
+        return float(
+            os.environ.get("TERRAVISION_REGISTRY_CACHE_TTL", DEFAULT_TTL_SECONDS)
+        )
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def cache_key(method: str, url: str, headers: Optional[Dict[str, str]]) -> str:
+    """Return the entry key for a request."""
+    auth = (headers or {}).get("Authorization", "")
+    digest = hashlib.sha256(
+        f"{CACHE_FORMAT_VERSION}\n{method.upper()}\n{url}\n".encode()
+    )
+    digest.update(hashlib.sha256(auth.encode()).digest())
+    return digest.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: Optional[str]) -> str:
+    return os.path.join(cache_dir or REGISTRY_CACHE_DIR, key + ".json")
+
+
+def _load(key: str, cache_dir: Optional[str]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_entry_path(key, cache_dir)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and "status" in entry else None
+
+
+def _store(key: str, entry: Dict[str, Any], cache_dir: Optional[str]) -> None:
+    cache_dir = cache_dir or REGISTRY_CACHE_DIR
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=".tmp-", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(staging, _entry_path(key, cache_dir))
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+    except OSError:
+        pass
+
+
+def _to_entry(response: requests.Response) -> Dict[str, Any]:
+    return {
+        "url": response.url,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {
+            name: response.headers[name]
+            for name in _KEPT_HEADERS
+            if name in response.headers
+        },
+        "body": response.content.decode("utf-8", "replace"),
+        "fetched": time.time(),
+    }
+
+
+def _to_response(entry: Dict[str, Any]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason", "")
+    response.url = entry.get("url", "")
+    response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+    response._content = entry.get("body", "").encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def request(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    ttl: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a registry request, answering from the cache when possible.
+
+    Only responses with a status below 400 are cached.
+
+    Args:
+        method: 'GET' or 'HEAD'
+        url: Request URL
+        headers: Request headers (e.g. Authorization)
+        ttl: Seconds a cached response stays fresh (default: default_ttl())
+        cache_dir: Cache location (default: REGISTRY_CACHE_DIR)
+        **kwargs: Passed to fetch_manager.request (timeout, allow_redirects)
+
+    Returns:
+        The live or cached response
+
+    Raises:
+        OfflineError: In offline mode when the response is not cached
+        requests.RequestException: When the registry is unreachable and
+            nothing is cached
+    """
+    if not is_enabled():
+        if is_offline():
+            raise OfflineError(f"Offline mode: not requesting {url}")
+        return fetch_manager.request(method, url, headers=headers, **kwargs)
+
+    key = cache_key(method, url, headers)
+    entry = _load(key, cache_dir)
+    if ttl is None:
+        ttl = default_ttl()
+    if entry and (is_offline() or time.time() - entry["fetched"] < ttl):
+        return _to_response(entry)
+    if is_offline():
+        raise OfflineError(f"Offline mode: no cached response for {url}")
+
+    send_headers = dict(headers or {})
+    if entry:
+        cached_headers = entry.get("headers", {})
+        if "ETag" in cached_headers:
+            send_headers["If-None-Match"] = cached_headers["ETag"]
+        if "Last-Modified" in cached_headers:
+            send_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+    try:
+        response = fetch_manager.request(method, url, headers=send_headers, **kwargs)
+    except requests.RequestException as e:
+        if entry is None:
+            raise
+        click.echo(
+            click.style(
+                f"    WARNING: {url} unreachable ({type(e).__name__}); "
+                "using cached response",
+                fg="yellow",
+            )
+        )
+        return _to_response(entry)
+
+    if entry and response.status_code == 304:
+        entry["fetched"] = time.time()
+        _store(key, entry, cache_dir)
+        return _to_response(entry)
+    if response.status_code < 400:
+        _store(key, _to_entry(response), cache_dir)
+    return response
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Shorthand for request('GET', url, ...)."""
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs: Any) -> requests.Response:
+    """Shorthand for request('HEAD', url, ...)."""
+    return request("HEAD", url, **kwargs)
@@ -0,0 +1,194 @@
+"""Recursive discovery of source files with ignore rules.
+
+walk() lists a folder tree once with ``os.scandir``, skipping folders that
+never hold code of interest (Terraform's working directories, VCS metadata
+and vendored packages) before descending into them. Ignore rules come from
+three places, later ones taking precedence:
+
+- DEFAULT_IGNORE_PATTERNS;
+- TERRAVISION_IGNORE, a comma-separated list of extra patterns;
+- a ``.terraformignore`` file in the root folder.
+
+Patterns use ``.terraformignore``/``.gitignore`` syntax: ``#`` starts a
+comment, ``!`` re-includes, a trailing ``/`` matches folders only, a
+pattern containing ``/`` is anchored at the root, ``*`` and ``?`` do not
+cross ``/`` and ``**`` does. Everything under an ignored folder is ignored.
+
+Symlinked folders are followed, but each real folder is visited once, so
+symlink loops terminate. Every file is returned with its size and mtime,
+so callers can key caches on them without another stat call.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Pattern, Set, Tuple
+
+IGNORE_FILE = ".terraformignore"
+DEFAULT_IGNORE_PATTERNS = (
+    ".git/",
+    ".terraform/",
+    ".terragrunt-cache/",
+    "node_modules/",
+)
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    """A file found by walk()."""
+
+    path: str
+    relpath: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One compiled ignore pattern."""
+
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif char == "*":
+            out.append("[^/]*")
+            i += 1
+        elif char == "?":
+            out.append("[^/]")
+            i += 1
+        elif char == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return "".join(out)
+
+
+def compile_rule(pattern: str) -> Optional[IgnoreRule]:
+    """Compile one ignore pattern (None for blank lines and comments)."""
+    pattern = pattern.strip()
+    if not pattern or pattern.startswith("#"):
+        return None
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+    regex = _glob_to_regex(pattern)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return IgnoreRule(re.compile(regex + r"\Z"), negate, dir_only)
+
+
+def load_rules(
+    root: str, extra_patterns: Optional[Iterable[str]] = None
+) -> List[IgnoreRule]:
+    """Return the ignore rules that apply under root.
+
+    Args:
+        root: Root folder of the walk; its .terraformignore is read
+        extra_patterns: Patterns to use instead of DEFAULT_IGNORE_PATTERNS
+            and TERRAVISION_IGNORE
+    """
+    if extra_patterns is None:
+        extra_patterns = list(DEFAULT_IGNORE_PATTERNS) + [
+            p for p in os.environ.get("TERRAVISION_IGNORE", "").split(",") if p
+        ]
+    patterns = list(extra_patterns)
+    try:
+        with open(os.path.join(root, IGNORE_FILE), encoding="utf-8") as f:
+            patterns.extend(f.read().splitlines())
+    except OSError:
+        pass
+    rules = [compile_rule(p) for p in patterns]
+    return [rule for rule in rules if rule is not None]
+
+
+def is_ignored(relpath: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """Return True if relpath ('/'-separated, relative to the root) is ignored.
+
+    The last matching rule decides.
+    """
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.negate == ignored and rule.regex.match(relpath):
+            ignored = not rule.negate
+    return ignored
+
+
+def walk(
+    root: str,
+    suffixes: Optional[Tuple[str, ...]] = None,
+    rules: Optional[List[IgnoreRule]] = None,
+) -> Iterator[SourceFile]:
+    """Yield the files under root that are not ignored.
+
+    Args:
+        root: Folder to walk
+        suffixes: Only yield files whose lowercased name ends with one of
+            these (default: all files)
+        rules: Ignore rules (default: load_rules(root))
+
+    Yields:
+        SourceFile for each file; a folder's files (sorted by name) come
+        before those of its subfolders
+    """
+    if rules is None:
+        rules = load_rules(root)
+    visited: Set[Tuple[int, int]] = set()
+    pending = [(root, "")]
+    while pending:
+        folder, prefix = pending.pop()
+        try:
+            # Symlink loops: each real folder is listed once
+            info = os.stat(folder)
+            if (info.st_dev, info.st_ino) in visited:
+                continue
+            visited.add((info.st_dev, info.st_ino))
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subfolders = []
+        for entry in entries:
+            relpath = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+                if is_dir:
+                    if not is_ignored(relpath, True, rules):
+                        subfolders.append((entry.path, relpath + "/"))
+                    continue
+                if suffixes and not entry.name.lower().endswith(suffixes):
+                    continue
+                if is_ignored(relpath, False, rules):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                # Dangling symlink or removed while walking
+                continue
+            yield SourceFile(entry.path, relpath, stat.st_size, stat.st_mtime_ns)
+        pending.extend(reversed(subfolders))
@@ -5,18 +5,25 @@ output into internal data structures for diagram generation.
 """
 
 from typing import Dict, List, Tuple, Any
+import bisect
 import os
 import re
 import copy
 import shutil
 from pathlib import Path
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 import click
+import modules.dot_parser as dot_parser
 import modules.gitlibs as gitlibs
 import modules.helpers as helpers
 import modules.fileparser as fileparser
+import modules.materialize as materialize
+import modules.plan_cache as plan_cache
+import modules.profiler as profiler
 import modules.validators as validators
 import tempfile
+import threading
 import json
 import ipaddr
 import modules.config_loader as config_loader
@@ -26,6 +33,8 @@ START_DIR = Path.cwd()
 temp_dir = tempfile.TemporaryDirectory(dir=tempfile.gettempdir())
 os.environ["TF_DATA_DIR"] = temp_dir.name
 MODULE_DIR = str(Path(Path.home(), ".terravision", "module_cache"))
+# `show -json` and `graph` are the only commands _decode_plan runs in parallel
+DECODE_WORKERS = 2
 
 
 def _write_override(codepath):
@@ -101,8 +110,12 @@ def _neutralize_cloud_blocks(codepath: str) -> List[Tuple[str, str]]:
             continue
         backup = path + ".terravision.bak"
         shutil.copy2(path, backup)
-        with open(path, "w") as fh:
+        # Replace rather than rewrite in place: path may be a hard link
+        # into the module cache (see modules/materialize.py)
+        staging = path + ".terravision.tmp"
+        with open(staging, "w") as fh:
             fh.write(stripped)
+        os.replace(staging, path)
         backups.append((backup, path))
     return backups
 
@@ -117,8 +130,9 @@ def _restore_cloud_backups(backups: List[Tuple[str, str]]) -> None:
 def convert_dot_to_json(dot_file: str) -> dict:
     """Convert a Graphviz DOT file to a JSON dictionary.
 
-    Uses the `dot` command-line tool to convert a DOT format graph file
-    into xdot JSON format, then parses and returns the result.
+    `terraform graph` output is read in-process by modules.dot_parser. Files
+    outside the DOT subset it understands fall back to the Graphviz `dot`
+    command-line tool.
 
     Args:
         dot_file: Path to the input DOT file.
@@ -126,6 +140,14 @@ def convert_dot_to_json(dot_file: str) -> dict:
     Returns:
         Parsed JSON dictionary of the graph data.
     """
+    try:
+        return dot_parser.parse_dot_file(dot_file)
+    except dot_parser.DotParseError:
+        return _convert_dot_with_graphviz(dot_file)
+
+
+def _convert_dot_with_graphviz(dot_file: str) -> dict:
+    """Convert a DOT file to xdot JSON with `dot -Txdot_json`."""
     json_file = tempfile.NamedTemporaryFile(suffix=".json", delete=False).name
     try:
         result = subprocess.run(
@@ -180,7 +202,18 @@ def _prepare_source(source):
         os.chdir(codepath)
     else:
         githubURL, subfolder, git_tag = gitlibs.get_clone_url(source)
-        codepath = gitlibs.clone_files(source, temp_dir.name)
+        module_path = gitlibs.clone_files(source, temp_dir.name)
+        # terraform init/plan write into the source folder; work on a
+        # private copy rather than the shared module cache. The copy keeps
+        # the cache folder's name, which carries the module name.
+        view = gitlibs.module_view_root(module_path)
+        workdir = os.path.join(
+            tempfile.mkdtemp(dir=temp_dir.name), os.path.basename(view)
+        )
+        materialize.materialize(view, workdir, writable=True)
+        codepath = os.path.normpath(
+            os.path.join(workdir, os.path.relpath(module_path, view))
+        )
         override_dest = _write_override(codepath)
         cloud_backups = _neutralize_cloud_blocks(codepath)
         os.chdir(codepath)
@@ -265,55 +298,112 @@ def _run_terraform_plan(vfiles, tfplan_path, debug):
         )
 
 
+class _ProcessGroup:
+    """Track subprocesses started from worker threads so a failure in one
+    can terminate the others, including any that have not started yet."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._procs: List[subprocess.Popen] = []
+        self._cancelled = False
+
+    def run_to_file(self, cmd, out_path, debug):
+        """Run cmd with stdout streamed straight to out_path.
+
+        Returns a CompletedProcess like subprocess.run would; a command
+        cancelled before it started reports returncode -1.
+        """
+        with open(out_path, "w") as f:
+            with self._lock:
+                if self._cancelled:
+                    return subprocess.CompletedProcess(cmd, -1, None, None)
+                proc = subprocess.Popen(
+                    cmd,
+                    stdout=f,
+                    stderr=None if debug else subprocess.PIPE,
+                    text=True,
+                )
+                self._procs.append(proc)
+            _, stderr = proc.communicate()
+        return subprocess.CompletedProcess(cmd, proc.returncode, None, stderr)
+
+    def terminate(self):
+        """Kill every running subprocess and refuse to start new ones."""
+        with self._lock:
+            self._cancelled = True
+            for proc in self._procs:
+                if proc.poll() is None:
+                    proc.terminate()
+
+
+def _show_plan_json(tfplan_path, tfplan_json_path, debug, procs):
+    """Decode the binary plan to JSON on disk, then load it."""
+    cmd = [helpers.get_tf_binary(), "show", "-json", tfplan_path]
+    result = procs.run_to_file(cmd, tfplan_json_path, debug)
+    if result.returncode != 0:
+        return result, None
+    with open(tfplan_json_path) as f:
+        return result, json.load(f)
+
+
+def _graph_to_json(tfgraph_path, debug, procs):
+    """Write the terraform graph to disk and convert it to JSON."""
+    cmd = [helpers.get_tf_binary(), "graph"]
+    result = procs.run_to_file(cmd, tfgraph_path, debug)
+    if result.returncode != 0:
+        return result, None
+    return result, convert_dot_to_json(tfgraph_path)
+
+
 def _decode_plan(tfplan_path, tfplan_json_path, tfgraph_path, debug):
     """Convert plan binary to JSON and generate terraform graph.
 
+    The graph does not depend on the decoded plan, so `show -json` and
+    `graph` (plus the graph conversion) run side by side in two worker
+    threads. If either command fails the other is terminated and the
+    failure is reported through _tf_error exactly as before.
+
     Returns:
         Tuple of (plandata, graphdata)
     """
     click.echo(click.style(f"\nDecoding plan..\n", fg="white", bold=True))
     if not os.path.exists(tfplan_path):
         _tf_error(f"Plan file not found at {tfplan_path}")
-    # Convert binary plan to JSON
-    with open(tfplan_json_path, "w") as f:
-        result = subprocess.run(
-            [helpers.get_tf_binary(), "show", "-json", tfplan_path],
-            stdout=f,
-            stderr=None if debug else subprocess.PIPE,
-            text=True,
-        )
-    if result.returncode != 0:
-        _tf_error(
-            f"Invalid output from '{helpers.get_tf_binary()} show' command.",
-            debug,
-            result,
-        )
-    click.echo(click.style(f"\nAnalysing plan..\n", fg="white", bold=True))
-    with open(tfplan_json_path) as f:
-        plandata = json.load(f)
-    # Generate terraform graph
-    with open(tfgraph_path, "w") as f:
-        result = subprocess.run(
-            [helpers.get_tf_binary(), "graph"],
-            stdout=f,
-            stderr=None if debug else subprocess.PIPE,
-            text=True,
-        )
-    if result.returncode != 0:
-        _tf_error(
-            f"Invalid output from '{helpers.get_tf_binary()} graph' command. "
-            "Check your TF source files can generate a valid plan and graph",
-            debug,
-            result,
-        )
     click.echo(
         click.style(
-            f"\nConverting TF Graph Connections..  (this may take a while)\n",
+            f"\nAnalysing plan and converting TF Graph Connections..  "
+            "(this may take a while)\n",
             fg="white",
             bold=True,
         )
     )
-    graphdata = convert_dot_to_json(tfgraph_path)
+    procs = _ProcessGroup()
+    with ThreadPoolExecutor(max_workers=DECODE_WORKERS) as pool:
+        plan_future = pool.submit(
+            _show_plan_json, tfplan_path, tfplan_json_path, debug, procs
+        )
+        graph_future = pool.submit(_graph_to_json, tfgraph_path, debug, procs)
+        try:
+            result, plandata = plan_future.result()
+            if result.returncode != 0:
+                _tf_error(
+                    f"Invalid output from '{helpers.get_tf_binary()} show' command.",
+                    debug,
+                    result,
+                )
+            result, graphdata = graph_future.result()
+            if result.returncode != 0:
+                _tf_error(
+                    f"Invalid output from '{helpers.get_tf_binary()} graph' command. "
+                    "Check your TF source files can generate a valid plan and graph",
+                    debug,
+                    result,
+                )
+        except BaseException:
+            # Ctrl-C, a failed conversion or _tf_error's exit: don't leave
+            # the sibling command running while the pool shuts down
+            procs.terminate()
+            raise
     return plandata, graphdata
 
 
@@ -333,9 +423,37 @@ def tf_initplan(
         debug: Show subprocess output to console
         upgrade: Pass -upgrade flag to terraform init
 
+    Local folder sources are looked up in the plan cache first (see
+    modules/plan_cache.py); --upgrade always runs terraform and refreshes
+    the cached entry.
+
     Returns:
         Dictionary containing terraform plan and graph data
     """
+    # Resolve variable file paths to absolute
+    vfiles = [
+        vf if os.path.isabs(vf) else os.path.join(START_DIR, vf) for vf in varfile
+    ]
+    # Local folders can reuse a cached plan when nothing that feeds it changed
+    cache_key = None
+    if os.path.isdir(source) and plan_cache.is_enabled():
+        cache_key = plan_cache.cache_key(source, vfiles, workspace)
+        cached = None if upgrade else plan_cache.load(cache_key, temp_dir.name)
+        if cached:
+            click.echo(
+                click.style(
+                    f"\nSource unchanged since last run, reusing cached "
+                    f"{helpers.get_tf_binary()} plan and graph..\n",
+                    fg="white",
+                    bold=True,
+                )
+            )
+            plandata, graphdata = cached
+            codepath = os.path.abspath(source)
+            tfdata = _assemble_tfdata(plandata, graphdata, codepath, codepath)
+            os.chdir(START_DIR)
+            return tfdata
+
     override_dest = None
     cloud_backups: List[Tuple[str, str]] = []
     try:
@@ -347,10 +465,6 @@ def tf_initplan(
         _run_terraform_init(debug, upgrade, skip_reconfigure=bool(cloud_backups))
         # Select or create the terraform workspace
         _select_workspace(workspace, debug)
-        # Resolve variable file paths to absolute
-        vfiles = [
-            vf if os.path.isabs(vf) else os.path.join(START_DIR, vf) for vf in varfile
-        ]
         # Setup temporary file paths
         tempdir = temp_dir.name
         tfplan_path = os.path.join(tempdir, "tfplan.bin")
@@ -363,14 +477,9 @@ def tf_initplan(
         plandata, graphdata = _decode_plan(
             tfplan_path, tfplan_json_path, tfgraph_path, debug
         )
-        # Assemble tfdata dict with plan output and graph connections
-        tfdata = dict()
-        tfdata["codepath"] = list()
-        tfdata["workdir"] = os.getcwd()
-        # Store the TF_DATA_DIR so read_tfsource can find modules/modules.json.
-        tfdata["terraform_init_dir"] = temp_dir.name
-        tfdata["plandata"] = dict(plandata)
-        tfdata = make_tf_data(tfdata, plandata, graphdata, codepath)
+        if cache_key:
+            plan_cache.store(cache_key, plandata, graphdata, temp_dir.name)
+        tfdata = _assemble_tfdata(plandata, graphdata, codepath, os.getcwd())
         os.chdir(START_DIR)
         return tfdata
     finally:
@@ -380,6 +489,17 @@ def tf_initplan(
         _restore_cloud_backups(cloud_backups)
 
 
+def _assemble_tfdata(plandata, graphdata, codepath, workdir):
+    """Build the initial tfdata dict from plan output and graph connections."""
+    tfdata = dict()
+    tfdata["codepath"] = list()
+    tfdata["workdir"] = workdir
+    # Store the TF_DATA_DIR so read_tfsource can find modules/modules.json.
+    tfdata["terraform_init_dir"] = temp_dir.name
+    tfdata["plandata"] = dict(plandata)
+    return make_tf_data(tfdata, plandata, graphdata, codepath)
+
+
 def make_tf_data(
     tfdata: Dict[str, Any],
     plandata: Dict[str, Any],
@@ -513,12 +633,16 @@ def _normalize_for_gvid_match(name: str) -> str:
     return _TILDE_SUFFIX_RE.sub("", helpers.remove_brackets_and_numbers(name))
 
 
-def find_node_in_gvid_table(node: str, gvid_table: List[str]) -> int:
+def find_node_in_gvid_table(
+    node: str, gvid_table: List[str], gvid_index: Dict[str, int] = None
+) -> int:
     """Find node ID in gvid_table by trying name variations.
 
     Args:
         node: Resource node name to find
         gvid_table: List of node names from terraform graph
+        gvid_index: Optional name -> first gvid map from _build_gvid_index.
+            When supplied, lookups are O(1) instead of list scans.
 
     Returns:
         Index of node in gvid_table
@@ -526,22 +650,25 @@ def find_node_in_gvid_table(node: str, gvid_table: List[str]) -> int:
     Raises:
         TerravisionError: If the node cannot be matched to any gvid entry.
     """
+    if gvid_index is None:
+        gvid_index = _build_gvid_index(gvid_table)
+
     # Try exact match first
-    if node in gvid_table:
-        return gvid_table.index(node)
+    if node in gvid_index:
+        return gvid_index[node]
 
     # Strip both for_each / count brackets AND the ~N suffix that
     # setup_tfdata appends. Handles nested-module + count cases like
     # `module.foo["key"].module.bar.aws_thing.x[0]~1`.
     nodename = _normalize_for_gvid_match(node)
-    if nodename in gvid_table:
-        return gvid_table.index(nodename)
+    if nodename in gvid_index:
+        return gvid_index[nodename]
 
     # Last-resort: drop module prefix (legacy fallback for non-module resources
     # whose gvid_table entry is the bare `<type>.<name>` form).
     nodename = helpers.get_no_module_no_number_name(node)
-    if nodename in gvid_table:
-        return gvid_table.index(nodename)
+    if nodename in gvid_index:
+        return gvid_index[nodename]
 
     # No match found - raise with diagnostic context
     normalized = _normalize_for_gvid_match(node)
@@ -569,51 +696,101 @@ def _build_gvid_table(tfdata):
     return gvid_table
 
 
+def _build_gvid_index(gvid_table: List[str]) -> Dict[str, int]:
+    """Map each gvid_table name to its first gvid (same result as list.index)."""
+    gvid_index: Dict[str, int] = {}
+    for gvid, name in enumerate(gvid_table):
+        gvid_index.setdefault(name, gvid)
+    return gvid_index
+
+
+def _build_edge_adjacency(edges: List[Dict[str, Any]]) -> Dict[int, List[int]]:
+    """Group graph edges by head gvid, keeping terraform's edge order."""
+    adjacency: Dict[int, List[int]] = {}
+    for connection in edges or []:
+        adjacency.setdefault(connection["head"], []).append(connection["tail"])
+    return adjacency
+
+
+class _GraphdictKeyIndex:
+    """Substring and prefix lookups over graphdict keys.
+
+    Replaces the per-edge list comprehensions over every graphdict key.
+    Prefix matches use a sorted key list with bisect; substring checks use a
+    single newline-joined haystack (keys never contain newlines). Keys added
+    while edges are walked (reverse-arrow targets) are folded in so results
+    match a fresh scan of the live graphdict.
+    """
+
+    def __init__(self, keys):
+        self._sorted = sorted(keys)
+        self._haystack = "\n".join(self._sorted)
+        self._contains_cache: Dict[str, bool] = {}
+
+    def add(self, key: str) -> None:
+        bisect.insort(self._sorted, key)
+        self._haystack += "\n" + key
+        self._contains_cache.clear()
+
+    def any_key_contains(self, text: str) -> bool:
+        if text not in self._contains_cache:
+            self._contains_cache[text] = bool(self._sorted) and (text in self._haystack)
+        return self._contains_cache[text]
+
+    def keys_starting_with(self, prefix: str) -> List[str]:
+        matches = []
+        for key in self._sorted[bisect.bisect_left(self._sorted, prefix) :]:
+            if not key.startswith(prefix):
+                break
+            matches.append(key)
+        return matches
+
+
 def _process_edges(tfdata, gvid_table, reverse_arrow_list):
-    """Walk terraform graph edges and populate graphdict connections."""
-    for node in dict(tfdata["graphdict"]):
+    """Walk terraform graph edges and populate graphdict connections.
+
+    Edges are looked up through a head -> tails adjacency map and graphdict
+    keys through _GraphdictKeyIndex, so the walk is roughly linear in the
+    number of edges rather than nodes x edges x keys.
+    """
+    graphdict = tfdata["graphdict"]
+    gvid_index = _build_gvid_index(gvid_table)
+    adjacency = _build_edge_adjacency(tfdata["tfgraph"].get("edges"))
+    key_index = _GraphdictKeyIndex(graphdict)
+    for node in list(graphdict):
         try:
-            node_id = find_node_in_gvid_table(node, gvid_table)
+            node_id = find_node_in_gvid_table(node, gvid_table, gvid_index)
         except helpers.TerravisionError as e:
             e.tfdata = tfdata
             raise
-        if tfdata["tfgraph"].get("edges"):
-            for connection in tfdata["tfgraph"]["edges"]:
-                head = connection["head"]
-                tail = connection["tail"]
-                # Check if this edge connects to our node
-                if (
-                    node_id == head
-                    and len([k for k in tfdata["graphdict"] if gvid_table[tail] in k])
-                    > 0
-                ):
-                    conn = gvid_table[tail]
-                    conn_type = gvid_table[tail].split(".")[0]
-                    # Find actual numbered nodes if connection is generic
-                    matched_connections = [
-                        k for k in tfdata["graphdict"] if k.startswith(gvid_table[tail])
-                    ]
-                    if (
-                        conn not in tfdata["graphdict"]
-                        and len(matched_connections) == 1
-                    ):
-                        conn = matched_connections[0]
-                    # Handle reverse arrow resources (connection points to node).
-                    # The reverse_arrow_list entries are prefixes (e.g.
-                    # "aws_cloudfront") that must match against the full
-                    # resource type (e.g. "aws_cloudfront_distribution").
-                    if any(conn_type.startswith(r) for r in reverse_arrow_list):
-                        if conn not in tfdata["graphdict"].keys():
-                            tfdata["graphdict"][conn] = list()
-                        # Skip multi-instance resources
-                        if "[" not in conn:
-                            if node not in tfdata["graphdict"][conn]:
-                                tfdata["graphdict"][conn].append(node)
-                    # Normal arrow (node points to connection)
-                    else:
-                        if "[" not in node:
-                            if conn not in tfdata["graphdict"].get(node, []):
-                                tfdata["graphdict"][node].append(conn)
+        for tail in adjacency.get(node_id, []):
+            # Check if this edge connects to a node we know about
+            if not key_index.any_key_contains(gvid_table[tail]):
+                continue
+            conn = gvid_table[tail]
+            conn_type = gvid_table[tail].split(".")[0]
+            # Find actual numbered nodes if connection is generic
+            if conn not in graphdict:
+                matched_connections = key_index.keys_starting_with(conn)
+                if len(matched_connections) == 1:
+                    conn = matched_connections[0]
+            # Handle reverse arrow resources (connection points to node).
+            # The reverse_arrow_list entries are prefixes (e.g.
+            # "aws_cloudfront") that must match against the full
+            # resource type (e.g. "aws_cloudfront_distribution").
+            if any(conn_type.startswith(r) for r in reverse_arrow_list):
+                if conn not in graphdict:
+                    graphdict[conn] = list()
+                    key_index.add(conn)
+                # Skip multi-instance resources
+                if "[" not in conn:
+                    if node not in graphdict[conn]:
+                        graphdict[conn].append(node)
+            # Normal arrow (node points to connection)
+            else:
+                if "[" not in node:
+                    if conn not in graphdict.get(node, []):
+                        graphdict[node].append(conn)
 
 
 def tf_makegraph(tfdata: Dict[str, Any], debug: bool) -> Dict[str, Any]:
@@ -774,13 +951,13 @@ def process_pregenerated_source(
     )
 
     # Load and validate plan JSON
-    plandata = validators.validate_planfile(planfile)
+    plandata = profiler.run(validators.validate_planfile, planfile)
 
-    # Convert DOT graph to JSON using Graphviz
+    # Convert DOT graph to JSON
     click.echo(
         click.style("Converting TF Graph Connections..\n", fg="white", bold=True)
     )
-    graphdata = convert_dot_to_json(graphfile)
+    graphdata = profiler.run(convert_dot_to_json, graphfile)
 
     # Build tfdata from plan and graph data
     tfdata = dict()
@@ -793,10 +970,10 @@ def process_pregenerated_source(
         if helpers.check_for_domain(source) or source.startswith("git::")
         else os.path.abspath(source)
     )
-    tfdata = make_tf_data(tfdata, plandata, graphdata, codepath)
+    tfdata = profiler.run(make_tf_data, tfdata, plandata, graphdata, codepath)
 
     # Build resource dependency graph
-    tfdata = tf_makegraph(tfdata, debug)
+    tfdata = profiler.run(tf_makegraph, tfdata, debug)
 
     # Parse source directory for HCL metadata
     codepath_list = (
@@ -804,10 +981,10 @@ def process_pregenerated_source(
         if isinstance(tfdata["codepath"], str)
         else tfdata["codepath"]
     )
-    tfdata = fileparser.read_tfsource(codepath_list, [], annotate, tfdata)
+    tfdata = profiler.run(fileparser.read_tfsource, codepath_list, [], annotate, tfdata)
 
     # Validate consistency across inputs
-    validators.validate_consistency(tfdata)
+    profiler.run(validators.validate_consistency, tfdata)
 
     if debug:
         helpers.export_tfdata(tfdata)
@@ -836,14 +1013,14 @@ def process_terraform_source(
     Returns:
         Dictionary containing parsed Terraform data
     """
-    tfdata = tf_initplan(source, varfile, workspace, debug, upgrade)
-    tfdata = tf_makegraph(tfdata, debug)
+    tfdata = profiler.run(tf_initplan, source, varfile, workspace, debug, upgrade)
+    tfdata = profiler.run(tf_makegraph, tfdata, debug)
     codepath = (
         [tfdata["codepath"]]
         if isinstance(tfdata["codepath"], str)
         else tfdata["codepath"]
     )
-    tfdata = fileparser.read_tfsource(codepath, varfile, annotate, tfdata)
+    tfdata = profiler.run(fileparser.read_tfsource, codepath, varfile, annotate, tfdata)
     if debug:
         helpers.export_tfdata(tfdata)
     return tfdata
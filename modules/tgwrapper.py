@@ -4,37 +4,108 @@ Handles detection of Terragrunt sources, execution of terragrunt init/plan/graph
 multi-module plan merging, and cross-module dependency linking via HCL parsing.
 """
 
+import hashlib
+import io
 import json
 import os
 import re
+import shutil
 import subprocess
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
 import hcl2
 
 import modules.helpers as helpers
+import modules.plan_cache as plan_cache
 import modules.tfwrapper as tfwrapper
 
 MIN_TERRAGRUNT_VERSION = "0.50.0"
 
+# terraform { source = "../modules//vpc" } in terragrunt.hcl
+_TG_LOCAL_SOURCE_RE = re.compile(r'\bsource\s*=\s*"((?:\.{1,2})?/[^"]*)"')
+# Shared config read through find_in_parent_folders() and friends
+_PARENT_CONFIG_SUFFIXES = (".hcl", ".yaml", ".yml", ".tfvars")
 
-def _tg_env() -> dict:
+# Output written by a module planned on a worker thread is buffered here and
+# replayed in module order, so parallel runs read like serial ones.
+_worker_output = threading.local()
+
+
+def _echo(message: str) -> None:
+    """Echo a message, buffering it when running on a module worker thread."""
+    buffer = getattr(_worker_output, "buffer", None)
+    if buffer is None:
+        click.echo(message)
+    else:
+        click.echo(message, file=buffer, color=True)
+
+
+def _run_logged(
+    cmd: List[str],
+    debug: bool,
+    cwd: str,
+    env: Optional[dict] = None,
+    stdout: Any = None,
+) -> subprocess.CompletedProcess:
+    """Run a command, streaming its output only under --debug.
+
+    Output is captured when not debugging. On a module worker thread it is
+    always captured and, under --debug, copied into the module's buffer.
+    Pass an open file as stdout to redirect the command's standard output.
+    """
+    buffer = getattr(_worker_output, "buffer", None)
+    pipe = subprocess.PIPE if not debug or buffer is not None else None
+    result = subprocess.run(
+        cmd,
+        stdout=pipe if stdout is None else stdout,
+        stderr=pipe,
+        text=True,
+        cwd=cwd,
+        env=env,
+    )
+    if debug and buffer is not None:
+        if stdout is None and result.stdout:
+            buffer.write(result.stdout)
+        if result.stderr:
+            buffer.write(result.stderr)
+    return result
+
+
+def _tf_env(tf_data_dir: str = "") -> Optional[dict]:
+    """Build environment for direct terraform calls.
+
+    Returns None (inherit os.environ) unless a module-specific TF_DATA_DIR
+    is given, as it is when child modules are planned in parallel.
+    """
+    if not tf_data_dir:
+        return None
+    env = dict(os.environ)
+    env["TF_DATA_DIR"] = tf_data_dir
+    return env
+
+
+def _tg_env(tf_data_dir: str = "") -> dict:
     """Build environment for all terragrunt subprocess calls.
 
     Sets TF_CLI_ARGS_init=-reconfigure so that ANY terraform init
     triggered by Terragrunt (explicit or auto-init for dependencies)
     accepts the local backend override without prompting for migration.
-    Sets TF_INPUT=false to prevent interactive prompts.
+    Sets TF_INPUT=false to prevent interactive prompts. A non-empty
+    tf_data_dir overrides TF_DATA_DIR for this module only.
     """
-    env = dict(os.environ)
+    env = _tf_env(tf_data_dir) or dict(os.environ)
     env["TF_CLI_ARGS_init"] = "-reconfigure"
     env["TF_INPUT"] = "false"
     return env
 
 
-def _tg_debug_snapshot(label: str, cache_dir: str, debug: bool) -> None:
+def _tg_debug_snapshot(
+    label: str, cache_dir: str, debug: bool, tf_data_dir: str = ""
+) -> None:
     """Print a one-section diagnostic snapshot of cache + backend state.
 
     Used at checkpoints (after init, before plan, after plan) to pinpoint
@@ -47,9 +118,10 @@ def _tg_debug_snapshot(label: str, cache_dir: str, debug: bool) -> None:
     if not debug:
         return
 
+    tf_data_dir = tf_data_dir or os.environ.get("TF_DATA_DIR", "")
     lines = [f"\n--- [tg-debug] {label} ---"]
     lines.append(f"  cache_dir: {cache_dir}")
-    lines.append(f"  TF_DATA_DIR: {os.environ.get('TF_DATA_DIR', '<unset>')}")
+    lines.append(f"  TF_DATA_DIR: {tf_data_dir or '<unset>'}")
 
     override_path = os.path.join(cache_dir, "terravision_override.tf")
     if os.path.exists(override_path):
@@ -88,7 +160,6 @@ def _tg_debug_snapshot(label: str, cache_dir: str, debug: bool) -> None:
     # to a temp dir, so terraform stores .terraform/terraform.tfstate there
     # rather than in the cache dir. Check both locations to be safe.
     candidates = []
-    tf_data_dir = os.environ.get("TF_DATA_DIR", "")
     if tf_data_dir:
         candidates.append(
             ("TF_DATA_DIR", os.path.join(tf_data_dir, "terraform.tfstate"))
@@ -162,7 +233,7 @@ def _tg_debug_snapshot(label: str, cache_dir: str, debug: bool) -> None:
         )
         lines.extend(sibling_dirs)
 
-    click.echo(click.style("\n".join(lines), fg="magenta"))
+    _echo(click.style("\n".join(lines), fg="magenta"))
 
 
 def _find_terragrunt_cache_dir(workdir: str, debug: bool = False) -> str:
@@ -208,7 +279,7 @@ def _find_terragrunt_cache_dir(workdir: str, debug: bool = False) -> str:
                     continue
 
     if debug and candidates:
-        click.echo(
+        _echo(
             click.style(
                 "\n[tg-debug] _find_terragrunt_cache_dir candidates "
                 f"({len(candidates)}):",
@@ -217,7 +288,7 @@ def _find_terragrunt_cache_dir(workdir: str, debug: bool = False) -> str:
         )
         for root, marker, sig in candidates:
             rel = os.path.relpath(root, cache_root)
-            click.echo(
+            _echo(
                 click.style(
                     f"  {rel}: marker={marker} terragrunt_sig_in_first_200B={sig}",
                     fg="magenta",
@@ -227,7 +298,7 @@ def _find_terragrunt_cache_dir(workdir: str, debug: bool = False) -> str:
     for root, marker, sig in candidates:
         if sig:
             if debug:
-                click.echo(
+                _echo(
                     click.style(
                         f"[tg-debug] picked: {os.path.relpath(root, cache_root)}",
                         fg="magenta",
@@ -244,7 +315,7 @@ def _find_terragrunt_cache_dir(workdir: str, debug: bool = False) -> str:
             hash2_path = os.path.join(hash1_path, hash2)
             if os.path.isdir(hash2_path):
                 if debug:
-                    click.echo(
+                    _echo(
                         click.style(
                             f"[tg-debug] no signature match; falling back to "
                             f"{os.path.relpath(hash2_path, cache_root)}",
@@ -373,7 +444,7 @@ def _scan_dependency_dirs(module_path: str) -> List[str]:
     except Exception as e:
         # python-hcl2 may not support every Terragrunt construct; warn so the
         # user knows this module's dependencies were skipped
-        click.echo(
+        _echo(
             click.style(
                 f"WARNING: Could not parse {hcl_path} ({e}); "
                 "dependency overrides for this module will be skipped",
@@ -435,7 +506,9 @@ def _prepare_tg_source(source: str) -> Tuple[str, List[str]]:
     return codepath, override_files
 
 
-def _sync_local_state_into_cache(cache_dir: str, debug: bool) -> None:
+def _sync_local_state_into_cache(
+    cache_dir: str, debug: bool, tf_data_dir: str = ""
+) -> None:
     """Sync the local-backend state from TF_DATA_DIR into the cache directory.
 
     Issue #114: After terragrunt's first init configures the real backend
@@ -452,7 +525,7 @@ def _sync_local_state_into_cache(cache_dir: str, debug: bool) -> None:
     both locations agree on backend.type='local' regardless of which path
     terragrunt's plan invocation actually consults.
     """
-    tf_data_dir = os.environ.get("TF_DATA_DIR", "")
+    tf_data_dir = tf_data_dir or os.environ.get("TF_DATA_DIR", "")
     if not tf_data_dir:
         return
     src_state = os.path.join(tf_data_dir, "terraform.tfstate")
@@ -467,7 +540,7 @@ def _sync_local_state_into_cache(cache_dir: str, debug: bool) -> None:
             dst.write(src.read())
     except OSError as e:
         if debug:
-            click.echo(
+            _echo(
                 click.style(
                     f"[tg-debug] could not sync state {src_state} -> {dst_state}: {e}",
                     fg="magenta",
@@ -475,7 +548,7 @@ def _sync_local_state_into_cache(cache_dir: str, debug: bool) -> None:
             )
 
 
-def _run_terragrunt_init(workdir: str, debug: bool) -> str:
+def _run_terragrunt_init(workdir: str, debug: bool, tf_data_dir: str = "") -> str:
     """Run terragrunt init and ensure the local backend override is in the cache.
 
     The override file must be written to the source directory (and any
@@ -489,14 +562,14 @@ def _run_terragrunt_init(workdir: str, debug: bool) -> str:
     init -reconfigure` in the cache so the backend state is consistent
     with the override (issue #114).
 
+    tf_data_dir optionally gives this module its own TF_DATA_DIR.
+
     Returns:
         Absolute path to the terraform working directory in cache.
     """
-    click.echo(click.style("\nRunning Terragrunt Init..\n", fg="white", bold=True))
+    _echo(click.style("\nRunning Terragrunt Init..\n", fg="white", bold=True))
     init_cmd = ["terragrunt", "init", "-reconfigure"]
-    result = subprocess.run(
-        init_cmd, capture_output=not debug, text=True, cwd=workdir, env=_tg_env()
-    )
+    result = _run_logged(init_cmd, debug, workdir, env=_tg_env(tf_data_dir))
 
     # Try to find the cache directory (should exist if source download succeeded)
     try:
@@ -508,7 +581,7 @@ def _run_terragrunt_init(workdir: str, debug: bool) -> str:
             raise RuntimeError(f"Terragrunt init failed:\n{stderr}{hint}")
         raise
 
-    _tg_debug_snapshot("after terragrunt init", cache_dir, debug)
+    _tg_debug_snapshot("after terragrunt init", cache_dir, debug, tf_data_dir)
 
     # Safety net: ensure override is in the cache directory. Terragrunt
     # downloads remote sources directly into the cache, so an override
@@ -523,11 +596,11 @@ def _run_terragrunt_init(workdir: str, debug: bool) -> str:
     # backend (e.g. s3) because terragrunt's auto-init ran before our
     # override reached the cache. A fresh `-reconfigure` reinitialises
     # the stored state to match the override (local).
-    tf_result = subprocess.run(
+    tf_result = _run_logged(
         [helpers.get_tf_binary(), "init", "-reconfigure", "-input=false"],
-        capture_output=not debug,
-        text=True,
-        cwd=cache_dir,
+        debug,
+        cache_dir,
+        env=_tf_env(tf_data_dir),
     )
     if tf_result.returncode != 0:
         stderr = (result.stderr or "") + (tf_result.stderr or "")
@@ -537,9 +610,9 @@ def _run_terragrunt_init(workdir: str, debug: bool) -> str:
     # Sync the local-backend state into the cache so terragrunt plan
     # reads the same backend.type from both TF_DATA_DIR and cache_dir
     # (issue #114).
-    _sync_local_state_into_cache(cache_dir, debug)
+    _sync_local_state_into_cache(cache_dir, debug, tf_data_dir)
 
-    _tg_debug_snapshot("after fallback terraform init", cache_dir, debug)
+    _tg_debug_snapshot("after fallback terraform init", cache_dir, debug, tf_data_dir)
 
     return cache_dir
 
@@ -575,6 +648,7 @@ def _run_terragrunt_plan(
     tfplan_path: str,
     debug: bool,
     cache_dir: str = "",
+    tf_data_dir: str = "",
 ) -> None:
     """Run terragrunt plan with -refresh=false.
 
@@ -582,18 +656,17 @@ def _run_terragrunt_plan(
     are resolved from mock_outputs and passed as terraform variables.
 
     cache_dir is optional and only used for diagnostic snapshots when
-    debug=True (issue #114 investigation).
+    debug=True (issue #114 investigation). tf_data_dir optionally gives
+    this module its own TF_DATA_DIR.
     """
-    _tg_debug_snapshot("before terragrunt plan", cache_dir, debug)
-    click.echo(click.style("\nGenerating Terragrunt Plan..\n", fg="white", bold=True))
+    _tg_debug_snapshot("before terragrunt plan", cache_dir, debug, tf_data_dir)
+    _echo(click.style("\nGenerating Terragrunt Plan..\n", fg="white", bold=True))
     plan_cmd = ["terragrunt", "plan", "-refresh=false"]
     for vf in varfiles:
         plan_cmd.extend(["-var-file", vf])
     plan_cmd.extend(["-out", tfplan_path])
-    result = subprocess.run(
-        plan_cmd, capture_output=not debug, text=True, cwd=workdir, env=_tg_env()
-    )
-    _tg_debug_snapshot("after terragrunt plan", cache_dir, debug)
+    result = _run_logged(plan_cmd, debug, workdir, env=_tg_env(tf_data_dir))
+    _tg_debug_snapshot("after terragrunt plan", cache_dir, debug, tf_data_dir)
     if result.returncode != 0:
         stderr = result.stderr or ""
         hint = ""
@@ -611,6 +684,7 @@ def _decode_tg_plan(
     tfplan_json_path: str,
     tfgraph_path: str,
     debug: bool,
+    tf_data_dir: str = "",
 ) -> Tuple[dict, dict]:
     """Decode terragrunt plan and graph output into JSON.
 
@@ -620,19 +694,22 @@ def _decode_tg_plan(
     source, re-run generate blocks) which disrupts the backend state
     between the plan and decode phases.
 
+    tf_data_dir optionally gives this module its own TF_DATA_DIR.
+
     Returns:
         Tuple of (plan_data, graph_data).
     """
     cache_dir = _find_terragrunt_cache_dir(workdir)
+    env = _tf_env(tf_data_dir)
 
     # Generate plan JSON via terraform show directly in cache
     with open(tfplan_json_path, "w") as f:
-        result = subprocess.run(
+        result = _run_logged(
             [helpers.get_tf_binary(), "show", "-json", tfplan_path],
+            debug,
+            cache_dir,
+            env=env,
             stdout=f,
-            stderr=None if debug else subprocess.PIPE,
-            text=True,
-            cwd=cache_dir,
         )
     if result.returncode != 0:
         raise RuntimeError(
@@ -644,12 +721,12 @@ def _decode_tg_plan(
 
     # Generate graph DOT
     with open(tfgraph_path, "w") as f:
-        result = subprocess.run(
+        result = _run_logged(
             [helpers.get_tf_binary(), "graph"],
+            debug,
+            cache_dir,
+            env=env,
             stdout=f,
-            stderr=None if debug else subprocess.PIPE,
-            text=True,
-            cwd=cache_dir,
         )
     if result.returncode != 0:
         raise RuntimeError(
@@ -668,27 +745,39 @@ def tg_initplan(
     workspace: str,
     debug: bool,
     upgrade: bool,
+    tf_data_dir: str = "",
 ) -> dict:
     """Execute terragrunt init, plan, show, and graph for a single module.
 
     Returns tfdata dict in the same format as tfwrapper.tf_initplan().
     Note: generate blocks (backend.tf, provider.tf) are handled automatically
     by the Terragrunt CLI delegation.
+
+    tf_data_dir optionally gives the module its own TF_DATA_DIR, which also
+    holds its plan artifacts, so several modules can be planned at once.
     """
     check_terragrunt_version()
     codepath, override_files = _prepare_tg_source(source)
 
     # Write plan artifacts into the per-process temp dir (not the shared
     # /tmp root) so concurrent terravision runs don't clobber each other.
-    tfplan_path = os.path.join(tfwrapper.temp_dir.name, "tg_tfplan.bin")
-    tfplan_json_path = os.path.join(tfwrapper.temp_dir.name, "tg_tfplan.json")
-    tfgraph_path = os.path.join(tfwrapper.temp_dir.name, "tg_tfgraph.dot")
+    artifact_dir = tf_data_dir or tfwrapper.temp_dir.name
+    tfplan_path = os.path.join(artifact_dir, "tg_tfplan.bin")
+    tfplan_json_path = os.path.join(artifact_dir, "tg_tfplan.json")
+    tfgraph_path = os.path.join(artifact_dir, "tg_tfgraph.dot")
 
     try:
-        cache_dir = _run_terragrunt_init(codepath, debug)
-        _run_terragrunt_plan(codepath, varfile, tfplan_path, debug, cache_dir=cache_dir)
+        cache_dir = _run_terragrunt_init(codepath, debug, tf_data_dir)
+        _run_terragrunt_plan(
+            codepath,
+            varfile,
+            tfplan_path,
+            debug,
+            cache_dir=cache_dir,
+            tf_data_dir=tf_data_dir,
+        )
         plan_data, graph_data = _decode_tg_plan(
-            codepath, tfplan_path, tfplan_json_path, tfgraph_path, debug
+            codepath, tfplan_path, tfplan_json_path, tfgraph_path, debug, tf_data_dir
         )
     finally:
         for f in override_files:
@@ -702,12 +791,18 @@ def tg_initplan(
             pass
         tfwrapper._cleanup_override(cache_override)
 
-    # Build tfdata matching tf_initplan output format
+    return _module_tfdata(cache_dir, plan_data, graph_data, tf_data_dir)
+
+
+def _module_tfdata(
+    cache_dir: str, plan_data: dict, graph_data: dict, tf_data_dir: str = ""
+) -> dict:
+    """Build tfdata matching tf_initplan output format for one module."""
     # Use cache_dir as codepath so read_tfsource() finds .tf files
-    tfdata = {
+    return {
         "codepath": cache_dir,
         "workdir": str(Path.cwd()),
-        "terraform_init_dir": os.environ.get("TF_DATA_DIR", ""),
+        "terraform_init_dir": tf_data_dir or os.environ.get("TF_DATA_DIR", ""),
         "plandata": plan_data,
         "tf_resources_created": plan_data.get("resource_changes", []),
         "tfgraph": graph_data,
@@ -720,8 +815,6 @@ def tg_initplan(
         "is_terragrunt": True,
     }
 
-    return tfdata
-
 
 def _discover_child_modules(source: str) -> List[str]:
     """Discover child directories containing terragrunt.hcl.
@@ -770,7 +863,7 @@ def _parse_tg_dependencies(module_path: str) -> dict:
     except Exception as e:
         # python-hcl2 may not support every Terragrunt construct; warn so the
         # user knows cross-module links for this module are skipped
-        click.echo(
+        _echo(
             click.style(
                 f"WARNING: Could not parse {hcl_path} ({e}); "
                 "cross-module dependency links for this module will be skipped",
@@ -894,12 +987,14 @@ def tg_run_all_plan(
     workspace: str,
     debug: bool,
     upgrade: bool,
+    jobs: int = 1,
 ) -> dict:
     """Execute terragrunt plan for all child modules and merge results.
 
     Discovers child modules, runs tg_initplan() on each, merges plans
     with module.<relative_path>. prefixes, parses dependency blocks, and
-    injects cross-module references into metadata.
+    injects cross-module references into metadata. jobs sets how many
+    child modules are planned at the same time.
 
     Returns unified tfdata dict.
     """
@@ -933,13 +1028,288 @@ def tg_run_all_plan(
 
     try:
         return _run_all_modules(
-            source_root, child_modules, varfile, workspace, debug, upgrade
+            source_root, child_modules, varfile, workspace, debug, upgrade, jobs
         )
     finally:
         for f in override_files:
             tfwrapper._cleanup_override(f)
 
 
+def _local_terraform_sources(module_path: str) -> List[str]:
+    """Return local folders referenced by `source` in a module's terragrunt.hcl."""
+    try:
+        with open(os.path.join(module_path, "terragrunt.hcl")) as f:
+            content = f.read()
+    except OSError:
+        return []
+    # Terragrunt copies the whole folder before the // into its cache
+    return [
+        os.path.normpath(os.path.join(module_path, src.split("//")[0]))
+        for src in _TG_LOCAL_SOURCE_RE.findall(content)
+    ]
+
+
+def _hash_parent_configs(digest: Any, module_path: str) -> None:
+    """Feed shared config files in the module's parent folders into digest.
+
+    Stops at the repository root (the first folder holding .git) or at the
+    filesystem root.
+    """
+    parent = os.path.dirname(module_path)
+    while True:
+        try:
+            names = sorted(os.listdir(parent))
+        except OSError:
+            names = []
+        for name in names:
+            path = os.path.join(parent, name)
+            if name.endswith(_PARENT_CONFIG_SUFFIXES) and os.path.isfile(path):
+                digest.update(f"parent:{path}\n".encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+        next_parent = os.path.dirname(parent)
+        if ".git" in names or next_parent == parent:
+            return
+        parent = next_parent
+
+
+def _module_cache_key(module_path: str, settings: str, keys: Dict[str, str]) -> str:
+    """Hash everything that can change one child module's plan.
+
+    Covers the run settings, the module folder, shared config in parent
+    folders, local terraform sources, and the keys of the modules it depends
+    on. Terravision plans against an empty local backend, so dependency
+    outputs come from mock_outputs and only change when the dependency's
+    own inputs do; its key stands in for them. keys memoizes results by
+    folder; on a dependency cycle the back edge hashes the path alone.
+    """
+    module_path = os.path.normpath(module_path)
+    if module_path in keys:
+        return keys[module_path]
+    keys[module_path] = f"cycle:{module_path}"
+    digest = hashlib.sha256()
+    digest.update(f"settings={settings}\n".encode())
+    plan_cache.hash_source_tree(digest, module_path)
+    _hash_parent_configs(digest, module_path)
+    for source_dir in _local_terraform_sources(module_path):
+        if os.path.isdir(source_dir):
+            digest.update(f"source:{source_dir}\n".encode())
+            plan_cache.hash_source_tree(digest, source_dir)
+    for dep_dir in sorted(_scan_dependency_dirs(module_path)):
+        dep_key = _module_cache_key(dep_dir, settings, keys)
+        digest.update(f"dependency:{dep_dir}={dep_key}\n".encode())
+    keys[module_path] = digest.hexdigest()
+    return keys[module_path]
+
+
+def _module_cache_keys(
+    child_modules: List[str], varfile: list, workspace: str
+) -> Dict[str, str]:
+    """Return the plan cache key of each child module, by module path."""
+    settings = hashlib.sha256()
+    settings.update(f"terragrunt={check_terragrunt_version()}\n".encode())
+    plan_cache.hash_run_settings(
+        settings, [os.path.abspath(vf) for vf in varfile], workspace
+    )
+    keys: Dict[str, str] = {}
+    return {
+        path: _module_cache_key(path, settings.hexdigest(), keys)
+        for path in child_modules
+    }
+
+
+def _module_data_dir(mod_name: str) -> str:
+    """Return the private TF_DATA_DIR used for a module outside a serial run."""
+    return os.path.join(tfwrapper.temp_dir.name, "terragrunt", mod_name)
+
+
+def _load_cached_modules(
+    child_modules: List[str], names: Dict[str, str], keys: Dict[str, str]
+) -> Dict[str, dict]:
+    """Return tfdata for child modules whose cached plan is still valid.
+
+    A module is only reused while its .terragrunt-cache folder still exists,
+    since read_tfsource() parses the .tf files there.
+    """
+    results = {}
+    for path in child_modules:
+        mod_name = names[path]
+        try:
+            cache_dir = _find_terragrunt_cache_dir(path)
+        except RuntimeError:
+            continue
+        data_dir = _module_data_dir(mod_name)
+        os.makedirs(data_dir, exist_ok=True)
+        cached = plan_cache.load(keys[path], data_dir)
+        if not cached:
+            continue
+        _echo(_module_header(mod_name))
+        _echo(
+            click.style(
+                "Inputs unchanged since last run, reusing cached plan and graph..",
+                fg="white",
+                bold=True,
+            )
+        )
+        plan_data, graph_data = cached
+        results[mod_name] = _module_tfdata(cache_dir, plan_data, graph_data, data_dir)
+    return results
+
+
+def _module_header(mod_name: str) -> str:
+    """Return the banner printed before a child module is planned."""
+    return click.style(f"\nProcessing Terragrunt module: {mod_name}\n", fg="cyan")
+
+
+def _plan_module_buffered(
+    module_path: str,
+    mod_name: str,
+    buffer: io.StringIO,
+    varfile: list,
+    workspace: str,
+    debug: bool,
+    upgrade: bool,
+    tf_data_dir: str,
+) -> dict:
+    """Worker thread body: plan one module with its output sent to buffer."""
+    _worker_output.buffer = buffer
+    try:
+        _echo(_module_header(mod_name))
+        os.makedirs(tf_data_dir, exist_ok=True)
+        return tg_initplan(
+            module_path, varfile, workspace, debug, upgrade, tf_data_dir=tf_data_dir
+        )
+    finally:
+        _worker_output.buffer = None
+
+
+def _adopt_module_data_dir(tf_data_dir: str) -> None:
+    """Copy a module's downloaded modules into the shared TF_DATA_DIR.
+
+    A serial run initialises every module into the shared TF_DATA_DIR and
+    leaves the last module's modules/modules.json there for
+    read_tfsource(). Parallel runs recreate that end state.
+    """
+    shared_dir = os.environ.get("TF_DATA_DIR", "")
+    src = os.path.join(tf_data_dir, "modules")
+    if not shared_dir or not os.path.isdir(src):
+        return
+    dst = os.path.join(shared_dir, "modules")
+    shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(src, dst, symlinks=True)
+
+
+def _plan_modules_parallel(
+    source_root: str,
+    child_modules: List[str],
+    per_module_deps: Dict[str, dict],
+    varfile: list,
+    workspace: str,
+    debug: bool,
+    upgrade: bool,
+    jobs: int,
+) -> Dict[str, dict]:
+    """Plan child modules on a bounded pool of worker threads.
+
+    A module starts once every child module it depends on has been planned,
+    and never alongside another module that uses the same directory (its
+    own or a dependency's), because terragrunt initialises dependencies in
+    place to read their outputs. Each module gets its own TF_DATA_DIR
+    (_module_data_dir) and an output buffer that is replayed in module
+    order.
+
+    Returns:
+        Dict of module name to tg_initplan() result.
+
+    Raises:
+        The error of the first failing module, in module order, after
+        plans that were already running have finished.
+    """
+    names = {path: _module_name_from_path(source_root, path) for path in child_modules}
+    module_dirs = {os.path.normpath(path) for path in child_modules}
+    needs: Dict[str, set] = {}
+    claims: Dict[str, set] = {}
+    for path in child_modules:
+        deps = per_module_deps.get(names[path], {}).get("dependencies", {})
+        dep_dirs = {os.path.normpath(d) for d in deps.values()}
+        own_dir = os.path.normpath(path)
+        needs[path] = (dep_dirs & module_dirs) - {own_dir}
+        claims[path] = dep_dirs | {own_dir}
+
+    data_dirs = {path: _module_data_dir(names[path]) for path in child_modules}
+    buffers = {path: io.StringIO() for path in child_modules}
+    pending = list(child_modules)
+    running: Dict[Any, str] = {}
+    planned_dirs: set = set()
+    busy: set = set()
+    results: Dict[str, dict] = {}
+    errors: Dict[str, BaseException] = {}
+    replayed = 0
+
+    def start(pool: ThreadPoolExecutor, path: str) -> None:
+        pending.remove(path)
+        busy.update(claims[path])
+        future = pool.submit(
+            _plan_module_buffered,
+            path,
+            names[path],
+            buffers[path],
+            varfile,
+            workspace,
+            debug,
+            upgrade,
+            data_dirs[path],
+        )
+        running[future] = path
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while running or (pending and not errors):
+            if not errors:
+                for path in list(pending):
+                    if len(running) >= jobs:
+                        break
+                    if needs[path] <= planned_dirs and not claims[path] & busy:
+                        start(pool, path)
+                if not running:
+                    # Dependency cycle: fall back to listed order and let
+                    # terragrunt report the problem
+                    start(pool, pending[0])
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path = running.pop(future)
+                busy.difference_update(claims[path])
+                planned_dirs.add(os.path.normpath(path))
+                try:
+                    results[names[path]] = future.result()
+                except Exception as e:
+                    errors[path] = e
+            while replayed < len(child_modules) and (
+                names[child_modules[replayed]] in results
+                or child_modules[replayed] in errors
+            ):
+                click.echo(buffers[child_modules[replayed]].getvalue(), nl=False)
+                replayed += 1
+
+    # Flush output of modules that finished after an earlier module failed
+    for path in child_modules[replayed:]:
+        if names[path] in results or path in errors:
+            click.echo(buffers[path].getvalue(), nl=False)
+    for path in child_modules:
+        if path in errors:
+            raise errors[path]
+    return results
+
+
+def _store_module_plan(key: str, mod_tfdata: dict) -> None:
+    """Save a freshly planned module for reuse by later runs."""
+    plan_cache.store(
+        key,
+        mod_tfdata["plandata"],
+        mod_tfdata["tfgraph"],
+        mod_tfdata["terraform_init_dir"],
+    )
+
+
 def _run_all_modules(
     source_root: str,
     child_modules: List[str],
@@ -947,9 +1317,73 @@ def _run_all_modules(
     workspace: str,
     debug: bool,
     upgrade: bool,
+    jobs: int = 1,
 ) -> dict:
-    """Run plans for all child modules and merge results."""
-    # Collect per-module plans
+    """Run plans for all child modules and merge results.
+
+    Modules whose inputs are unchanged since the last run reuse their
+    cached plan and graph (see _module_cache_key); --upgrade re-plans all
+    of them. With jobs > 1 the remaining modules are planned concurrently;
+    the merged result is identical to planning them one after another.
+    """
+    # Parse dependencies from each child's terragrunt.hcl
+    per_module_deps = {}
+    for module_path in child_modules:
+        mod_name = _module_name_from_path(source_root, module_path)
+        try:
+            deps = _parse_tg_dependencies(module_path)
+            per_module_deps[mod_name] = deps
+        except Exception as e:
+            _echo(
+                click.style(
+                    f"Warning: Could not parse dependencies for {mod_name}: {e}",
+                    fg="yellow",
+                )
+            )
+
+    # Only modules whose inputs changed since the last run (and, through
+    # their keys, the modules depending on them) are planned again
+    names = {path: _module_name_from_path(source_root, path) for path in child_modules}
+    keys: Dict[str, str] = {}
+    module_results: Dict[str, dict] = {}
+    if plan_cache.is_enabled():
+        keys = _module_cache_keys(child_modules, varfile, workspace)
+        if not upgrade:
+            module_results = _load_cached_modules(child_modules, names, keys)
+    stale = [path for path in child_modules if names[path] not in module_results]
+
+    planned_in_shared_dir = set()
+    if jobs > 1 and len(stale) > 1:
+        module_results.update(
+            _plan_modules_parallel(
+                source_root,
+                stale,
+                per_module_deps,
+                varfile,
+                workspace,
+                debug,
+                upgrade,
+                jobs,
+            )
+        )
+        if keys:
+            for path in stale:
+                _store_module_plan(keys[path], module_results[names[path]])
+    else:
+        for module_path in stale:
+            mod_name = names[module_path]
+            _echo(_module_header(mod_name))
+            mod_tfdata = tg_initplan(module_path, varfile, workspace, debug, upgrade)
+            module_results[mod_name] = mod_tfdata
+            planned_in_shared_dir.add(module_path)
+            if keys:
+                _store_module_plan(keys[module_path], mod_tfdata)
+    # A serial run leaves the last module's modules.json in the shared
+    # TF_DATA_DIR for read_tfsource(); recreate that when it ran elsewhere
+    if child_modules[-1] not in planned_in_shared_dir:
+        _adopt_module_data_dir(_module_data_dir(names[child_modules[-1]]))
+
+    # Collect per-module plans in module order
     per_module_results = {}
     per_module_resources = {}
     all_resource_changes = []
@@ -957,13 +1391,7 @@ def _run_all_modules(
 
     for module_path in child_modules:
         mod_name = _module_name_from_path(source_root, module_path)
-        click.echo(
-            click.style(
-                f"\nProcessing Terragrunt module: {mod_name}\n",
-                fg="cyan",
-            )
-        )
-        mod_tfdata = tg_initplan(module_path, varfile, workspace, debug, upgrade)
+        mod_tfdata = module_results[mod_name]
         per_module_results[mod_name] = mod_tfdata
         per_module_resources[mod_name] = mod_tfdata.get("tf_resources_created", [])
         cache_dirs.append(mod_tfdata["codepath"])
@@ -996,21 +1424,6 @@ def _run_all_modules(
         "is_terragrunt": True,
     }
 
-    # Parse dependencies from each child's terragrunt.hcl
-    per_module_deps = {}
-    for module_path in child_modules:
-        mod_name = _module_name_from_path(source_root, module_path)
-        try:
-            deps = _parse_tg_dependencies(module_path)
-            per_module_deps[mod_name] = deps
-        except Exception as e:
-            click.echo(
-                click.style(
-                    f"Warning: Could not parse dependencies for {mod_name}: {e}",
-                    fg="yellow",
-                )
-            )
-
     # Inject cross-module references (done after setup_tfdata populates meta_data)
     merged_tfdata["_tg_dependency_info"] = {
         "per_module_deps": per_module_deps,
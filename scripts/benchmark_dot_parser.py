@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark the in-process DOT reader against `dot -Txdot_json`.
+
+Times ``modules.dot_parser.parse_dot_file`` and the Graphviz subprocess
+path (``tfwrapper._convert_dot_with_graphviz``) on the bastion fixture and
+on synthetic `terraform graph`-shaped graphs of increasing size. The
+Graphviz column is skipped when `dot` is not on PATH.
+
+Usage::
+
+    poetry run python scripts/benchmark_dot_parser.py [--repeat 5]
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure repo root is on sys.path so we can import modules
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from modules import dot_parser, tfwrapper  # noqa: E402
+
+BASTION_DOT = REPO_ROOT / "tests" / "json" / "bastion-graph.dot"
+SYNTHETIC_SIZES = (500, 2000, 10000)
+
+
+def synthetic_graph(nodes: int, modules: int = 20, fanout: int = 3) -> str:
+    """Build a DOT graph shaped like modern `terraform graph` output."""
+    rng = random.Random(nodes)
+    lines = [
+        "digraph G {",
+        '  rankdir = "RL";',
+        '  node [shape = rect, fontname = "sans-serif"];',
+    ]
+    names = []
+    per_module = max(1, nodes // modules)
+    for m in range(modules):
+        lines.append(f'  subgraph "cluster_module.m{m}" {{')
+        lines.append(f'    label = "module.m{m}"')
+        for i in range(per_module):
+            name = f"module.m{m}.aws_instance.r{i}"
+            names.append(name)
+            lines.append(f'    "{name}" [label="aws_instance.r{i}"];')
+        lines.append("  }")
+    for name in names:
+        for head in rng.sample(names, min(fanout, len(names))):
+            lines.append(f'  "{name}" -> "{head}";')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def time_call(func, path: str, repeat: int) -> float:
+    """Return the median wall time of func(path) in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    have_dot = shutil.which("dot") is not None
+    cases = [("bastion-graph.dot", str(BASTION_DOT))]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SYNTHETIC_SIZES:
+            path = Path(tmp, f"synthetic-{size}.dot")
+            path.write_text(synthetic_graph(size))
+            cases.append((f"synthetic {size} nodes", str(path)))
+
+        print(f"{'graph':<26}{'native ms':>12}{'graphviz ms':>14}{'speedup':>10}")
+        for label, path in cases:
+            native = time_call(dot_parser.parse_dot_file, path, args.repeat)
+            if have_dot:
+                graphviz = time_call(
+                    tfwrapper._convert_dot_with_graphviz, path, args.repeat
+                )
+                print(
+                    f"{label:<26}{native:>12.1f}{graphviz:>14.1f}"
+                    f"{graphviz / native:>9.1f}x"
+                )
+            else:
+                print(f"{label:<26}{native:>12.1f}{'n/a':>14}{'':>10}")
+    if not have_dot:
+        print("\n`dot` not found on PATH; Graphviz timings skipped.")
+
+
+if __name__ == "__main__":
+    main()
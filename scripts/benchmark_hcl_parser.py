@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark the pre-built HCL2 parser against python-hcl2.
+
+Compares parser start-up (building the LALR tables from the grammar versus
+loading ``hcl2/hcl2.lark.bin``) and parse throughput over every ``.tf``
+file under ``tests/fixtures`` for ``hcl2.loads`` and
+``modules.hcl_parser.loads``.
+
+Usage::
+
+    poetry run python scripts/benchmark_hcl_parser.py [--repeat 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ensure repo root is on sys.path so we can import modules
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import hcl2  # noqa: E402
+from lark import Lark  # noqa: E402
+
+from modules import hcl_parser  # noqa: E402
+
+FIXTURES_DIR = REPO_ROOT / "tests" / "fixtures"
+
+
+def median_ms(func, repeat: int) -> float:
+    """Return the median wall time of func() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [p.read_text() for p in sorted(FIXTURES_DIR.rglob("*.tf"))]
+    total_kb = sum(len(t) for t in texts) / 1024
+
+    build = median_ms(
+        lambda: Lark.open(hcl_parser.GRAMMAR_FILE, parser="lalr"), args.repeat
+    )
+    load = median_ms(
+        lambda: hcl_parser._read_serialized(hcl_parser.SHIPPED_PARSER_FILE),
+        args.repeat,
+    )
+    print(f"{'parser start-up':<28}{'ms':>10}")
+    print(f"{'build from grammar':<28}{build:>10.1f}")
+    print(f"{'load hcl2.lark.bin':<28}{load:>10.1f}")
+
+    def parse_all(loads):
+        return lambda: [loads(text) for text in texts]
+
+    hcl_parser.get_parser()
+    old = median_ms(parse_all(hcl2.loads), args.repeat)
+    new = median_ms(parse_all(hcl_parser.loads), args.repeat)
+    print(f"\n{len(texts)} fixture files, {total_kb:.0f} KB")
+    print(f"{'parse path':<28}{'ms':>10}{'KB/s':>10}")
+    for label, ms in (("hcl2.loads", old), ("hcl_parser.loads", new)):
+        print(f"{label:<28}{ms:>10.1f}{total_kb / (ms / 1000):>10.0f}")
+    print(f"{'speedup':<28}{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
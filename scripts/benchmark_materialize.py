@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark module folder materialization strategies.
+
+Times each strategy in ``modules.materialize`` (reflink, hardlink, symlink,
+copy) copying one module tree. By default a synthetic provider-module-sized
+repo is generated; pass ``--source`` to use a real cached module, e.g. one
+from ``~/.terravision/module_store``. Strategies the filesystem does not
+support are reported as such rather than timed.
+
+Usage::
+
+    poetry run python scripts/benchmark_materialize.py [--files 4000] [--kb 24]
+    poetry run python scripts/benchmark_materialize.py --source ~/.terravision/module_store/<key>/tree
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure repo root is on sys.path so we can import modules
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from modules import materialize  # noqa: E402
+
+
+def make_tree(root: Path, files: int, kb: int) -> None:
+    """Write files of kb kilobytes spread over nested module folders."""
+    payload = ("# " + "x" * 62 + "\n") * (kb * 16)
+    for i in range(files):
+        folder = root / f"modules/group{i % 40}/mod{i % 400}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"file{i}.tf").write_text(payload)
+
+
+def tree_size(root: Path):
+    count = size = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            count += 1
+            size += os.lstat(os.path.join(dirpath, name)).st_size
+    return count, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--source", help="Existing module folder to copy")
+    parser.add_argument("--files", type=int, default=4000)
+    parser.add_argument("--kb", type=int, default=24, help="Size of each file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.source:
+            source = Path(args.source).expanduser().resolve()
+        else:
+            source = Path(workdir, "source")
+            make_tree(source, args.files, args.kb)
+        count, size = tree_size(source)
+        print(f"Source: {source} ({count} files, {size / 2**20:.1f} MB)")
+        print(f"Default order on this platform: {materialize.configured_strategies()}")
+        print(f"\n{'strategy':<12}{'median ms':>12}")
+
+        for strategy in materialize.STRATEGIES:
+            samples = []
+            for i in range(args.repeat):
+                dest = Path(workdir, f"{strategy}-{i}")
+                start = time.perf_counter()
+                used = materialize.materialize(
+                    str(source), str(dest), strategies=[strategy]
+                )
+                samples.append((time.perf_counter() - start) * 1000)
+                if dest.is_symlink():
+                    dest.unlink()
+                else:
+                    shutil.rmtree(dest)
+                if used != strategy:
+                    break
+            if used != strategy:
+                print(f"{strategy:<12}{'unsupported':>12}")
+            else:
+                print(f"{strategy:<12}{statistics.median(samples):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Regenerate the serialized HCL2 parser shipped as ``hcl2/hcl2.lark.bin``.
+
+Builds the LALR parser from ``hcl2/hcl2.lark`` and writes it with the
+header ``modules.hcl_parser`` checks before loading it. Re-run after
+editing the grammar or bumping lark; a stale file is ignored at runtime
+(the parser is then built and cached under ~/.terravision/hcl_parser).
+
+Usage::
+
+    poetry run python scripts/build_hcl_parser.py
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure repo root is on sys.path so we can import modules
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from modules import hcl_parser  # noqa: E402
+
+
+def main() -> None:
+    parser = hcl_parser.build_parser()
+    hcl_parser.write_serialized(parser, hcl_parser.SHIPPED_PARSER_FILE)
+    size_kb = Path(hcl_parser.SHIPPED_PARSER_FILE).stat().st_size / 1024
+    print(f"Wrote {hcl_parser.SHIPPED_PARSER_FILE} ({size_kb:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
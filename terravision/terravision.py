@@ -2,6 +2,7 @@
 from typing import Any, Dict, List, Optional
 import json
 import sys
+import time
 import traceback
 import click
 
@@ -15,6 +16,10 @@ import modules.tfwrapper as tfwrapper
 import modules.tgwrapper as tgwrapper
 import modules.resource_handlers as resource_handlers
 import modules.llm as llm
+import modules.gitlibs as gitlibs
+import modules.mirror as mirror
+import modules.module_cache as module_cache
+import modules.profiler as profiler
 import modules.validators as validators
 import modules.fileparser as fileparser
 from modules.config_loader import load_config
@@ -93,6 +98,7 @@ def _safe_compile_tfdata(
     graphfile: str = "",
     upgrade: bool = False,
     aibackend: str = "",
+    jobs: int = 1,
 ) -> Dict[str, Any]:
     """Run compile_tfdata with TerravisionError handling.
 
@@ -111,6 +117,7 @@ def _safe_compile_tfdata(
             graphfile,
             upgrade,
             aibackend=aibackend,
+            jobs=jobs,
         )
     except helpers.TerravisionError as e:
         if debug:
@@ -157,21 +164,22 @@ def _enrich_graph_data(
     Returns:
         Enriched tfdata dictionary
     """
-    tfdata = interpreter.prefix_module_names(tfdata)
-    tfdata = interpreter.resolve_all_variables(tfdata, debug, already_processed)
-    tfdata = resource_handlers.handle_special_cases(tfdata)
-    tfdata = graphmaker.inject_data_source_nodes(tfdata)
-    tfdata = graphmaker.add_relations(tfdata)
-    tfdata = graphmaker.consolidate_nodes(tfdata)
-    tfdata = annotations.add_annotations(tfdata)
-    tfdata = graphmaker.detect_and_set_counts(tfdata)
-    tfdata = graphmaker.handle_special_resources(tfdata)
-    tfdata = graphmaker.handle_variants(tfdata)
-    tfdata = graphmaker.create_multiple_resources(tfdata)
-    tfdata = graphmaker.cleanup_cross_subnet_connections(tfdata)
-    tfdata = graphmaker.reverse_relations(tfdata)
-    tfdata = helpers.find_bidirectional_links(tfdata)
-    tfdata = resource_handlers.match_resources(tfdata)
+    run = profiler.run
+    tfdata = run(interpreter.prefix_module_names, tfdata)
+    tfdata = run(interpreter.resolve_all_variables, tfdata, debug, already_processed)
+    tfdata = run(resource_handlers.handle_special_cases, tfdata)
+    tfdata = run(graphmaker.inject_data_source_nodes, tfdata)
+    tfdata = run(graphmaker.add_relations, tfdata)
+    tfdata = run(graphmaker.consolidate_nodes, tfdata)
+    tfdata = run(annotations.add_annotations, tfdata)
+    tfdata = run(graphmaker.detect_and_set_counts, tfdata)
+    tfdata = run(graphmaker.handle_special_resources, tfdata)
+    tfdata = run(graphmaker.handle_variants, tfdata)
+    tfdata = run(graphmaker.create_multiple_resources, tfdata)
+    tfdata = run(graphmaker.cleanup_cross_subnet_connections, tfdata)
+    tfdata = run(graphmaker.reverse_relations, tfdata)
+    tfdata = run(helpers.find_bidirectional_links, tfdata)
+    tfdata = run(resource_handlers.match_resources, tfdata)
 
     return tfdata
 
@@ -197,6 +205,7 @@ def compile_tfdata(
     graphfile: str = "",
     upgrade: bool = False,
     aibackend: str = "",
+    jobs: int = 1,
 ) -> Dict[str, Any]:
     """Compile Terraform data from source files into enriched graph dictionary.
 
@@ -210,6 +219,7 @@ def compile_tfdata(
         graphfile: Path to pre-generated Terraform graph DOT file
         aibackend: Optional AI backend ("ollama" / "bedrock" / "restapi")
             for AI annotation generation. Empty string disables AI.
+        jobs: Number of Terragrunt child modules to plan in parallel
 
     Returns:
         Enriched tfdata dictionary with graphdict and metadata
@@ -222,7 +232,7 @@ def compile_tfdata(
         )
     elif source.endswith(".json"):
         validators.validate_source(source)
-        tfdata = tfwrapper.load_json_source(source)
+        tfdata = profiler.run(tfwrapper.load_json_source, source)
         already_processed = True
         if "all_resource" not in tfdata:
             _print_graph_debug(tfdata["graphdict"], "Loaded JSON graphviz dictionary")
@@ -242,19 +252,26 @@ def compile_tfdata(
                 )
             )
             if is_multi:
-                tfdata = tgwrapper.tg_run_all_plan(
-                    source, varfile, workspace, debug, upgrade
+                tfdata = profiler.run(
+                    tgwrapper.tg_run_all_plan,
+                    source,
+                    varfile,
+                    workspace,
+                    debug,
+                    upgrade,
+                    jobs=jobs,
                 )
             else:
-                tfdata = tgwrapper.tg_initplan(
-                    source, varfile, workspace, debug, upgrade
+                tfdata = profiler.run(
+                    tgwrapper.tg_initplan, source, varfile, workspace, debug, upgrade
                 )
             # Continue with standard pipeline: graph building + source parsing
-            tfdata = tfwrapper.tf_makegraph(tfdata, debug)
+            tfdata = profiler.run(tfwrapper.tf_makegraph, tfdata, debug)
             # For multi-module: inject cross-module refs now that meta_data is populated
             dep_info = tfdata.pop("_tg_dependency_info", None)
             if dep_info:
-                tfdata = tgwrapper._inject_dependency_refs(
+                tfdata = profiler.run(
+                    tgwrapper._inject_dependency_refs,
                     tfdata,
                     dep_info["per_module_deps"],
                     dep_info["per_module_resources"],
@@ -265,7 +282,9 @@ def compile_tfdata(
                 if isinstance(tfdata["codepath"], str)
                 else tfdata["codepath"]
             )
-            tfdata = fileparser.read_tfsource(codepath, varfile, annotate, tfdata)
+            tfdata = profiler.run(
+                fileparser.read_tfsource, codepath, varfile, annotate, tfdata
+            )
             if debug:
                 helpers.export_tfdata(tfdata)
         else:
@@ -276,7 +295,7 @@ def compile_tfdata(
     # Detect cloud provider and store in tfdata (multi-cloud support)
     if "all_resource" in tfdata and "provider_detection" not in tfdata:
         try:
-            provider_detection = detect_providers(tfdata)
+            provider_detection = profiler.run(detect_providers, tfdata)
             tfdata["provider_detection"] = provider_detection
             click.echo(
                 click.style(
@@ -308,18 +327,24 @@ def compile_tfdata(
                 "tfdata.json replay file.",
                 tfdata=tfdata,
             ) from e
-        tfdata["graphdict"] = helpers.sort_graphdict(tfdata["graphdict"])
+        tfdata["graphdict"] = profiler.run(helpers.sort_graphdict, tfdata["graphdict"])
         _print_graph_debug(tfdata["graphdict"], "Enriched graphviz dictionary")
 
         if aibackend and "all_resource" in tfdata:
-            ai_dict = llm.generate_ai_annotations(
+            ai_dict = profiler.run(
+                llm.generate_ai_annotations,
                 tfdata,
                 aibackend,
                 source_dir=source if isinstance(source, str) else None,
                 output_dir=None,
             )
             if ai_dict:
-                tfdata = annotations.apply_ai_annotations(tfdata, ai_dict)
+                tfdata = profiler.run(annotations.apply_ai_annotations, tfdata, ai_dict)
+
+    # Module sources are no longer read: prune the module store now, not
+    # while this run's views still point into it
+    if module_cache.prune_pending():
+        module_cache.remove_dangling_links(gitlibs.MODULE_DIR)
     return tfdata
 
 
@@ -440,6 +465,31 @@ def cli(ctx) -> None:
     type=click.Choice(["auto", "terraform", "tofu"], case_sensitive=False),
     help="Infra engine binary: 'terraform', 'tofu' (OpenTofu), or 'auto' (detect). Env: TERRAVISION_ENGINE",
 )
+@click.option(
+    "--jobs",
+    default=1,
+    envvar="TERRAVISION_JOBS",
+    type=click.IntRange(min=1),
+    help="Number of Terragrunt child modules to plan in parallel. Env: TERRAVISION_JOBS",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Record time, memory and graph size of each pipeline stage",
+)
+@click.option(
+    "--profile-output",
+    default="terravision-profile.json",
+    type=click.Path(),
+    help="File the --profile report is written to",
+)
+@click.option(
+    "--cprofile-dir",
+    default="",
+    type=click.Path(),
+    help="With --profile, also write cProfile stats for each stage to this folder",
+)
 @click.option(
     "--use-tf-names",
     is_flag=True,
@@ -480,6 +530,10 @@ def draw(
     graphfile: str,
     upgrade: bool,
     engine: str,
+    jobs: int,
+    profile: bool,
+    profile_output: str,
+    cprofile_dir: str,
     use_tf_names: bool,
     use_resource_names: bool,
     fontsize: int,
@@ -497,6 +551,8 @@ def draw(
             )
         )
     preflight_check(ai_annotate if not planfile else None, engine=engine)
+    if profile:
+        profiler.start(cprofile_dir)
     tfdata = _safe_compile_tfdata(
         debug,
         source,
@@ -507,6 +563,7 @@ def draw(
         graphfile,
         upgrade,
         aibackend=ai_annotate,
+        jobs=jobs,
     )
 
     # Strip networking groups for simplified diagrams, bridging connections
@@ -529,7 +586,8 @@ def draw(
         if not outfile.endswith(f"-{provider}"):
             final_outfile = f"{outfile}-{provider}"
 
-    drawing.render_diagram(tfdata, show, final_outfile, format, source)
+    profiler.run(drawing.render_diagram, tfdata, show, final_outfile, format, source)
+    profiler.finish(profile_output)
 
 
 @cli.command(cls=ColorCommand)
@@ -606,6 +664,31 @@ def draw(
     type=click.Choice(["auto", "terraform", "tofu"], case_sensitive=False),
     help="Infra engine binary: 'terraform', 'tofu' (OpenTofu), or 'auto' (detect). Env: TERRAVISION_ENGINE",
 )
+@click.option(
+    "--jobs",
+    default=1,
+    envvar="TERRAVISION_JOBS",
+    type=click.IntRange(min=1),
+    help="Number of Terragrunt child modules to plan in parallel. Env: TERRAVISION_JOBS",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Record time, memory and graph size of each pipeline stage",
+)
+@click.option(
+    "--profile-output",
+    default="terravision-profile.json",
+    type=click.Path(),
+    help="File the --profile report is written to",
+)
+@click.option(
+    "--cprofile-dir",
+    default="",
+    type=click.Path(),
+    help="With --profile, also write cProfile stats for each stage to this folder",
+)
 def graphdata(
     debug: bool,
     source: str,
@@ -621,6 +704,10 @@ def graphdata(
     graphfile: str = "",
     upgrade: bool = False,
     engine: str = "auto",
+    jobs: int = 1,
+    profile: bool = False,
+    profile_output: str = "terravision-profile.json",
+    cprofile_dir: str = "",
 ) -> None:
     """List cloud resources and relations as drawable JSON."""
     _install_excepthook(debug)
@@ -634,6 +721,8 @@ def graphdata(
             )
         )
     preflight_check(ai_annotate if not planfile else None, engine=engine)
+    if profile:
+        profiler.start(cprofile_dir)
     tfdata = _safe_compile_tfdata(
         debug,
         source,
@@ -644,6 +733,7 @@ def graphdata(
         graphfile,
         upgrade,
         aibackend=ai_annotate if not show_services else "",
+        jobs=jobs,
     )
     if simplified:
         graphmaker.simplify_graphdict(tfdata)
@@ -666,6 +756,7 @@ def graphdata(
             indent=4,
             sort_keys=True,
         )
+    profiler.finish(profile_output)
     click.echo("\nCompleted!")
 
 
@@ -733,6 +824,31 @@ def graphdata(
     type=click.Choice(["auto", "terraform", "tofu"], case_sensitive=False),
     help="Infra engine binary: 'terraform', 'tofu' (OpenTofu), or 'auto' (detect). Env: TERRAVISION_ENGINE",
 )
+@click.option(
+    "--jobs",
+    default=1,
+    envvar="TERRAVISION_JOBS",
+    type=click.IntRange(min=1),
+    help="Number of Terragrunt child modules to plan in parallel. Env: TERRAVISION_JOBS",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Record time, memory and graph size of each pipeline stage",
+)
+@click.option(
+    "--profile-output",
+    default="terravision-profile.json",
+    type=click.Path(),
+    help="File the --profile report is written to",
+)
+@click.option(
+    "--cprofile-dir",
+    default="",
+    type=click.Path(),
+    help="With --profile, also write cProfile stats for each stage to this folder",
+)
 @click.option(
     "--format",
     hidden=True,
@@ -782,6 +898,10 @@ def visualise(
     graphfile: str,
     upgrade: bool,
     engine: str,
+    jobs: int,
+    profile: bool,
+    profile_output: str,
+    cprofile_dir: str,
     format: str,
     ai_annotate: str,
     avl_classes: Any,
@@ -811,6 +931,8 @@ def visualise(
         )
 
     preflight_check(ai_annotate if not planfile else None, engine=engine)
+    if profile:
+        profiler.start(cprofile_dir)
     tfdata = _safe_compile_tfdata(
         debug,
         source,
@@ -821,6 +943,7 @@ def visualise(
         graphfile,
         upgrade,
         aibackend=ai_annotate,
+        jobs=jobs,
     )
 
     # Strip networking groups for simplified diagrams
@@ -842,7 +965,8 @@ def visualise(
         if not outfile.endswith(f"-{provider}"):
             final_outfile = f"{outfile}-{provider}"
 
-    html_renderer.render_html(tfdata, show, final_outfile, source)
+    profiler.run(html_renderer.render_html, tfdata, show, final_outfile, source)
+    profiler.finish(profile_output)
 
 
 @cli.command(cls=ColorCommand)
@@ -891,6 +1015,126 @@ def mcp(transport: str, output_dir: str) -> None:
         raise click.ClickException(str(e))
 
 
+@cli.group(cls=ColorGroup)
+def cache() -> None:
+    """Inspect and maintain the shared module cache."""
+
+
+def _format_mb(size: int) -> str:
+    return f"{size / 2**20:.1f} MB"
+
+
+@cache.command(name="stat", cls=ColorCommand)
+def cache_stat() -> None:
+    """Show module cache location, size and entries."""
+    entries = module_cache.list_entries()
+    total = sum(e["disk_bytes"] for e in entries)
+    click.echo(f"Module store: {module_cache.STORE_DIR}")
+    click.echo(f"Module views: {gitlibs.MODULE_DIR}")
+    click.echo(
+        f"Entries: {len(entries)}, {_format_mb(total)} of "
+        f"{_format_mb(module_cache.max_bytes_setting())}"
+    )
+    for entry in reversed(entries):
+        last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+        if entry.get("incomplete"):
+            source = click.style("(incomplete)", fg="yellow")
+        else:
+            source = entry["url"]
+            if entry.get("subdir"):
+                source += f"//{entry['subdir']}"
+            if entry["ref"]:
+                source += f" @ {entry['ref']}"
+        click.echo(
+            f"  {entry['key'][:12]}  {_format_mb(entry['disk_bytes']):>10}  "
+            f"{last_used}  {source}"
+        )
+
+
+@cache.command(name="prune", cls=ColorCommand)
+@click.option(
+    "--max-mb",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Size cap to prune to (default: TERRAVISION_MODULE_CACHE_MAX_MB or 2048)",
+)
+@click.option("--all", "remove_all", is_flag=True, help="Remove every entry")
+def cache_prune(max_mb: Optional[float], remove_all: bool) -> None:
+    """Evict least recently used modules until the cache fits its size cap."""
+    if remove_all:
+        max_bytes = 0
+    elif max_mb is not None:
+        max_bytes = int(max_mb * 2**20)
+    else:
+        max_bytes = None
+    evicted = module_cache.prune(max_bytes=max_bytes)
+    module_cache.remove_dangling_links(gitlibs.MODULE_DIR)
+    click.echo(
+        f"Evicted {len(evicted)} module cache entr{'y' if len(evicted) == 1 else 'ies'}"
+    )
+
+
+@cache.command(name="verify", cls=ColorCommand)
+@click.option("--fix", is_flag=True, help="Remove entries that fail verification")
+def cache_verify(fix: bool) -> None:
+    """Check cached modules against the digest recorded when they were stored."""
+    problems = module_cache.verify(fix=fix)
+    if fix:
+        module_cache.remove_dangling_links(gitlibs.MODULE_DIR)
+    for key, problem in problems:
+        action = " (removed)" if fix else ""
+        click.echo(click.style(f"  {key[:12]}: {problem}{action}", fg="yellow"))
+    if not problems:
+        click.echo(click.style("Module cache OK", fg="green"))
+    elif not fix:
+        raise click.ClickException(
+            f"{len(problems)} module cache entries failed verification; "
+            "run 'terravision cache verify --fix' to remove them"
+        )
+
+
+@cli.group(name="mirror", cls=ColorGroup)
+def module_mirror() -> None:
+    """Build a local module mirror for offline and air-gapped runs."""
+
+
+@module_mirror.command(name="sync", cls=ColorCommand)
+@click.option(
+    "--source",
+    default=".",
+    help="Folder or remote source of the Terraform code whose modules to mirror",
+)
+@click.option(
+    "--mirror",
+    "mirror_dir",
+    default="",
+    type=click.Path(file_okay=False),
+    help="Mirror folder (default: TERRAVISION_MIRROR)",
+)
+def mirror_sync(source: str, mirror_dir: str) -> None:
+    """Download every remote module a source uses into a local mirror.
+
+    Run with network access, then point TERRAVISION_MIRROR at the mirror
+    folder (or a copy of it) to resolve modules without the network.
+    """
+    mirror_dir = mirror_dir or mirror.mirror_dir() or ""
+    if not mirror_dir:
+        raise click.ClickException(
+            "No mirror folder given; pass --mirror or set TERRAVISION_MIRROR"
+        )
+    try:
+        synced = gitlibs.sync_mirror(source, mirror_dir)
+    except mirror.MirrorError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        click.style(
+            f"Mirrored {len(synced)} module source{'' if len(synced) == 1 else 's'} "
+            f"into {mirror_dir}",
+            fg="green",
+        )
+    )
+
+
 def main():
     cli(
         default_map={
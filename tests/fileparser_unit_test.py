@@ -2,12 +2,17 @@ import json
 import unittest, sys, os
 from unittest.mock import patch, MagicMock, mock_open
 import tempfile
+import threading
+import time
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 sys.path.append(parent_dir)
 
+import modules.fileparser as fileparser
+import modules.helpers as helpers
 from modules.fileparser import (
     handle_module,
+    iterative_parse,
     load_varfile_values,
     _load_terraform_modules_json,
     _extract_comments_from_tf,
@@ -268,5 +273,221 @@ class TestLoadTerraformModulesJson(unittest.TestCase):
         )
 
 
+class TestParallelIterativeParse(unittest.TestCase):
+    """The process-pool parse must produce the same tfdata and warnings as
+    parsing one file at a time, including files of nested modules."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = self._tmpdir.name
+        os.makedirs(os.path.join(root, "modules", "net"))
+        self.files = []
+        for i in range(6):
+            path = os.path.join(root, f"r{i}.tf")
+            with open(path, "w") as f:
+                f.write(
+                    f"# Bucket number {i}\n"
+                    f'resource "aws_s3_bucket" "b{i}" {{\n'
+                    f'  bucket = "bucket-{i}"\n'
+                    "}\n"
+                )
+            self.files.append(path)
+        main = os.path.join(root, "main.tf")
+        with open(main, "w") as f:
+            f.write('module "net" {\n  source = "./modules/net"\n}\n')
+        self.files.append(main)
+        # Only parses after _preprocess_hcl joins the leading && line
+        retry = os.path.join(root, "retry.tf")
+        with open(retry, "w") as f:
+            f.write(
+                "locals {\n  ok = var.a\n    && var.b\n}\n"
+                'variable "a" {\n  default = true\n}\n'
+            )
+        self.files.append(retry)
+        broken = os.path.join(root, "broken.tf")
+        with open(broken, "w") as f:
+            f.write('resource "aws_vpc" "x" {\n  cidr = \n')
+        self.files.append(broken)
+        with open(os.path.join(root, "modules", "net", "vpc.tf"), "w") as f:
+            f.write('resource "aws_vpc" "main" {\n  cidr_block = "10.0.0.0/16"\n}\n')
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _parse(self, workers):
+        messages = []
+        with (
+            patch.dict(
+                os.environ,
+                {
+                    "TERRAVISION_PARSE_WORKERS": str(workers),
+                    "TERRAVISION_PARSE_CACHE": "off",
+                },
+            ),
+            patch("modules.fileparser.PARALLEL_PARSE_MIN_FILES", 2),
+            patch(
+                "modules.fileparser.click.echo",
+                side_effect=lambda msg="", **kw: messages.append(msg),
+            ),
+        ):
+            paths = list(self.files)
+            tfdata = iterative_parse(
+                paths, {}, fileparser.EXTRACT, {}, "/nonexistent", ""
+            )
+        comments, _ = fileparser.harvest_comments(tfdata["source_files"])
+        return tfdata, paths, messages, comments
+
+    def test_pool_matches_serial_parse(self):
+        serial = self._parse(workers=1)
+        parallel = self._parse(workers=2)
+        self.assertEqual(parallel, serial)
+        tfdata, paths, messages, comments = parallel
+        module_file = os.path.join(self._tmpdir.name, "modules", "net", "vpc.tf")
+        self.assertEqual(paths[-1], module_file)
+        self.assertIn(module_file, tfdata["all_resource"])
+        self.assertIn("retry.tf", " ".join(tfdata["all_locals"]))
+        self.assertEqual(comments["aws_s3_bucket.b3"], "Bucket number 3")
+        # Comments are only harvested when something asks for them
+        self.assertNotIn("tf_comments", tfdata)
+        warnings = [m for m in messages if "HCL parsing error" in m]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("broken.tf", warnings[0])
+
+    def test_broken_pool_falls_back_to_in_process_parse(self):
+        serial = self._parse(workers=1)
+        broken_pool = MagicMock()
+        broken_pool.map.side_effect = fileparser.BrokenProcessPool()
+        with patch("modules.fileparser.ProcessPoolExecutor", return_value=broken_pool):
+            fallback = self._parse(workers=2)
+        self.assertEqual(fallback, serial)
+        broken_pool.shutdown.assert_called()
+
+
+class TestHarvestComments(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmpdir.name, "main.tf")
+        with open(self.path, "w") as f:
+            f.write('# Web tier\nresource "aws_instance" "web" {}\n# Owner: ops\n')
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_ensure_comments_harvests_recorded_files(self):
+        tfdata = {"source_files": [self.path, self.path + ".missing"]}
+        fileparser.ensure_comments(tfdata)
+        self.assertEqual(tfdata["tf_comments"], {"aws_instance.web": "Web tier"})
+        self.assertEqual(tfdata["tf_unattached_comments"], ["Owner: ops"])
+
+    def test_debug_export_embeds_comments(self):
+        tfdata = {"source_files": [self.path]}
+        cwd = os.getcwd()
+        os.chdir(self._tmpdir.name)
+        try:
+            with patch("modules.helpers.click.echo"):
+                helpers.export_tfdata(tfdata)
+        finally:
+            os.chdir(cwd)
+        with open(os.path.join(self._tmpdir.name, "tfdata.json")) as f:
+            dumped = json.load(f)
+        self.assertEqual(dumped["tf_comments"], {"aws_instance.web": "Web tier"})
+        self.assertEqual(dumped["tf_unattached_comments"], ["Owner: ops"])
+
+    def test_existing_comments_are_kept(self):
+        tfdata = {"source_files": [self.path], "tf_comments": {"a.b": "replayed"}}
+        fileparser.ensure_comments(tfdata)
+        self.assertEqual(tfdata["tf_comments"], {"a.b": "replayed"})
+
+    def test_edited_file_is_harvested_again(self):
+        fileparser.harvest_comments([self.path])
+        with open(self.path, "w") as f:
+            f.write('# Edited\nresource "aws_instance" "web" {}\n')
+        os.utime(self.path, ns=(1, 1))
+        comments, _ = fileparser.harvest_comments([self.path])
+        self.assertEqual(comments, {"aws_instance.web": "Edited"})
+
+
+class TestModuleDiscoveryQueue(unittest.TestCase):
+    """Remote modules are fetched concurrently, but their files join the
+    parse queue in discovery order, each file once."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = self._tmpdir.name
+        self.main = os.path.join(root, "main.tf")
+        with open(self.main, "w") as f:
+            f.write(
+                'module "slow" {\n  source = "example/slow/aws"\n}\n'
+                'module "fast" {\n  source = "example/fast/aws"\n}\n'
+            )
+        self.fetched = {}
+        for name, body in (
+            ("slow", 'module "nested" {\n  source = "example/nested/aws"\n}\n'),
+            ("fast", 'module "nested" {\n  source = "example/nested/aws"\n}\n'),
+            ("nested", 'resource "aws_vpc" "this" {\n  cidr_block = "x"\n}\n'),
+        ):
+            path = os.path.join(root, "fetched", name, "main.tf")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w") as f:
+                f.write(body)
+            self.fetched[name] = path
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.fetch_calls = []
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _fake_find_tf_files(self, source, paths, mod="main", **kwargs):
+        name = source.split("/")[1]
+        with self.lock:
+            self.fetch_calls.append(name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        # The slow module finishes last although it was discovered first
+        time.sleep(0.3 if name == "slow" else 0.05)
+        with self.lock:
+            self.active -= 1
+        return [self.fetched[name]]
+
+    def test_fetches_overlap_and_files_keep_discovery_order(self):
+        paths = [self.main]
+        with (
+            patch.dict(
+                os.environ,
+                {"TERRAVISION_PARSE_WORKERS": "1", "TERRAVISION_PARSE_CACHE": "off"},
+            ),
+            patch(
+                "modules.fileparser.find_tf_files", side_effect=self._fake_find_tf_files
+            ),
+            patch("modules.fileparser.click.echo"),
+        ):
+            tfdata = iterative_parse(
+                paths, {}, fileparser.EXTRACT, {}, "/nonexistent", ""
+            )
+        self.assertEqual(
+            paths,
+            [
+                self.main,
+                self.fetched["slow"],
+                self.fetched["fast"],
+                self.fetched["nested"],
+            ],
+        )
+        self.assertEqual(self.max_active, 2)
+        # Both parents call the same nested module: fetched once
+        self.assertEqual(sorted(self.fetch_calls), ["fast", "nested", "slow"])
+        self.assertEqual(
+            tfdata["module_source_dict"],
+            {
+                "slow": "example/slow/aws",
+                "fast": "example/fast/aws",
+                "nested": "example/nested/aws",
+            },
+        )
+        self.assertIn(self.fetched["nested"], tfdata["all_resource"])
+
+
 if __name__ == "__main__":
     unittest.main(exit=False)
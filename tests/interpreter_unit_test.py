@@ -14,6 +14,15 @@ from modules.interpreter import (
     handle_implied_resources,
     handle_numbered_nodes,
     handle_module_vars,
+    handle_metadata_vars,
+    _find_references,
+    _REFERENCE_PATTERNS,
+    _VariableResolver,
+    build_symbol_graph,
+    report_reference_cycles,
+    _ModuleIndex,
+    _module_index,
+    invalidate_module_index,
 )
 
 
@@ -162,6 +171,274 @@ class TestFindReplaceValues(unittest.TestCase):
         self.assertIsInstance(result, str)
 
 
+class TestFindReferences(unittest.TestCase):
+    def test_matches_per_pattern_findall(self):
+        samples = [
+            "${var.env}-${local.name}",
+            "data.var.x module.vpc.vpc_id[0] local.tags.Name",
+            "myvar.foo var.config.key var.. module.a[",
+            "no references here",
+        ]
+        for value in samples:
+            found = _find_references(value)
+            for kind, pattern in _REFERENCE_PATTERNS.items():
+                self.assertEqual(found[kind], pattern.findall(value), (value, kind))
+
+
+class TestVariableResolver(unittest.TestCase):
+    def _tfdata(self):
+        return {
+            "variable_map": {"main": {"env": "prod"}},
+            "all_locals": {"main": {"name": "app"}},
+            "variable_list": {},
+            "all_output": {},
+        }
+
+    def test_memoizes_per_string_and_module(self):
+        tfdata = self._tfdata()
+        resolver = _VariableResolver(tfdata)
+        with patch(
+            "modules.interpreter.find_replace_values", wraps=find_replace_values
+        ) as spy:
+            first = resolver.resolve("var.env", "main")
+            self.assertEqual(resolver.resolve("var.env", "main"), first)
+            self.assertEqual(spy.call_count, 1)
+            resolver.resolve("var.env", "other")
+            self.assertEqual(spy.call_count, 2)
+        self.assertEqual(first, find_replace_values("var.env", "main", tfdata))
+
+    def test_invalidated_when_inputs_change(self):
+        tfdata = self._tfdata()
+        resolver = _VariableResolver(tfdata)
+        self.assertIn("app", resolver.resolve("local.name", "main"))
+        tfdata["all_locals"] = {"main": {"name": "web"}}
+        self.assertIn("web", resolver.resolve("local.name", "main"))
+        tfdata["all_locals"]["main"]["name"] = "api"
+        resolver.invalidate()
+        self.assertIn("api", resolver.resolve("local.name", "main"))
+
+    def test_handle_metadata_vars_resolves_shared_strings(self):
+        tfdata = self._tfdata()
+        tfdata["meta_data"] = {
+            f"aws_instance.web{i}": {"module": "main", "tags": "${var.env}"}
+            for i in range(3)
+        }
+        result = handle_metadata_vars(tfdata)
+        values = {attrs["tags"] for attrs in result["meta_data"].values()}
+        self.assertEqual(values, {find_replace_values("${var.env}", "main", tfdata)})
+
+
+class TestHandleMetadataVarsStructure(unittest.TestCase):
+    def _tfdata(self, attrs):
+        return {
+            "variable_map": {"main": {"env": "prod"}},
+            "all_locals": {"main": {"cidr": "10.0.0.0/16"}},
+            "variable_list": {},
+            "all_output": {},
+            "meta_data": {"aws_vpc.main": dict(attrs, module="main")},
+        }
+
+    def test_nested_blocks_keep_their_shape(self):
+        block = [{"cidr_blocks": ["${local.cidr}"], "from_port": 443, "self": False}]
+        tfdata = self._tfdata({"ingress": block, "tags": {"Env": "${var.env}"}})
+        meta = handle_metadata_vars(tfdata)["meta_data"]["aws_vpc.main"]
+        self.assertEqual(
+            meta["ingress"],
+            [
+                {
+                    "cidr_blocks": [
+                        find_replace_values("${local.cidr}", "main", tfdata)
+                    ],
+                    "from_port": 443,
+                    "self": False,
+                }
+            ],
+        )
+        self.assertEqual(
+            meta["tags"], {"Env": find_replace_values("${var.env}", "main", tfdata)}
+        )
+        # The source block is shared with all_resource and must not change
+        self.assertEqual(block[0]["cidr_blocks"], ["${local.cidr}"])
+
+    def test_blocks_without_references_are_kept_as_is(self):
+        block = {"Name": "web"}
+        tfdata = self._tfdata({"tags": block, "count": 2, "depends_on": ["x"]})
+        meta = handle_metadata_vars(tfdata)["meta_data"]["aws_vpc.main"]
+        self.assertIs(meta["tags"], block)
+        self.assertEqual(meta["depends_on"], ["x"])
+        self.assertEqual(meta["count"], "2")
+
+
+class TestReferenceCycles(unittest.TestCase):
+    def _tfdata(self, main_locals, vpc_locals=None):
+        all_locals = {"main": main_locals}
+        if vpc_locals is not None:
+            all_locals["vpc"] = vpc_locals
+        return {
+            "all_locals": all_locals,
+            "variable_map": {"main": {"env": "prod"}},
+            "variable_list": {},
+            "all_output": {
+                "/src/vpc/outputs.tf": [{"vpc_id": {"value": "${local.id}"}}]
+            },
+            "module_source_dict": {"vpc": "/src/vpc"},
+        }
+
+    def test_graph_links_locals_and_outputs(self):
+        tfdata = self._tfdata(
+            {"name": "${var.env}-${local.prefix}", "prefix": "app"},
+            {"id": "${module.subnets.id}"},
+        )
+        graph = build_symbol_graph(tfdata)
+        self.assertEqual(graph[("main", "local.name")], [("main", "local.prefix")])
+        self.assertEqual(graph[("vpc", "local.id")], [("", "module.subnets.id")])
+        # No local uses module.vpc.vpc_id
+        self.assertNotIn(("", "module.vpc.vpc_id"), graph)
+
+    def test_graph_adds_outputs_used_by_locals(self):
+        tfdata = self._tfdata({"vpc": "${module.vpc.vpc_id}"}, {"id": "vpc-1"})
+        graph = build_symbol_graph(tfdata)
+        self.assertEqual(graph[("main", "local.vpc")], [("", "module.vpc.vpc_id")])
+        self.assertEqual(graph[("", "module.vpc.vpc_id")], [("vpc", "local.id")])
+
+    @patch("modules.interpreter.click.echo")
+    def test_cycles_reported_once(self, mock_echo):
+        tfdata = self._tfdata({"a": "${local.b}", "b": "${local.a}", "c": "x"})
+        cycles = report_reference_cycles(tfdata)
+        self.assertEqual(len(cycles), 1)
+        warnings = [str(c.args[0]) for c in mock_echo.call_args_list]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("local.a (main) -> local.b (main) -> local.a (main)", warnings[0])
+
+    @patch("modules.interpreter.click.echo")
+    def test_cycle_through_module_output(self, mock_echo):
+        tfdata = self._tfdata(
+            {"vpc": "${module.vpc.vpc_id}"}, {"id": "${module.vpc.vpc_id}"}
+        )
+        (cycle,) = report_reference_cycles(tfdata)
+        self.assertEqual(
+            cycle,
+            [("", "module.vpc.vpc_id"), ("vpc", "local.id"), ("", "module.vpc.vpc_id")],
+        )
+        self.assertEqual(tfdata["all_locals"]["vpc"]["id"], "${module.vpc.vpc_id}")
+
+    @patch("modules.interpreter.click.echo")
+    def test_map_braces_kept_next_to_module_output(self, mock_echo):
+        # var.image holds a module output, whose cleanup strips every brace
+        # in the string; var.ports is substituted after it and keeps its maps
+        tfdata = self._tfdata(
+            {
+                "definition": (
+                    '${templatefile("task.tftpl", {image = var.image, '
+                    "ports = jsonencode(local.ports)})}"
+                ),
+                "ports": "${[for p in var.ports : {port = p.port}]}",
+            },
+            {"id": "vpc-1"},
+        )
+        tfdata["variable_map"]["main"].update(
+            {
+                "image": "${module.vpc.vpc_id}",
+                "ports": [{"port": 80, "protocol": "tcp"}],
+            }
+        )
+        tfdata["all_output"]["/src/vpc/outputs.tf"] = [
+            {"vpc_id": {"value": "${aws_vpc.this.id}"}}
+        ]
+        tfdata["meta_data"] = {
+            "aws_ecs_task_definition.t": {
+                "module": "main",
+                "container_definitions": "${local.definition}",
+            }
+        }
+        report_reference_cycles(tfdata)
+        value = handle_metadata_vars(tfdata)["meta_data"]["aws_ecs_task_definition.t"]
+        self.assertIn(
+            "[{'port': 80, 'protocol': 'tcp'}]", value["container_definitions"]
+        )
+
+
+class TestModuleIndex(unittest.TestCase):
+    def _tfdata(self):
+        # main -> network -> subnets, each declared in its parent's files
+        return {
+            "all_module": {
+                "/src/main.tf": [{"network": {}}],
+                "/src/modules/network/main.tf": [{"subnets": {}}],
+            },
+            "module_source_dict": {
+                "network": "/src/modules/network",
+                "subnets": "/src/modules/subnets",
+            },
+            "all_output": {
+                "/src/modules/network/outputs.tf": [],
+                "/src/modules/subnets/outputs.tf": [],
+            },
+            "variable_map": {
+                "main": {"region": "eu-west-1", "name": "main-name"},
+                "other": {"name": "other-name"},
+                "network": {"name": "net-name", "names": "plural"},
+                "subnets": {},
+            },
+        }
+
+    def test_ancestors_follow_declaring_module(self):
+        index = _ModuleIndex(self._tfdata())
+        self.assertEqual(index.ancestors("subnets"), ["network", "main"])
+        self.assertEqual(index.ancestors("network"), ["main"])
+
+    def test_nearest_ancestor_defines_variable(self):
+        index = _ModuleIndex(self._tfdata())
+        self.assertEqual(index.module_defining("name", "subnets"), "network")
+        self.assertEqual(index.module_defining("region", "subnets"), "main")
+        self.assertEqual(index.module_defining("name", "unknown"), "main")
+        # Exact names only: "name" is not found as part of "names"
+        self.assertEqual(index.module_defining("nam", "subnets"), None)
+
+    def test_replace_var_values_uses_parent_value(self):
+        tfdata = self._tfdata()
+        result = replace_var_values(["var.name"], [], "var.name", "subnets", tfdata)
+        self.assertEqual(result, "net-name")
+
+    def test_output_files_per_module(self):
+        index = _ModuleIndex(self._tfdata())
+        self.assertEqual(
+            index.output_files("subnets"), ["/src/modules/subnets/outputs.tf"]
+        )
+        self.assertEqual(index.output_files("main"), [])
+
+    def test_parent_lookup_ignores_unrelated_mentions(self):
+        # "other" only mentions var.name in a value; the old substring scan
+        # picked it and substituted "None". The ancestor's declared value
+        # (empty when the variable has no default) is used instead.
+        tfdata = self._tfdata()
+        tfdata["variable_map"] = {
+            "other": {"label": "${var.name}-suffix"},
+            "main": {"name": ""},
+            "network": {},
+            "subnets": {},
+        }
+        value = 'format("%s-vpc", var.name)'
+        result = replace_var_values(["var.name"], [], value, "subnets", tfdata)
+        self.assertEqual(result, 'format("%s-vpc", )')
+
+    def test_rebuilt_when_invalidated(self):
+        tfdata = self._tfdata()
+        index = _module_index(tfdata)
+        self.assertIs(_module_index(tfdata), index)
+        tfdata["variable_map"]["subnets"]["zone"] = "a"
+        # Edits in place are not detected on lookup
+        self.assertIs(_module_index(tfdata), index)
+        invalidate_module_index()
+        rebuilt = _module_index(tfdata)
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.module_defining("zone", "main"), "subnets")
+        tfdata["variable_map"]["main"]["zone"] = "b"
+        rebuilt.add_variable("main", "zone")
+        self.assertIs(_module_index(tfdata), rebuilt)
+        self.assertEqual(rebuilt.module_defining("zone", "network"), "main")
+
+
 class TestReplaceDataValues(unittest.TestCase):
     def test_replace_data_values_empty(self):
         tfdata = {}
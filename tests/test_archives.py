@@ -0,0 +1,192 @@
+"""Tests for streaming archive module extraction (modules/archives.py)."""
+
+import hashlib
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import modules.archives as archives
+import modules.fetch_manager as fetch_manager
+import modules.gitlibs as gitlibs
+import modules.module_cache as module_cache
+
+FILES = {
+    "README.md": "top level\n",
+    "modules/app/main.tf": 'module "common" {\n  source = "../common"\n}\n',
+    "modules/common/main.tf": 'resource "aws_sqs_queue" "q" {}\n',
+    "modules/other/main.tf": 'resource "aws_sns_topic" "t" {}\n',
+}
+
+
+def _write_tgz(path, files=FILES):
+    with tarfile.open(path, "w:gz") as tf:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+def _write_zip(path, files=FILES):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+
+
+@pytest.fixture
+def archive_server(tmp_path):
+    root = tmp_path / "www"
+    root.mkdir()
+    _write_tgz(root / "module.tgz")
+    _write_zip(root / "module.zip")
+    hits = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(root), **kwargs)
+
+        def do_GET(self):
+            hits.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.root = root
+    httpd.hits = hits
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    fetch_manager.close()
+
+
+def _sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _extracted(dest):
+    return sorted(
+        os.path.relpath(os.path.join(d, f), dest).replace(os.sep, "/")
+        for d, _, files in os.walk(dest)
+        for f in files
+    )
+
+
+class TestParseChecksum:
+    def test_typed_and_untyped(self):
+        digest = "a" * 64
+        assert archives.parse_checksum(f"https://h/m.tgz?checksum=sha256:{digest}") == (
+            "https://h/m.tgz",
+            ("sha256", digest),
+        )
+        assert archives.parse_checksum(f"https://h/m.tgz?checksum={'B' * 40}") == (
+            "https://h/m.tgz",
+            ("sha1", "b" * 40),
+        )
+        assert archives.parse_checksum("https://h/m.tgz?ref=x") == (
+            "https://h/m.tgz",
+            None,
+        )
+
+    def test_unsupported_type(self):
+        with pytest.raises(ValueError):
+            archives.parse_checksum("https://h/m.tgz?checksum=crc32:abcd")
+
+    def test_subfolder_keeps_query_on_download_url(self):
+        url, subfolder, _ = gitlibs._handle_http_archive_url(
+            "https://h/m.tgz//modules/app?checksum=sha256:abc"
+        )
+        assert url == "https://h/m.tgz?checksum=sha256:abc"
+        assert subfolder == "modules/app"
+
+
+class TestDownloadAndExtract:
+    @pytest.mark.parametrize("name", ["module.tgz", "module.zip"])
+    def test_full_extract_returns_digest(self, archive_server, tmp_path, name):
+        dest = tmp_path / "dest"
+        digest = gitlibs._download_and_extract_archive(
+            f"{archive_server.url}/{name}", str(dest)
+        )
+        assert digest == "sha256:" + _sha256(archive_server.root / name)
+        assert _extracted(dest) == sorted(FILES)
+
+    @pytest.mark.parametrize("name", ["module.tgz", "module.zip"])
+    def test_subfolder_and_relative_sources_only(self, archive_server, tmp_path, name):
+        dest = tmp_path / "dest"
+        gitlibs._download_and_extract_archive(
+            f"{archive_server.url}/{name}", str(dest), "modules/app"
+        )
+        assert _extracted(dest) == ["modules/app/main.tf", "modules/common/main.tf"]
+        # Second pass picked up ../common
+        assert len(archive_server.hits) == 2
+
+    def test_checksum_verified(self, archive_server, tmp_path):
+        good = _sha256(archive_server.root / "module.tgz")
+        dest = tmp_path / "ok"
+        gitlibs._download_and_extract_archive(
+            f"{archive_server.url}/module.tgz?checksum=sha256:{good}", str(dest)
+        )
+        assert (dest / "README.md").exists()
+
+        with pytest.raises(SystemExit):
+            gitlibs._download_and_extract_archive(
+                f"{archive_server.url}/module.zip?checksum=sha256:{'0' * 64}",
+                str(tmp_path / "bad"),
+            )
+        assert _extracted(tmp_path / "bad") == []
+
+    def test_failed_checksum_leaves_no_store_entry(self, archive_server, tmp_path):
+        store = str(tmp_path / "store")
+        url = f"{archive_server.url}/module.tgz?checksum=md5:{'0' * 32}"
+        with pytest.raises(SystemExit):
+            module_cache.get_or_fetch(
+                url,
+                "",
+                lambda dest: gitlibs._download_and_extract_archive(url, dest),
+                store,
+            )
+        assert module_cache.list_entries(store) == []
+        assert not [n for n in os.listdir(store) if n.startswith(".tmp-")]
+
+    def test_clone_files_stores_archive_subfolder(
+        self, archive_server, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "views"))
+        monkeypatch.setattr(module_cache, "STORE_DIR", str(tmp_path / "store"))
+        os.makedirs(gitlibs.MODULE_DIR)
+        path = gitlibs.clone_files(
+            f"{archive_server.url}/module.tgz//modules/app", "", "app"
+        )
+        assert os.path.isfile(os.path.join(path, "main.tf"))
+        (entry,) = module_cache.list_entries()
+        assert entry["subdir"] == "modules/app"
+        assert entry["commit"] == "sha256:" + _sha256(
+            archive_server.root / "module.tgz"
+        )
+
+
+class TestUnsafeArchives:
+    def test_tar_member_outside_destination_is_rejected(self, tmp_path):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tf:
+            info = tarfile.TarInfo("../escape.tf")
+            info.size = 1
+            tf.addfile(info, io.BytesIO(b"x"))
+        buffer.seek(0)
+        dest = tmp_path / "dest"
+        dest.mkdir()
+        with pytest.raises(tarfile.TarError):
+            archives.extract_stream(buffer, "evil.tgz", str(dest))
+        assert not (tmp_path / "escape.tf").exists()
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            archives.extract_stream(io.BytesIO(b""), "module.rar", str(tmp_path))
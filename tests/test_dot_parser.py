@@ -0,0 +1,127 @@
+"""Unit tests for the in-process `terraform graph` DOT reader."""
+
+import json
+import os
+
+import pytest
+
+import modules.tfwrapper as tfwrapper
+from modules.dot_parser import DotParseError, parse_dot, parse_dot_file
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "json")
+
+# Pre-1.7 `terraform graph` layout: one "root" subgraph, bracketed names with
+# escaped quotes, and nodes that only appear in edge statements.
+LEGACY_GRAPH = r"""digraph {
+	compound = "true"
+	newrank = "true"
+	subgraph "root" {
+		"[root] aws_instance.web (expand)" [label = "aws_instance.web", shape = "box"]
+		"[root] provider[\"registry.terraform.io/hashicorp/aws\"]" [label = "provider[\"registry.terraform.io/hashicorp/aws\"]", shape = "diamond"]
+		"[root] aws_instance.web (expand)" -> "[root] var.region"
+		"[root] aws_instance.web (expand)" -> "[root] provider[\"registry.terraform.io/hashicorp/aws\"]"
+	}
+}
+"""
+
+
+def test_bastion_graph_matches_graphviz_output():
+    """Objects and edges match what `dot -Txdot_json` produced for the fixture."""
+    graph = parse_dot_file(os.path.join(FIXTURES_DIR, "bastion-graph.dot"))
+    with open(os.path.join(FIXTURES_DIR, "bastion-tfdata.json")) as f:
+        expected = json.load(f)["tfgraph"]
+    assert graph["objects"] == expected["objects"]
+    assert graph["edges"] == expected["edges"]
+    assert graph["_subgraph_cnt"] == expected["_subgraph_cnt"]
+    assert graph["rankdir"] == "RL"
+
+
+def test_legacy_graph_names_labels_and_edge_numbering():
+    graph = parse_dot(LEGACY_GRAPH)
+    assert graph["name"] == "%1"
+    assert graph["compound"] == "true"
+    root, web, provider, region = graph["objects"]
+    assert root["name"] == "root"
+    assert root["nodes"] == [1, 2, 3]
+    assert root["edges"] == [0, 1]
+    assert provider["name"] == (
+        '[root] provider["registry.terraform.io/hashicorp/aws"]'
+    )
+    assert provider["shape"] == "diamond"
+    # Nodes only created by an edge keep Graphviz's default label
+    assert region == {"_gvid": 3, "name": "[root] var.region", "label": "\\N"}
+    # Edge list keeps file order; _gvid ranks by (tail, head)
+    assert graph["edges"] == [
+        {"_gvid": 1, "tail": 1, "head": 3},
+        {"_gvid": 0, "tail": 1, "head": 2},
+    ]
+
+
+def test_edge_chains_defaults_and_comments():
+    graph = parse_dot(
+        """
+        // leading comment
+        digraph G {
+          node [shape = rect];
+          edge [style = dashed];
+          a -> b -> c [color = red]; /* trailing */
+          d
+        }
+        """
+    )
+    names = [obj["name"] for obj in graph["objects"]]
+    assert names == ["a", "b", "c", "d"]
+    assert graph["objects"][3]["shape"] == "rect"
+    assert graph["edges"] == [
+        {"_gvid": 0, "tail": 0, "head": 1, "style": "dashed", "color": "red"},
+        {"_gvid": 1, "tail": 1, "head": 2, "style": "dashed", "color": "red"},
+    ]
+
+
+def test_cluster_owns_edges_between_its_nodes():
+    graph = parse_dot(
+        """digraph {
+          subgraph "cluster_module.a" { "x"; "y"; }
+          "x" -> "y";
+          "x" -> "z";
+        }"""
+    )
+    cluster = graph["objects"][0]
+    assert cluster["nodes"] == [1, 2]
+    assert cluster["edges"] == [0]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["graph {", "digraph { a -> }", "digraph { <html> }", "digraph {} extra"],
+)
+def test_malformed_input_raises(text):
+    with pytest.raises(DotParseError):
+        parse_dot(text)
+
+
+def test_convert_dot_to_json_falls_back_to_graphviz(tmp_path, monkeypatch):
+    dot_file = tmp_path / "graph.dot"
+    dot_file.write_text("digraph { a [label = <<b>html</b>>] }")
+    calls = []
+    monkeypatch.setattr(
+        tfwrapper,
+        "_convert_dot_with_graphviz",
+        lambda path: calls.append(path) or {"objects": [], "edges": []},
+    )
+    assert tfwrapper.convert_dot_to_json(str(dot_file)) == {
+        "objects": [],
+        "edges": [],
+    }
+    assert calls == [str(dot_file)]
+
+
+def test_convert_dot_to_json_uses_native_reader(monkeypatch):
+    def no_graphviz(path):
+        raise AssertionError("dot subprocess must not run")
+
+    monkeypatch.setattr(tfwrapper, "_convert_dot_with_graphviz", no_graphviz)
+    graph = tfwrapper.convert_dot_to_json(
+        os.path.join(FIXTURES_DIR, "bastion-graph.dot")
+    )
+    assert len(graph["objects"]) == 27
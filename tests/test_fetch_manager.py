@@ -0,0 +1,153 @@
+"""Tests for pooled, de-duplicated HTTP fetching (modules/fetch_manager.py)."""
+
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import modules.fetch_manager as fetch_manager
+import modules.gitlibs as gitlibs
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["requests"].append(self.path)
+            stats["ports"].add(self.client_address[1])
+            stats["active"] += 1
+            stats["max_active"] = max(stats["max_active"], stats["active"])
+        try:
+            time.sleep(self.server.delay)
+            body = f"body of {self.path}".encode()
+            self.send_response(200)
+            if self.path.endswith("/download"):
+                self.send_header("X-Terraform-Get", "https://example.com/m.tgz")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with stats["lock"]:
+                stats["active"] -= 1
+
+    do_HEAD = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.delay = 0.0
+    httpd.stats = {
+        "lock": threading.Lock(),
+        "requests": [],
+        "ports": set(),
+        "active": 0,
+        "max_active": 0,
+    }
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    fetch_manager.close()
+
+
+def _run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestHostKey:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            (
+                "https://Registry.Example.com/v1/modules/x",
+                "https://registry.example.com",
+            ),
+            ("git::https://user@github.com/org/repo.git", "https://github.com"),
+            (
+                "s3::https://bucket.s3.amazonaws.com/m.zip",
+                "https://bucket.s3.amazonaws.com",
+            ),
+            ("git@github.com:org/repo.git", "ssh://github.com"),
+            ("/tmp/modules/repo.git", ""),
+            ("file:///tmp/modules/repo.git", ""),
+        ],
+    )
+    def test_host_key(self, url, expected):
+        assert fetch_manager.host_key(url) == expected
+
+
+class TestFetchManager:
+    def test_connections_are_reused(self, server):
+        for i in range(5):
+            assert fetch_manager.get(f"{server.url}/m{i}", timeout=5).ok
+        assert len(server.stats["requests"]) == 5
+        assert len(server.stats["ports"]) == 1
+        assert fetch_manager.session_for(server.url) is fetch_manager.session_for(
+            server.url + "/other"
+        )
+
+    def test_identical_inflight_requests_are_shared(self, server):
+        server.delay = 0.3
+        responses = []
+        _run_threads(
+            5,
+            lambda i: responses.append(
+                fetch_manager.get(f"{server.url}/same", timeout=5)
+            ),
+        )
+        assert server.stats["requests"] == ["/same"]
+        assert {r.text for r in responses} == {"body of /same"}
+
+    def test_per_host_limit(self, server, monkeypatch):
+        monkeypatch.setenv("TERRAVISION_FETCH_PER_HOST", "2")
+        fetch_manager.close()
+        server.delay = 0.1
+        _run_threads(6, lambda i: fetch_manager.get(f"{server.url}/p{i}", timeout=5))
+        assert len(server.stats["requests"]) == 6
+        assert server.stats["max_active"] == 2
+
+    def test_download_streams_body(self, server):
+        buffer = io.BytesIO()
+        fetch_manager.download(f"{server.url}/archive.tgz", buffer, timeout=5)
+        assert buffer.getvalue() == b"body of /archive.tgz"
+
+    def test_errors_reach_every_waiter(self, monkeypatch):
+        def refuse(*args, **kwargs):
+            time.sleep(0.1)
+            raise fetch_manager.requests.ConnectionError("refused")
+
+        monkeypatch.setattr(fetch_manager.requests.Session, "request", refuse)
+        errors = []
+
+        def call(i):
+            try:
+                fetch_manager.get("http://unreachable.invalid/x", timeout=1)
+            except fetch_manager.requests.ConnectionError as e:
+                errors.append(e)
+
+        _run_threads(3, call)
+        assert len(errors) == 3
+        fetch_manager.close()
+
+    def test_registry_download_url_uses_pool(self, server, monkeypatch):
+        monkeypatch.setenv("TERRAVISION_REGISTRY_CACHE", "off")
+        monkeypatch.delenv("TERRAVISION_OFFLINE", raising=False)
+        url = gitlibs._resolve_registry_download_url(
+            server.url + "/v1/modules/", "org/name/aws", "1.0.0", {}
+        )
+        assert url == "https://example.com/m.tgz"
+        assert server.stats["requests"] == ["/v1/modules/org/name/aws/1.0.0/download"]
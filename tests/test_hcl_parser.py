@@ -0,0 +1,67 @@
+"""Unit tests for the pre-built HCL2 parser (modules/hcl_parser.py)."""
+
+import glob
+import os
+import sys
+
+import hcl2
+import pytest
+
+import modules.hcl_parser as hcl_parser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+TF_FIXTURES = sorted(
+    glob.glob(os.path.join(FIXTURES_DIR, "**", "*.tf"), recursive=True)
+)
+
+
+@pytest.mark.parametrize(
+    "path", TF_FIXTURES, ids=lambda p: os.path.relpath(p, FIXTURES_DIR)
+)
+def test_matches_hcl2_loads_on_fixtures(path):
+    with open(path, encoding="utf8") as f:
+        text = f.read()
+    assert hcl_parser.loads(text) == hcl2.loads(text)
+
+
+def test_shipped_parser_is_current():
+    """hcl2/hcl2.lark.bin must be rebuilt after grammar or lark changes
+    (scripts/build_hcl_parser.py)."""
+    assert hcl_parser._read_serialized(hcl_parser.SHIPPED_PARSER_FILE) is not None
+
+
+def test_parser_key_is_the_same_on_every_python(monkeypatch):
+    """The shipped parser must load on every supported Python version."""
+    key = hcl_parser.parser_key()
+    hcl_parser.parser_key.cache_clear()
+    monkeypatch.setattr(sys, "version_info", (3, 14, 0, "final", 0))
+    try:
+        assert hcl_parser.parser_key() == key
+    finally:
+        hcl_parser.parser_key.cache_clear()
+
+
+def test_rejected_file_falls_back_to_hcl2(monkeypatch):
+    class RejectingParser:
+        def parse(self, text):
+            raise ValueError("unsupported syntax")
+
+    monkeypatch.setattr(hcl_parser, "get_parser", lambda: RejectingParser())
+    assert hcl_parser.loads('a = "b"\n') == {"a": "b"}
+    with pytest.raises(Exception):
+        hcl_parser.loads('resource "x" {\n')
+
+
+def test_stale_serialized_parser_is_rebuilt_into_user_dir(tmp_path, monkeypatch):
+    stale = tmp_path / "shipped.bin"
+    stale.write_bytes(b"0" * 64 + b"\nnot a parser")
+    monkeypatch.setattr(hcl_parser, "SHIPPED_PARSER_FILE", str(stale))
+    monkeypatch.setattr(hcl_parser, "USER_PARSER_DIR", str(tmp_path / "user"))
+    hcl_parser.get_parser.cache_clear()
+    try:
+        parser = hcl_parser.get_parser()
+        assert parser.options.parser == "lalr"
+        saved = tmp_path / "user" / (hcl_parser.parser_key() + ".bin")
+        assert hcl_parser._read_serialized(str(saved)) is not None
+    finally:
+        hcl_parser.get_parser.cache_clear()
@@ -0,0 +1,130 @@
+"""Tests for module folder materialization (modules/materialize.py)."""
+
+import os
+
+import pytest
+
+import modules.gitlibs as gitlibs
+import modules.materialize as materialize
+import modules.tfwrapper as tfwrapper
+
+
+@pytest.fixture
+def module_tree(tmp_path):
+    src = tmp_path / "src"
+    (src / "modules" / "vpc").mkdir(parents=True)
+    (src / "main.tf").write_text('module "vpc" {\n  source = "./modules/vpc"\n}\n')
+    (src / "modules" / "vpc" / "main.tf").write_text('resource "aws_vpc" "this" {}\n')
+    os.symlink("main.tf", src / "link.tf")
+    return src
+
+
+def _same_tree(a, b):
+    for name in ("main.tf", "modules/vpc/main.tf"):
+        assert (a / name).read_text() == (b / name).read_text()
+
+
+class TestMaterialize:
+    def test_hardlink_shares_inodes(self, module_tree, tmp_path):
+        dest = tmp_path / "dest"
+        used = materialize.materialize(
+            str(module_tree), str(dest), strategies=["hardlink"]
+        )
+        assert used == "hardlink"
+        _same_tree(module_tree, dest)
+        assert os.path.samefile(module_tree / "main.tf", dest / "main.tf")
+        assert os.path.islink(dest / "link.tf")
+
+    def test_symlink_only_for_read_only_use(self, module_tree, tmp_path):
+        read_only = tmp_path / "ro"
+        writable = tmp_path / "rw"
+        order = ["symlink", "copy"]
+        used = materialize.materialize(
+            str(module_tree), str(read_only), strategies=order
+        )
+        assert used == "symlink"
+        assert os.path.islink(read_only)
+        used = materialize.materialize(
+            str(module_tree), str(writable), writable=True, strategies=order
+        )
+        assert used == "copy"
+        assert not os.path.islink(writable)
+        _same_tree(module_tree, writable)
+
+    def test_unsupported_strategy_falls_back(self, module_tree, tmp_path, monkeypatch):
+        def no_links(src, dst):
+            raise OSError(18, "Invalid cross-device link")
+
+        monkeypatch.setattr(materialize, "_probe_results", {})
+        monkeypatch.setattr(materialize.os, "link", no_links)
+        monkeypatch.setitem(materialize._FILE_FUNCTIONS, "hardlink", no_links)
+        dest = tmp_path / "dest"
+        used = materialize.materialize(
+            str(module_tree), str(dest), strategies=["hardlink", "copy"]
+        )
+        assert used == "copy"
+        _same_tree(module_tree, dest)
+        assert not os.path.samefile(module_tree / "main.tf", dest / "main.tf")
+
+    def test_default_order_produces_a_copy(self, module_tree, tmp_path):
+        dest = tmp_path / "dest"
+        used = materialize.materialize(str(module_tree), str(dest), writable=True)
+        assert used in ("reflink", "hardlink", "copy")
+        _same_tree(module_tree, dest)
+
+    def test_environment_override(self, monkeypatch):
+        monkeypatch.setenv("TERRAVISION_MATERIALIZE", "hardlink, copy")
+        assert materialize.configured_strategies() == ["hardlink", "copy"]
+        monkeypatch.setenv("TERRAVISION_MATERIALIZE", "auto")
+        assert materialize.configured_strategies() == materialize.default_strategies()
+        assert "reflink" not in materialize.default_strategies("Windows")
+
+    def test_existing_destination_is_refused(self, module_tree, tmp_path):
+        with pytest.raises(FileExistsError):
+            materialize.materialize(str(module_tree), str(tmp_path))
+
+
+class TestWritersDoNotTouchTheCache:
+    def test_cloud_block_strip_breaks_hard_link(self, tmp_path):
+        cached = tmp_path / "cache"
+        cached.mkdir()
+        original = 'terraform {\n  cloud {\n    organization = "o"\n  }\n}\n'
+        (cached / "main.tf").write_text(original)
+        work = tmp_path / "work"
+        materialize.materialize(str(cached), str(work), strategies=["hardlink"])
+
+        backups = tfwrapper._neutralize_cloud_blocks(str(work))
+        assert "cloud" not in (work / "main.tf").read_text()
+        assert (cached / "main.tf").read_text() == original
+        tfwrapper._restore_cloud_backups(backups)
+        assert (work / "main.tf").read_text() == original
+
+    def test_remote_source_is_planned_in_a_private_copy(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "module_cache"))
+        view = tmp_path / "module_cache" / "github.com_org_repo;main;"
+        (view / "stacks" / "prod").mkdir(parents=True)
+        (view / "stacks" / "prod" / "main.tf").write_text('resource "x" "y" {}\n')
+        monkeypatch.setattr(
+            gitlibs,
+            "get_clone_url",
+            lambda source, version="": (
+                "https://github.com/org/repo",
+                "stacks/prod",
+                "",
+            ),
+        )
+        monkeypatch.setattr(
+            gitlibs, "clone_files", lambda source, tempdir: str(view / "stacks/prod")
+        )
+        monkeypatch.chdir(tmp_path)
+
+        (codepath,), override, _ = tfwrapper._prepare_source(
+            "github.com/org/repo//stacks/prod"
+        )
+        assert codepath.endswith(
+            os.path.join("github.com_org_repo;main;", "stacks", "prod")
+        )
+        assert not codepath.startswith(str(view))
+        assert os.path.isfile(override)
+        assert os.listdir(view / "stacks" / "prod") == ["main.tf"]
+        tfwrapper._cleanup_override(override)
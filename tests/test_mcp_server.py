@@ -29,6 +29,7 @@ EXPECTED_TOOLS = {
     "generate_architecture_graph",
     "generate_diagram",
     "generate_interactive_html",
+    "get_code_comments",
 }
 
 REPLAY_SOURCE = str(Path(__file__).parent / "json" / "bastion-tfdata.json")
@@ -117,6 +118,7 @@ def test_server_advertises_name_and_instructions(server):
                 "upgrade",
             },
         ),
+        ("get_code_comments", {"source"}),
     ],
 )
 def test_tool_schema_exposes_expected_parameters(server, tool_name, expected):
@@ -25,6 +25,7 @@ from modules.mcp_service import (
     _restored_globals,
     _validate_outfile,
     get_output_dir,
+    run_code_comments,
     run_diagram,
     set_output_dir,
     supported_formats,
@@ -521,3 +522,24 @@ def test_run_diagram_rejects_unknown_format_without_running_pipeline():
 def test_run_diagram_rejects_outfile_path_without_running_pipeline():
     with pytest.raises(McpServiceError):
         run_diagram("/nonexistent/source", format="png", outfile="../escape")
+
+
+def test_code_comments_read_without_terraform(tmp_path):
+    (tmp_path / "main.tf").write_text(
+        "# Payments stack\n"
+        "# Owned by team-payments\n"
+        "locals {}\n"
+        "# Receives order events\n"
+        'resource "aws_sqs_queue" "orders" {}\n'
+    )
+    (tmp_path / ".terraform").mkdir()
+    (tmp_path / ".terraform" / "cached.tf").write_text(
+        '# vendored\nresource "aws_sqs_queue" "x" {}\n'
+    )
+    result = run_code_comments(str(tmp_path))
+
+    assert result == {
+        "resource_comments": {"aws_sqs_queue.orders": "Receives order events"},
+        "project_comments": ["Payments stack", "Owned by team-payments"],
+        "file_count": 1,
+    }
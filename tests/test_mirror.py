@@ -0,0 +1,182 @@
+"""Tests for offline module mirrors (modules/mirror.py)."""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+
+import git
+import pytest
+
+import modules.gitlibs as gitlibs
+import modules.mirror as mirror
+import modules.module_cache as module_cache
+
+
+def _make_upstream(tmp_path):
+    """Create a bare repo with modules/app -> ../common and a v1.2.0 tag."""
+    work_dir = tmp_path / "upstream"
+    work = git.Repo.init(work_dir)
+    files = {
+        "modules/app/main.tf": 'module "common" {\n  source = "../common"\n}\n',
+        "modules/common/main.tf": 'resource "aws_sqs_queue" "q" {}\n',
+    }
+    for name, content in files.items():
+        path = work_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    work.index.add(list(files))
+    work.index.commit("init")
+    work.create_tag("v1.2.0")
+    work.clone(str(tmp_path / "upstream.git"), bare=True)
+    return str(tmp_path / "upstream.git")
+
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "views"))
+    monkeypatch.setattr(module_cache, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(gitlibs, "_registry_resolutions", {})
+    monkeypatch.delenv("TERRAVISION_MIRROR", raising=False)
+    os.makedirs(gitlibs.MODULE_DIR)
+
+
+class TestSourceKey:
+    def test_equivalent_spellings_share_a_key(self):
+        key = mirror.source_key("https://github.com/org/repo")
+        assert mirror.source_key("git::https://github.com/org/repo.git") == key
+        assert mirror.source_key("https://github.com/org/repo/?ref=v1") == key
+
+    def test_disabled_without_environment(self, monkeypatch):
+        monkeypatch.delenv("TERRAVISION_MIRROR", raising=False)
+        assert not mirror.is_enabled()
+        monkeypatch.setenv("TERRAVISION_MIRROR", "/srv/mirror")
+        assert mirror.mirror_dir() == os.path.abspath("/srv/mirror")
+        with mirror.suspended():
+            assert not mirror.is_enabled()
+
+
+class TestSyncAndResolve:
+    def test_sync_then_resolve_without_upstream(
+        self, tmp_path, monkeypatch, isolated_cache
+    ):
+        upstream = _make_upstream(tmp_path)
+        project = tmp_path / "project"
+        (project / "network").mkdir(parents=True)
+        (project / "main.tf").write_text(
+            'module "network" {\n  source = "./network"\n}\n'
+        )
+        (project / "network" / "main.tf").write_text(
+            'module "app" {\n  source  = "example/app/aws//modules/app"\n'
+            '  version = "~> 1.2"\n}\n'
+        )
+        registry_calls = []
+
+        def fake_registry(source, version=""):
+            registry_calls.append((source, version))
+            return upstream, "modules/app", "v1.2.0"
+
+        monkeypatch.setattr(gitlibs, "_handle_registry_url", fake_registry)
+        mirror_dir = str(tmp_path / "mirror")
+
+        synced = gitlibs.sync_mirror(str(project), mirror_dir)
+
+        assert synced == ["example/app/aws//modules/app"]
+        index = json.loads((tmp_path / "mirror" / mirror.INDEX_FILE).read_text())
+        assert index["registry"]["example/app/aws//modules/app ~> 1.2"] == {
+            "url": upstream,
+            "subfolder": "modules/app",
+            "ref": "v1.2.0",
+        }
+        kind, bare = mirror.lookup_source(upstream, mirror_dir)
+        assert kind == "git" and git.Repo(bare).bare
+
+        # Offline: empty module store, no upstream and no registry
+        shutil.rmtree(upstream)
+        shutil.rmtree(module_cache.STORE_DIR)
+        monkeypatch.setattr(gitlibs, "_registry_resolutions", {})
+        monkeypatch.setenv("TERRAVISION_MIRROR", mirror_dir)
+        path = gitlibs.clone_files(
+            "example/app/aws//modules/app", "", "app", version="~> 1.2"
+        )
+        assert len(registry_calls) == 1
+        assert os.path.isfile(os.path.join(path, "main.tf"))
+        assert os.path.isfile(os.path.join(path, "..", "common", "main.tf"))
+        (entry,) = module_cache.list_entries()
+        assert entry["url"] == upstream and entry["ref"] == "v1.2.0"
+
+    def test_resync_updates_existing_repository(self, tmp_path, isolated_cache):
+        upstream = _make_upstream(tmp_path)
+        mirror_dir = str(tmp_path / "mirror")
+        source = f"git::{upstream}"
+        gitlibs.sync_mirror(source, mirror_dir)
+        _, bare = mirror.lookup_source(upstream, mirror_dir)
+
+        work = git.Repo(tmp_path / "upstream")
+        work.create_tag("v1.3.0")
+        work.git.push(upstream, "v1.3.0")
+        gitlibs.sync_mirror(source, mirror_dir)
+
+        assert mirror.lookup_source(upstream, mirror_dir) == ("git", bare)
+        assert "v1.3.0" in [t.name for t in git.Repo(bare).tags]
+
+
+class TestMirrorMode:
+    def test_unmirrored_sources_fail_without_network(
+        self, tmp_path, monkeypatch, isolated_cache
+    ):
+        monkeypatch.setenv("TERRAVISION_MIRROR", str(tmp_path / "mirror"))
+        monkeypatch.setattr(
+            gitlibs,
+            "_handle_registry_url",
+            lambda *args: pytest.fail("registry contacted in mirror mode"),
+        )
+        with pytest.raises(SystemExit):
+            gitlibs.clone_files("example/app/aws", "", "app", version="1.0.0")
+        with pytest.raises(SystemExit):
+            gitlibs.clone_files("git::https://example.com/org/repo.git", "", "repo")
+
+    def test_hand_written_index_serves_archives(
+        self, tmp_path, monkeypatch, isolated_cache
+    ):
+        mirror_dir = tmp_path / "mirror"
+        (mirror_dir / "files").mkdir(parents=True)
+        archive = mirror_dir / "files" / "app.tgz"
+        with tarfile.open(archive, "w:gz") as tf:
+            data = b'resource "aws_sns_topic" "t" {}\n'
+            info = tarfile.TarInfo("modules/app/main.tf")
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+        (mirror_dir / mirror.INDEX_FILE).write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "sources": {
+                        "https://artifacts.example.com/app.tgz": {
+                            "kind": "archive",
+                            "path": "files/app.tgz",
+                        }
+                    },
+                }
+            )
+        )
+        monkeypatch.setenv("TERRAVISION_MIRROR", str(mirror_dir))
+        digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+
+        path = gitlibs.clone_files(
+            "https://artifacts.example.com/app.tgz//modules/app"
+            f"?checksum=sha256:{digest}",
+            "",
+            "app",
+        )
+        assert os.path.isfile(os.path.join(path, "main.tf"))
+
+        shutil.rmtree(module_cache.STORE_DIR)
+        with pytest.raises(SystemExit):
+            gitlibs.clone_files(
+                f"https://artifacts.example.com/app.tgz?checksum=sha256:{'0' * 64}",
+                "",
+                "bad",
+            )
@@ -0,0 +1,363 @@
+"""Tests for the content-addressed module store (modules/module_cache.py)."""
+
+import errno
+import os
+import threading
+import time
+
+import git
+import pytest
+
+import modules.gitlibs as gitlibs
+import modules.module_cache as module_cache
+
+
+def _fill(files):
+    """Return a fetch callback writing files into the staging tree."""
+    calls = []
+
+    def fetch(dest):
+        calls.append(dest)
+        for name, content in files.items():
+            path = os.path.join(dest, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+        return "abc123"
+
+    fetch.calls = calls
+    return fetch
+
+
+class TestEntryKey:
+    def test_trailing_slash_and_git_suffix_share_key(self):
+        key = module_cache.entry_key("https://example.com/org/repo.git", "v1")
+        assert key == module_cache.entry_key("https://example.com/org/repo/", "v1")
+
+    def test_ref_changes_key(self):
+        url = "https://example.com/org/repo"
+        assert module_cache.entry_key(url, "v1") != module_cache.entry_key(url, "v2")
+
+
+class TestGetOrFetch:
+    def test_fetches_once_and_records_meta(self, tmp_path):
+        store = str(tmp_path / "store")
+        fetch = _fill({"main.tf": "x", "sub/vars.tf": "y"})
+        first = module_cache.get_or_fetch("https://h/r", "v1", fetch, store)
+        second = module_cache.get_or_fetch("https://h/r", "v1", fetch, store)
+        assert first == second
+        assert len(fetch.calls) == 1
+        assert open(os.path.join(first, "sub", "vars.tf")).read() == "y"
+        (entry,) = module_cache.list_entries(store)
+        assert entry["commit"] == "abc123"
+        assert entry["files"] == 2
+        assert not [n for n in os.listdir(store) if n.startswith(".tmp-")]
+
+    def test_concurrent_callers_share_one_fetch(self, tmp_path):
+        store = str(tmp_path / "store")
+        fetch = _fill({"main.tf": "x"})
+
+        def slow_fetch(dest):
+            time.sleep(0.2)
+            return fetch(dest)
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    module_cache.get_or_fetch("https://h/r", "", slow_fetch, store)
+                )
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(fetch.calls) == 1
+        assert len(set(results)) == 1
+
+    def test_failed_fetch_leaves_no_entry(self, tmp_path):
+        store = str(tmp_path / "store")
+
+        def broken(dest):
+            raise RuntimeError("network down")
+
+        with pytest.raises(RuntimeError):
+            module_cache.get_or_fetch("https://h/r", "", broken, store)
+        assert module_cache.list_entries(store) == []
+        assert module_cache.lookup("https://h/r", "", store) is None
+
+
+class TestPruneAndVerify:
+    def _populate(self, store, count):
+        keys = []
+        for i in range(count):
+            module_cache.get_or_fetch(
+                f"https://h/r{i}", "", _fill({"main.tf": "x" * 1000}), store
+            )
+            key = module_cache.entry_key(f"https://h/r{i}")
+            meta = os.path.join(module_cache.entry_path(key, store), "meta.json")
+            os.utime(meta, (1000 + i, 1000 + i))
+            keys.append(key)
+        return keys
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        store = str(tmp_path / "store")
+        keys = self._populate(store, 3)
+        one_entry = module_cache.list_entries(store)[0]["disk_bytes"]
+        evicted = module_cache.prune(store, max_bytes=one_entry * 2)
+        assert evicted == keys[:1]
+        assert [e["key"] for e in module_cache.list_entries(store)] == keys[1:]
+
+    def test_new_entries_are_pruned_only_when_the_run_is_done(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(module_cache, "_pending_prune", set())
+        monkeypatch.setenv("TERRAVISION_MODULE_CACHE_MAX_MB", "0")
+        store = str(tmp_path / "store")
+        keys = self._populate(store, 2)
+        assert len(module_cache.list_entries(store)) == 2
+        assert sorted(module_cache.prune_pending()) == sorted(keys)
+        assert module_cache.prune_pending() == []
+
+    def test_prune_skips_locked_entries(self, tmp_path):
+        store = str(tmp_path / "store")
+        keys = self._populate(store, 2)
+        with module_cache.entry_lock(keys[0], store):
+            evicted = module_cache.prune(store, max_bytes=0)
+        assert evicted == keys[1:]
+
+    def test_prune_removes_incomplete_and_stale_staging(self, tmp_path):
+        store = str(tmp_path / "store")
+        self._populate(store, 1)
+        os.makedirs(os.path.join(store, "deadbeef", "tree"))
+        stale = os.path.join(store, ".tmp-crashed")
+        os.makedirs(stale)
+        os.utime(stale, (1000, 1000))
+        module_cache.prune(store, max_bytes=10**9)
+        assert len(module_cache.list_entries(store)) == 1
+        assert not os.path.exists(stale)
+
+    def test_verify_detects_modified_tree(self, tmp_path):
+        store = str(tmp_path / "store")
+        (key,) = self._populate(store, 1)
+        assert module_cache.verify(store) == []
+        with open(
+            os.path.join(module_cache.tree_path(key, store), "main.tf"), "a"
+        ) as f:
+            f.write("tampered")
+        assert module_cache.verify(store) == [
+            (key, "content does not match recorded digest")
+        ]
+        module_cache.verify(store, fix=True)
+        assert module_cache.list_entries(store) == []
+
+
+class TestCloneFilesUsesStore:
+    @pytest.fixture
+    def bare_repo(self, tmp_path):
+        work = git.Repo.init(tmp_path / "work")
+        with open(tmp_path / "work" / "main.tf", "w") as f:
+            f.write('resource "aws_s3_bucket" "b" {}\n')
+        work.index.add(["main.tf"])
+        work.index.commit("init")
+        work.create_tag("v1.0.0")
+        bare = tmp_path / "remote.git"
+        work.clone(str(bare), bare=True)
+        return str(bare)
+
+    def test_modules_sharing_a_source_share_one_clone(
+        self, tmp_path, monkeypatch, bare_repo
+    ):
+        monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "views"))
+        monkeypatch.setattr(module_cache, "STORE_DIR", str(tmp_path / "store"))
+        os.makedirs(gitlibs.MODULE_DIR)
+        monkeypatch.setattr(
+            gitlibs, "get_clone_url", lambda url, version="": (bare_repo, "", "v1.0.0")
+        )
+        clones = []
+        real_clone = gitlibs._clone_full_repo
+
+        def counting_clone(*args):
+            clones.append(args)
+            return real_clone(*args)
+
+        monkeypatch.setattr(gitlibs, "_clone_full_repo", counting_clone)
+        source = "git::https://example.com/org/remote.git?ref=v1.0.0"
+        first = gitlibs.clone_files(source, str(tmp_path / "tmp"), "first")
+        second = gitlibs.clone_files(source, str(tmp_path / "tmp"), "second")
+
+        assert len(clones) == 1
+        assert ";first;" in first and ";second;" in second
+        assert os.path.islink(first.rstrip(os.sep))
+        assert os.path.realpath(first) == os.path.realpath(second)
+        assert os.path.isfile(os.path.join(second, "main.tf"))
+        (entry,) = module_cache.list_entries()
+        assert entry["ref"] == "v1.0.0" and len(entry["commit"]) == 40
+
+        # An evicted entry leaves a dangling view that is cleaned up
+        module_cache.prune(max_bytes=0)
+        removed = module_cache.remove_dangling_links(gitlibs.MODULE_DIR)
+        assert len(removed) == 2
+
+
+class TestLinkModuleView:
+    @pytest.fixture
+    def trees(self, tmp_path):
+        trees = []
+        for name in ("v1", "v2"):
+            tree = tmp_path / "store" / name
+            tree.mkdir(parents=True)
+            (tree / "main.tf").write_text(name)
+            trees.append(str(tree))
+        (tmp_path / "views").mkdir()
+        return trees
+
+    def test_repoints_existing_view_in_place(self, tmp_path, trees):
+        view = str(tmp_path / "views" / "src;mod;")
+        gitlibs._link_module_view(trees[0], view)
+        gitlibs._link_module_view(trees[1], view)
+        assert os.readlink(view) == trees[1]
+        assert os.listdir(tmp_path / "views") == ["src;mod;"]
+
+    def test_replaces_a_directory_view(self, tmp_path, trees):
+        view = tmp_path / "views" / "src;mod;"
+        view.mkdir()
+        (view / "old.tf").write_text("old")
+        gitlibs._link_module_view(trees[0], str(view))
+        assert os.readlink(view) == trees[0]
+        assert os.listdir(tmp_path / "views") == ["src;mod;"]
+
+    def test_concurrent_links_never_remove_the_view(self, tmp_path, trees):
+        view = str(tmp_path / "views" / "src;mod;")
+        gitlibs._link_module_view(trees[0], view)
+        errors = []
+        stop = threading.Event()
+
+        def relink(i):
+            try:
+                for _ in range(50):
+                    gitlibs._link_module_view(trees[i % 2], view)
+            except OSError as e:
+                errors.append(e)
+
+        def read():
+            while not stop.is_set():
+                if not os.path.isfile(os.path.join(view, "main.tf")):
+                    errors.append("view missing")
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        threads = [threading.Thread(target=relink, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stop.set()
+        reader.join()
+        assert errors == []
+        assert os.listdir(tmp_path / "views") == ["src;mod;"]
+
+    def test_copies_only_when_symlinks_are_unsupported(
+        self, tmp_path, trees, monkeypatch
+    ):
+        def no_symlinks(*args, **kwargs):
+            raise OSError(errno.EPERM, "Operation not permitted")
+
+        monkeypatch.setattr(gitlibs.os, "symlink", no_symlinks)
+        view = tmp_path / "views" / "src;mod;"
+        gitlibs._link_module_view(trees[0], str(view))
+        assert not view.is_symlink()
+        assert (view / "main.tf").read_text() == "v1"
+
+        def no_space(*args, **kwargs):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(gitlibs.os, "symlink", no_space)
+        with pytest.raises(OSError):
+            gitlibs._link_module_view(trees[1], str(view))
+        assert (view / "main.tf").read_text() == "v1"
+
+
+def _make_monorepo(tmp_path, allow_filter=True):
+    """Create a bare repo with modules/a -> ../b, modules/b and modules/c."""
+    work_dir = tmp_path / "mono"
+    work = git.Repo.init(work_dir)
+    files = {
+        "README.md": "root\n",
+        "modules/a/main.tf": 'module "b" {\n  source = "../b"\n}\n',
+        "modules/b/main.tf": 'resource "aws_sqs_queue" "q" {}\n',
+        "modules/c/main.tf": 'resource "aws_sns_topic" "t" {}\n',
+    }
+    for name, content in files.items():
+        path = work_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    work.index.add(list(files))
+    work.index.commit("init")
+    work.create_tag("v2.0.0")
+    bare = work.clone(str(tmp_path / "mono.git"), bare=True)
+    if allow_filter:
+        with bare.config_writer() as config:
+            config.set_value("uploadpack", "allowFilter", "true")
+    return str(tmp_path / "mono.git"), work.head.commit.hexsha
+
+
+class TestSparseClone:
+    @pytest.mark.parametrize("allow_filter", [True, False])
+    def test_checks_out_subfolder_and_relative_sources(self, tmp_path, allow_filter):
+        bare, commit = _make_monorepo(tmp_path, allow_filter)
+        dest = str(tmp_path / "dest")
+        os.makedirs(dest)
+        assert gitlibs._clone_sparse(bare, "modules/a", "v2.0.0", dest)
+        assert os.path.isfile(os.path.join(dest, "modules", "a", "main.tf"))
+        assert os.path.isfile(os.path.join(dest, "modules", "b", "main.tf"))
+        assert not os.path.exists(os.path.join(dest, "modules", "c"))
+        assert not os.path.exists(os.path.join(dest, "README.md"))
+        repo = git.Repo(dest)
+        assert repo.head.commit.hexsha == commit
+        assert len(repo.git.rev_list("--all").split()) == 1
+
+    def test_failure_leaves_empty_folder_for_full_clone(self, tmp_path):
+        dest = str(tmp_path / "dest")
+        os.makedirs(dest)
+        missing = str(tmp_path / "missing.git")
+        assert not gitlibs._clone_sparse(missing, "modules/a", "", dest)
+        assert os.listdir(dest) == []
+
+    def test_clone_files_stores_subfolders_separately(self, tmp_path, monkeypatch):
+        bare, commit = _make_monorepo(tmp_path)
+        monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "views"))
+        monkeypatch.setattr(module_cache, "STORE_DIR", str(tmp_path / "store"))
+        os.makedirs(gitlibs.MODULE_DIR)
+        monkeypatch.setattr(
+            gitlibs,
+            "get_clone_url",
+            lambda url, version="": (bare, url.split("//")[-1].split("?")[0], "v2.0.0"),
+        )
+        base = "git::https://example.com/org/mono.git"
+        path_a = gitlibs.clone_files(f"{base}//modules/a?ref=v2.0.0", "", "a")
+        path_c = gitlibs.clone_files(f"{base}//modules/c?ref=v2.0.0", "", "c")
+
+        assert os.path.isfile(os.path.join(path_a, "main.tf"))
+        assert os.path.isfile(os.path.join(path_c, "main.tf"))
+        entries = module_cache.list_entries()
+        assert sorted(e["subdir"] for e in entries) == ["modules/a", "modules/c"]
+        assert {e["commit"] for e in entries} == {commit}
+
+    def test_disabled_by_environment(self, tmp_path, monkeypatch):
+        bare, _ = _make_monorepo(tmp_path)
+        monkeypatch.setenv("TERRAVISION_SPARSE_CLONE", "off")
+        monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "views"))
+        monkeypatch.setattr(module_cache, "STORE_DIR", str(tmp_path / "store"))
+        os.makedirs(gitlibs.MODULE_DIR)
+        monkeypatch.setattr(
+            gitlibs, "get_clone_url", lambda url, version="": (bare, "modules/c", "")
+        )
+        path = gitlibs.clone_files(
+            "git::https://example.com/org/mono.git//modules/c", "", "c"
+        )
+        assert os.path.isfile(os.path.join(path, "..", "a", "main.tf"))
+        (entry,) = module_cache.list_entries()
+        assert entry["subdir"] == ""
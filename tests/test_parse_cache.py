@@ -0,0 +1,78 @@
+"""Unit tests for the parsed-HCL cache (modules/parse_cache.py)."""
+
+import os
+
+import pytest
+
+import modules.fileparser as fileparser
+import modules.parse_cache as parse_cache
+
+SOURCE = (
+    "# Public web tier\n"
+    'resource "aws_instance" "web" {\n'
+    '  ami = "ami-123"\n'
+    "}\n"
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "parse_cache"
+    monkeypatch.setattr(parse_cache, "PARSE_CACHE_DIR", str(path))
+    monkeypatch.delenv("TERRAVISION_PARSE_CACHE", raising=False)
+    return path
+
+
+@pytest.fixture
+def tf_file(tmp_path):
+    path = tmp_path / "main.tf"
+    path.write_text(SOURCE)
+    return str(path)
+
+
+def test_key_depends_on_content_and_parser(monkeypatch):
+    base = parse_cache.cache_key(SOURCE)
+    assert parse_cache.cache_key(SOURCE) == base
+    assert parse_cache.cache_key(SOURCE + "\n") != base
+    monkeypatch.setattr(parse_cache, "parser_fingerprint", lambda: "other-parser")
+    assert parse_cache.cache_key(SOURCE) != base
+
+
+def test_hit_skips_the_parser(cache_dir, tf_file, monkeypatch):
+    parsed = fileparser._parse_tf_file(tf_file)
+    assert parsed["hcl"]["resource"][0]["aws_instance"]["web"]["ami"] == "ami-123"
+    assert len(os.listdir(cache_dir)) == 1
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("the parser must not run on a cache hit")
+
+    monkeypatch.setattr(fileparser.hcl_parser, "loads", no_parse)
+    assert fileparser._parse_tf_file(tf_file) == parsed
+
+
+def test_disabled_cache_writes_nothing(cache_dir, tf_file, monkeypatch):
+    monkeypatch.setenv("TERRAVISION_PARSE_CACHE", "off")
+    fileparser._parse_tf_file(tf_file)
+    assert not cache_dir.exists()
+
+
+def test_corrupt_entry_is_a_miss(cache_dir):
+    key = parse_cache.cache_key(SOURCE)
+    assert parse_cache.store(key, {"hcl": {"a": [1, 2]}})
+    entry = cache_dir / (key + ".bin")
+    entry.write_bytes(b"\x00garbage")
+    assert parse_cache.load(key) is None
+    assert not entry.exists()
+
+
+def test_prune_evicts_least_recently_used(cache_dir):
+    value = {"hcl": {"pad": "x" * 1000}}
+    for i, key in enumerate(["old", "used", "new"]):
+        parse_cache.store(key, value)
+        os.utime(cache_dir / f"{key}.bin", (1000 + i, 1000 + i))
+    # Reading "used" makes it the most recently used entry
+    assert parse_cache.load("used") == value
+    entry_size = (cache_dir / "old.bin").stat().st_size
+    evicted = parse_cache.prune(max_bytes=2 * entry_size)
+    assert evicted == ["old"]
+    assert sorted(os.listdir(cache_dir)) == ["new.bin", "used.bin"]
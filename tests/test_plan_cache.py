@@ -0,0 +1,145 @@
+"""Unit tests for the terraform plan/graph cache (modules/plan_cache.py)."""
+
+import json
+import os
+import time
+
+import pytest
+
+import modules.plan_cache as plan_cache
+import modules.tfwrapper as tfwrapper
+
+PLANDATA = {
+    "resource_changes": [
+        {
+            "address": "aws_instance.web",
+            "mode": "managed",
+            "type": "aws_instance",
+            "change": {"after": {}, "after_unknown": {}},
+        }
+    ]
+}
+GRAPHDATA = {"objects": [{"_gvid": 0, "name": "x", "label": "aws_instance.web"}]}
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """A small terraform folder with a sibling local module."""
+    monkeypatch.setattr(plan_cache, "_tf_version", lambda: "Terraform v1.9.0")
+    monkeypatch.setattr(plan_cache, "PLAN_CACHE_DIR", str(tmp_path / "cache"))
+    for name in list(os.environ):
+        if name.startswith("TF_VAR_"):
+            monkeypatch.delenv(name)
+    root = tmp_path / "stack"
+    root.mkdir()
+    (root / "main.tf").write_text(
+        'module "vpc" {\n  source = "../modules/vpc"\n}\n'
+        'resource "aws_instance" "web" {}\n'
+    )
+    vpc = tmp_path / "modules" / "vpc"
+    vpc.mkdir(parents=True)
+    (vpc / "main.tf").write_text('resource "aws_vpc" "this" {}\n')
+    return root
+
+
+def test_key_is_stable_for_unchanged_source(source):
+    assert plan_cache.cache_key(str(source), [], "default") == plan_cache.cache_key(
+        str(source), [], "default"
+    )
+
+
+def test_key_changes_with_tf_content_workspace_and_version(source, monkeypatch):
+    base = plan_cache.cache_key(str(source), [], "default")
+    assert plan_cache.cache_key(str(source), [], "staging") != base
+    (source / "main.tf").write_text('resource "aws_instance" "api" {}\n')
+    edited = plan_cache.cache_key(str(source), [], "default")
+    assert edited != base
+    monkeypatch.setattr(plan_cache, "_tf_version", lambda: "Terraform v1.10.0")
+    assert plan_cache.cache_key(str(source), [], "default") != edited
+
+
+def test_key_follows_local_modules_outside_source(source):
+    base = plan_cache.cache_key(str(source), [], "default")
+    module_tf = source.parent / "modules" / "vpc" / "main.tf"
+    module_tf.write_text('resource "aws_vpc" "other" {}\n')
+    assert plan_cache.cache_key(str(source), [], "default") != base
+
+
+def test_key_includes_varfiles_and_tf_var_env(source, tmp_path, monkeypatch):
+    varfile = tmp_path / "prod.tfvars"
+    varfile.write_text('env = "prod"\n')
+    base = plan_cache.cache_key(str(source), [str(varfile)], "default")
+    varfile.write_text('env = "dev"\n')
+    assert plan_cache.cache_key(str(source), [str(varfile)], "default") != base
+    without_env = plan_cache.cache_key(str(source), [], "default")
+    monkeypatch.setenv("TF_VAR_region", "eu-west-1")
+    assert plan_cache.cache_key(str(source), [], "default") != without_env
+
+
+def test_key_ignores_terravision_and_terraform_artifacts(source):
+    base = plan_cache.cache_key(str(source), [], "default")
+    (source / "terravision_override.tf").write_text("terraform {}\n")
+    (source / ".terraform").mkdir()
+    (source / ".terraform" / "terraform.tfstate").write_text("{}")
+    assert plan_cache.cache_key(str(source), [], "default") == base
+
+
+def test_store_then_load_round_trips_plan_graph_and_modules(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tf_data_dir = tmp_path / "tfdata"
+    (tf_data_dir / "modules" / "vpc").mkdir(parents=True)
+    (tf_data_dir / "modules" / "modules.json").write_text('{"Modules": []}')
+    plan_cache.store("abc", PLANDATA, GRAPHDATA, str(tf_data_dir), cache_dir)
+
+    restored_dir = tmp_path / "fresh"
+    restored_dir.mkdir()
+    plandata, graphdata = plan_cache.load("abc", str(restored_dir), cache_dir)
+    assert plandata == PLANDATA
+    assert graphdata == GRAPHDATA
+    assert (restored_dir / "modules" / "modules.json").exists()
+
+
+def test_load_miss_and_corrupt_entry(tmp_path):
+    cache_dir = tmp_path / "cache"
+    assert plan_cache.load("missing", str(tmp_path), str(cache_dir)) is None
+    (cache_dir / "broken").mkdir(parents=True)
+    (cache_dir / "broken" / "plan.json").write_text("{not json")
+    assert plan_cache.load("broken", str(tmp_path), str(cache_dir)) is None
+    assert not (cache_dir / "broken").exists()
+
+
+def test_prune_evicts_expired_then_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    now = time.time()
+    for name, age in (("old", 30 * 86400), ("lru", 200), ("mru", 100)):
+        entry = cache_dir / name
+        entry.mkdir(parents=True)
+        (entry / "plan.json").write_bytes(b"x" * 1000)
+        os.utime(entry, (now - age, now - age))
+
+    evicted = plan_cache.prune(str(cache_dir), max_bytes=1500, max_age=86400)
+    assert evicted == ["old", "lru"]
+    assert sorted(os.listdir(cache_dir)) == ["mru"]
+
+
+def test_disabled_by_environment(monkeypatch):
+    monkeypatch.setenv("TERRAVISION_PLAN_CACHE", "off")
+    assert not plan_cache.is_enabled()
+    monkeypatch.setenv("TERRAVISION_PLAN_CACHE", "on")
+    assert plan_cache.is_enabled()
+
+
+def test_tf_initplan_cache_hit_skips_terraform(source, monkeypatch):
+    key = plan_cache.cache_key(str(source), [], "default")
+    plan_cache.store(key, PLANDATA, GRAPHDATA, str(source.parent / "none"))
+
+    def no_terraform(*args, **kwargs):
+        raise AssertionError("terraform must not run on a cache hit")
+
+    monkeypatch.setattr(tfwrapper, "_prepare_source", no_terraform)
+    monkeypatch.setattr(tfwrapper, "_run_terraform_init", no_terraform)
+    tfdata = tfwrapper.tf_initplan(str(source), [], "default", debug=False)
+    assert tfdata["codepath"] == str(source)
+    assert tfdata["tf_resources_created"] == PLANDATA["resource_changes"]
+    assert tfdata["tfgraph"] == GRAPHDATA
+    assert tfdata["terraform_init_dir"] == tfwrapper.temp_dir.name
@@ -0,0 +1,111 @@
+"""Tests for plan-based module output resolution (modules/plan_resolver.py)."""
+
+import modules.plan_resolver as plan_resolver
+
+
+def _plan():
+    """Root -> module.eks -> module.node_group, with outputs at each level."""
+    node_group = {
+        "outputs": {
+            "role_arn": {"expression": {"references": ["aws_iam_role.this.arn"]}},
+            "size": {"expression": {"constant_value": 3}},
+        },
+    }
+    eks = {
+        "module_calls": {"node_group": {"module": node_group}},
+        "outputs": {
+            "cluster_id": {"expression": {"references": ["aws_eks_cluster.this.id"]}},
+            "node_role": {"expression": {"references": ["module.node_group.role_arn"]}},
+            "loop": {"expression": {"references": ["module.eks.loop"]}},
+        },
+    }
+    return {
+        "configuration": {
+            "root_module": {
+                "module_calls": {"eks": {"module": eks}},
+                "outputs": {},
+            }
+        },
+        "planned_values": {
+            "root_module": {
+                "resources": [],
+                "child_modules": [
+                    {
+                        "address": "module.eks",
+                        "resources": [
+                            {
+                                "address": "module.eks.aws_eks_cluster.this",
+                                "values": {"id": None, "name": "prod"},
+                            }
+                        ],
+                        "child_modules": [
+                            {
+                                "address": "module.eks.module.node_group",
+                                "resources": [
+                                    {
+                                        "address": "module.eks.module.node_group"
+                                        ".aws_iam_role.this",
+                                        "values": {"arn": "arn:aws:iam::1:role/ng"},
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            }
+        },
+    }
+
+
+class TestPlanIndex:
+    def test_indexes_modules_outputs_and_resources(self):
+        index = plan_resolver.PlanIndex(_plan())
+        assert set(index.configs) == {(), ("eks",), ("eks", "node_group")}
+        assert set(index.outputs[("eks", "node_group")]) == {"role_arn", "size"}
+        assert index.resources["module.eks.aws_eks_cluster.this"]["values"] == {
+            "id": None,
+            "name": "prod",
+        }
+
+    def test_built_once_per_plan(self):
+        tfdata = {"plandata": _plan()}
+        index = plan_resolver.plan_index(tfdata)
+        assert plan_resolver.plan_index(tfdata) is index
+        tfdata["plandata"] = _plan()
+        assert plan_resolver.plan_index(tfdata) is not index
+
+
+class TestResolveModuleRef:
+    def test_address_and_value(self):
+        tfdata = {"plandata": _plan()}
+        resolve = plan_resolver.resolve_module_ref_from_plan
+        assert (
+            resolve("module.eks.cluster_id", tfdata)
+            == "module.eks.aws_eks_cluster.this"
+        )
+        # id is known after apply, so the name stands in
+        assert (
+            plan_resolver.resolve_module_ref_to_value("module.eks.cluster_id", tfdata)
+            == "prod"
+        )
+
+    def test_nested_modules_and_instance_keys(self):
+        tfdata = {"plandata": _plan()}
+        assert (
+            plan_resolver.resolve_module_ref_from_plan("module.eks.node_role", tfdata)
+            == "module.eks.node_group.aws_iam_role.this"
+        )
+        assert (
+            plan_resolver.resolve_module_ref_to_value(
+                'module.eks.node_group["a"].size', tfdata
+            )
+            == "3"
+        )
+
+    def test_unresolvable(self):
+        tfdata = {"plandata": _plan()}
+        resolve = plan_resolver.resolve_module_ref_from_plan
+        assert resolve("module.eks.missing", tfdata) is None
+        assert resolve("module.eks.loop", tfdata) is None
+        assert resolve("module.eks", tfdata) is None
+        assert resolve("module.eks.cluster_id", {}) is None
@@ -0,0 +1,101 @@
+"""Unit tests for the --profile pipeline stage recorder."""
+
+import json
+import os
+import tracemalloc
+
+import pytest
+
+import modules.profiler as profiler
+
+
+def add_node(tfdata, name):
+    tfdata["graphdict"][name] = ["aws_vpc.main"]
+    return tfdata
+
+
+def explode(tfdata):
+    raise ValueError("stage failed")
+
+
+@pytest.fixture(autouse=True)
+def stop_profiler(tmp_path):
+    yield
+    profiler.finish(str(tmp_path / "leftover.json"))
+
+
+def test_run_is_a_plain_call_when_disabled():
+    tfdata = {"graphdict": {}}
+    assert profiler.run(add_node, tfdata, "aws_instance.web") is tfdata
+    assert not profiler.is_enabled()
+    assert profiler.finish("unused.json") is None
+
+
+def test_records_stage_timing_memory_and_graph_size(tmp_path):
+    profiler.start()
+    tfdata = {"graphdict": {"aws_vpc.main": []}}
+    profiler.run(add_node, tfdata, "aws_instance.web")
+    data = profiler.finish(str(tmp_path / "profile.json"))
+
+    (record,) = data["stages"]
+    assert record["stage"] == "test_profiler.add_node"
+    assert record["before"] == {"nodes": 1, "edges": 0}
+    assert record["after"] == {"nodes": 2, "edges": 1}
+    assert record["wall_s"] >= 0 and record["cpu_s"] >= 0 and record["peak_mb"] >= 0
+    with open(tmp_path / "profile.json") as f:
+        assert json.load(f) == data
+    assert not tracemalloc.is_tracing()
+
+
+def test_failed_stage_is_still_recorded(tmp_path):
+    profiler.start()
+    with pytest.raises(ValueError):
+        profiler.run(explode, {"graphdict": {}})
+    data = profiler.finish(str(tmp_path / "profile.json"))
+    assert [r["stage"] for r in data["stages"]] == ["test_profiler.explode"]
+
+
+def test_cprofile_dump_per_stage(tmp_path):
+    profiler.start(str(tmp_path / "prof"))
+    profiler.run(add_node, {"graphdict": {}}, "a")
+    profiler.run(add_node, {"graphdict": {}}, "b")
+    data = profiler.finish(str(tmp_path / "profile.json"))
+    dumps = [r["cprofile"] for r in data["stages"]]
+    assert [os.path.basename(d) for d in dumps] == [
+        "01-test_profiler.add_node.prof",
+        "02-test_profiler.add_node.prof",
+    ]
+    assert all(os.path.getsize(d) > 0 for d in dumps)
+
+
+def test_summary_table_marks_slowest_stage_and_count_changes():
+    data = {
+        "total_wall_s": 1.5,
+        "total_cpu_s": 1.2,
+        "stages": [
+            {
+                "stage": "graphmaker.add_relations",
+                "wall_s": 1.0,
+                "cpu_s": 0.9,
+                "peak_mb": 2.0,
+                "before": {"nodes": 3, "edges": 2},
+                "after": {"nodes": 3, "edges": 5},
+            },
+            {
+                "stage": "helpers.sort_graphdict",
+                "wall_s": 0.1,
+                "cpu_s": 0.1,
+                "peak_mb": 0.0,
+                "before": None,
+                "after": None,
+            },
+        ],
+    }
+    lines = profiler.summary_table(data).splitlines()
+    assert lines[0].split() == ["Stage", "Wall", "s", "CPU", "s", "Peak", "MB"] + [
+        "Nodes",
+        "Edges",
+    ]
+    assert lines[1].split()[-5:] == ["3", "2", "->", "5", "*"]
+    assert lines[2].split()[-2:] == ["-", "-"]
+    assert lines[3].split() == ["Total", "1.500", "1.200"]
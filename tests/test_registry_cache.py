@@ -0,0 +1,206 @@
+"""Tests for the registry response cache (modules/registry_cache.py)."""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import modules.fetch_manager as fetch_manager
+import modules.gitlibs as gitlibs
+import modules.module_cache as module_cache
+import modules.registry_cache as registry_cache
+
+
+class _RegistryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.seen.append((self.path, self.headers.get("If-None-Match")))
+        etag = f'"v{self.server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.endswith("/download"):
+            self.send_response(204)
+            self.send_header(
+                "X-Terraform-Get",
+                f"https://example.com/m.tgz?sig={len(self.server.seen)}",
+            )
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/missing"):
+            self.send_response(404)
+            body = b"{}"
+        else:
+            self.send_response(200)
+            body = json.dumps(
+                {"path": self.path, "version": self.server.version}
+            ).encode()
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_cache, "REGISTRY_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("TERRAVISION_OFFLINE", raising=False)
+    monkeypatch.delenv("TERRAVISION_REGISTRY_CACHE", raising=False)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RegistryHandler)
+    httpd.seen = []
+    httpd.version = 1
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    fetch_manager.close()
+
+
+class TestRegistryCache:
+    def test_fresh_entry_is_served_from_disk(self, registry):
+        first = registry_cache.get(registry.url + "/v1/modules/a", timeout=5)
+        second = registry_cache.get(registry.url + "/v1/modules/a", timeout=5)
+        assert first.json() == second.json() == {"path": "/v1/modules/a", "version": 1}
+        assert len(registry.seen) == 1
+        assert second.headers["etag"] == '"v1"'
+
+    def test_stale_entry_is_revalidated_with_etag(self, registry):
+        url = registry.url + "/v1/modules/a"
+        registry_cache.get(url, timeout=5)
+        response = registry_cache.get(url, ttl=0, timeout=5)
+        assert response.status_code == 200
+        assert response.json()["version"] == 1
+        assert registry.seen[-1] == ("/v1/modules/a", '"v1"')
+
+        registry.version = 2
+        assert registry_cache.get(url, ttl=0, timeout=5).json()["version"] == 2
+        assert registry_cache.get(url, timeout=5).json()["version"] == 2
+        assert len(registry.seen) == 3
+
+    def test_errors_are_not_cached(self, registry):
+        for _ in range(2):
+            assert (
+                registry_cache.get(registry.url + "/missing", timeout=5).status_code
+                == 404
+            )
+        assert len(registry.seen) == 2
+
+    def test_authorization_separates_entries(self, registry, tmp_path):
+        url = registry.url + "/v1/modules/private"
+        registry_cache.get(url, headers={"Authorization": "Bearer one"}, timeout=5)
+        registry_cache.get(url, headers={"Authorization": "Bearer two"}, timeout=5)
+        assert len(registry.seen) == 2
+        cached = list((tmp_path / "cache").glob("*.json"))
+        assert len(cached) == 2
+        assert all("Bearer" not in path.read_text() for path in cached)
+
+    def test_offline_mode(self, registry, monkeypatch):
+        url = registry.url + "/v1/modules/a"
+        registry_cache.get(url, timeout=5)
+        monkeypatch.setenv("TERRAVISION_OFFLINE", "1")
+        assert registry_cache.get(url, ttl=0, timeout=5).json()["version"] == 1
+        with pytest.raises(registry_cache.OfflineError):
+            registry_cache.get(registry.url + "/v1/modules/b", timeout=5)
+        assert len(registry.seen) == 1
+
+    def test_stale_entry_used_when_registry_unreachable(self, registry):
+        url = registry.url + "/v1/modules/a"
+        registry_cache.get(url, timeout=5)
+        registry.shutdown()
+        registry.server_close()
+        fetch_manager.close()
+        assert registry_cache.get(url, ttl=0, timeout=5).json()["version"] == 1
+
+    def test_download_url_is_not_cached(self, registry, tmp_path):
+        # Private registries hand out short-lived signed archive URLs
+        def resolve():
+            return gitlibs._resolve_registry_download_url(
+                registry.url + "/v1/modules/", "org/name/aws", "1.0.0", {}
+            )
+
+        assert resolve() == "https://example.com/m.tgz?sig=1"
+        assert resolve() == "https://example.com/m.tgz?sig=2"
+        assert not (tmp_path / "cache").exists()
+
+    def test_download_is_stored_by_module_version(
+        self, registry, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(gitlibs, "MODULE_DIR", str(tmp_path / "views"))
+        monkeypatch.setattr(module_cache, "STORE_DIR", str(tmp_path / "store"))
+        monkeypatch.setattr(module_cache, "_pending_prune", set())
+        monkeypatch.setattr(gitlibs, "_registry_store_keys", {})
+        os.makedirs(gitlibs.MODULE_DIR)
+        downloads = []
+
+        def fake_download(url, dest, subfolder="", local_file=""):
+            downloads.append(url)
+            with open(os.path.join(dest, "main.tf"), "w") as f:
+                f.write("")
+
+        monkeypatch.setattr(gitlibs, "_download_and_extract_archive", fake_download)
+        domain = registry.url + "/v1/modules/"
+
+        def load(module, version="1.0.0"):
+            url = gitlibs._resolve_registry_archive(domain, "org/name/aws", version, {})
+            monkeypatch.setattr(
+                gitlibs, "get_clone_url", lambda source, version="": (url, "", "")
+            )
+            return gitlibs.clone_files(
+                "example.com/org/name/aws", str(tmp_path / "tmp"), module, version
+            )
+
+        # Each resolution returns a new signed URL for the same version
+        first = load("first")
+        second = load("second")
+        assert downloads == ["https://example.com/m.tgz?sig=1"]
+        assert os.path.realpath(first) == os.path.realpath(second)
+        assert len(module_cache.list_entries()) == 1
+
+        # Offline, a stored version resolves without requesting /download
+        monkeypatch.setenv("TERRAVISION_OFFLINE", "1")
+        requests_sent = len(registry.seen)
+        assert os.path.realpath(load("offline")) == os.path.realpath(first)
+        assert len(registry.seen) == requests_sent
+        assert len(downloads) == 1
+        with pytest.raises(registry_cache.OfflineError):
+            load("missing", "2.0.0")
+
+
+class TestRegistryMemoization:
+    def test_version_resolution_is_memoized(self):
+        gitlibs._resolve_version_constraint_cached.cache_clear()
+        versions = ["5.0.0", "5.1.0", "6.0.0"]
+        assert gitlibs._resolve_version_constraint("~> 5.0", versions) == "5.1.0"
+        assert gitlibs._resolve_version_constraint(" ~> 5.0", list(versions)) == "5.1.0"
+        assert gitlibs._resolve_version_constraint_cached.cache_info().hits == 1
+        assert gitlibs._select_registry_version("", versions) == "6.0.0"
+
+    def test_registry_sources_resolved_once_per_constraint(self, monkeypatch):
+        calls = []
+
+        def fake_registry(source, constraint=""):
+            calls.append((source, constraint))
+            return ("https://github.com/org/repo", "", f"tag-{len(calls)}")
+
+        monkeypatch.setattr(gitlibs, "_handle_registry_url", fake_registry)
+        monkeypatch.setattr(gitlibs, "_registry_resolutions", {})
+        first = gitlibs.get_clone_url("org/name/aws", "~> 5.0")
+        second = gitlibs.get_clone_url("org/name/aws", "~> 5.0")
+        other = gitlibs.get_clone_url("org/name/aws", "~> 6.0")
+        assert first == second
+        assert other != first
+        assert len(calls) == 2
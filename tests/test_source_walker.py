@@ -0,0 +1,96 @@
+"""Tests for recursive source discovery (modules/source_walker.py)."""
+
+import os
+
+import pytest
+
+import modules.fileparser as fileparser
+import modules.source_walker as source_walker
+
+
+def _touch(root, *names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# x\n")
+
+
+def _relpaths(root, **kwargs):
+    return [f.relpath for f in source_walker.walk(str(root), **kwargs)]
+
+
+class TestIgnoreRules:
+    @pytest.mark.parametrize(
+        "pattern, relpath, is_dir, expected",
+        [
+            ("*.tfvars", "env/prod.tfvars", False, True),
+            ("/main.tf", "main.tf", False, True),
+            ("/main.tf", "modules/main.tf", False, False),
+            ("modules/*.tf", "modules/a.tf", False, True),
+            ("modules/*.tf", "modules/x/a.tf", False, False),
+            ("modules/**/a.tf", "modules/x/y/a.tf", False, True),
+            ("build/", "build", False, False),
+            ("build/", "src/build", True, True),
+            ("file[0-9].tf", "file7.tf", False, True),
+        ],
+    )
+    def test_patterns(self, pattern, relpath, is_dir, expected):
+        rules = [source_walker.compile_rule(pattern)]
+        assert source_walker.is_ignored(relpath, is_dir, rules) is expected
+
+    def test_last_match_wins(self):
+        rules = [source_walker.compile_rule(p) for p in ("*.tf", "!keep.tf")]
+        assert source_walker.is_ignored("drop.tf", False, rules)
+        assert not source_walker.is_ignored("keep.tf", False, rules)
+
+    def test_comments_and_blank_lines(self):
+        assert source_walker.compile_rule("# comment") is None
+        assert source_walker.compile_rule("   ") is None
+
+
+class TestWalk:
+    def test_skips_default_folders_and_returns_stats(self, tmp_path):
+        _touch(
+            tmp_path,
+            "main.tf",
+            "modules/vpc/main.tf",
+            ".terraform/modules/x/main.tf",
+            ".git/hooks/x.tf",
+            "node_modules/pkg/index.tf",
+            "stack/.terragrunt-cache/abc/main.tf",
+        )
+        files = list(source_walker.walk(str(tmp_path)))
+        assert [f.relpath for f in files] == ["main.tf", "modules/vpc/main.tf"]
+        info = os.stat(tmp_path / "main.tf")
+        assert (files[0].size, files[0].mtime_ns) == (info.st_size, info.st_mtime_ns)
+
+    def test_terraformignore_and_environment(self, tmp_path, monkeypatch):
+        _touch(tmp_path, "main.tf", "vendor/a.tf", "examples/b.tf", "keep/c.tf")
+        (tmp_path / ".terraformignore").write_text("# local\nvendor/\n")
+        monkeypatch.setenv("TERRAVISION_IGNORE", "examples/")
+        assert _relpaths(tmp_path, suffixes=(".tf",)) == ["main.tf", "keep/c.tf"]
+
+    def test_symlink_loops_terminate(self, tmp_path):
+        _touch(tmp_path, "a/main.tf")
+        os.symlink(tmp_path, tmp_path / "a" / "loop")
+        os.symlink(tmp_path / "missing", tmp_path / "a" / "dangling.tf")
+        assert _relpaths(tmp_path) == ["a/main.tf"]
+
+
+class TestFindTfFilesRecursive:
+    def test_lists_nested_files_once(self, tmp_path):
+        _touch(
+            tmp_path,
+            "main.tf",
+            "a/b/nested.tf",
+            "a/prod.auto.tfvars",
+            "a/notes.md",
+            ".terraform/modules/m/main.tf",
+        )
+        paths = fileparser.find_tf_files(str(tmp_path), [], recursive=True)
+        rel = sorted(os.path.relpath(p, tmp_path) for p in paths)
+        assert rel == [
+            os.path.join("a", "b", "nested.tf"),
+            os.path.join("a", "prod.auto.tfvars"),
+            "main.tf",
+        ]
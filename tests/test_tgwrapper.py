@@ -1,8 +1,11 @@
 """Tests for Terragrunt wrapper module."""
 
+import json
 import os
 import shutil
 import tempfile
+import threading
+import time
 from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
@@ -466,6 +469,268 @@ class TestInjectDependencyRefs:
         )
 
 
+class TestRunAllModules:
+    """Tests for _run_all_modules() with serial and parallel planning."""
+
+    @pytest.fixture(autouse=True)
+    def no_plan_cache(self, monkeypatch):
+        monkeypatch.setenv("TERRAVISION_PLAN_CACHE", "off")
+
+    @staticmethod
+    def _fake_initplan(events, delays, output=None):
+        """Build a tg_initplan stand-in that records start/finish events."""
+        lock = threading.Lock()
+
+        def fake(source, varfile, workspace, debug, upgrade, tf_data_dir=""):
+            name = os.path.basename(source)
+            with lock:
+                events.append(("start", name))
+            tgwrapper._echo(f"planning {name}")
+            time.sleep(delays.get(name, 0))
+            with lock:
+                events.append(("finish", name))
+            if output is not None:
+                output[name] = tf_data_dir
+            return {
+                "codepath": os.path.join(source, ".terragrunt-cache"),
+                "tf_resources_created": [
+                    {"address": f"aws_instance.{name}", "type": "aws_instance"}
+                ],
+                "tfgraph": {
+                    "objects": [{"_gvid": 0, "name": f"aws_instance.{name}"}],
+                    "edges": [{"_gvid": 0, "tail": 0, "head": 0}],
+                },
+            }
+
+        return fake
+
+    @staticmethod
+    def _modules(root, *names):
+        paths = []
+        for name in names:
+            path = os.path.join(root, name)
+            os.makedirs(path, exist_ok=True)
+            paths.append(path)
+        return paths
+
+    def _run(self, root, modules, jobs, deps=None, delays=None):
+        events = []
+        deps = deps or {}
+
+        def fake_deps(module_path):
+            name = os.path.basename(module_path)
+            return {
+                "dependencies": {
+                    dep: os.path.join(root, dep) for dep in deps.get(name, [])
+                },
+                "dep_inputs": {},
+            }
+
+        with (
+            patch.object(
+                tgwrapper, "tg_initplan", self._fake_initplan(events, delays or {})
+            ),
+            patch.object(tgwrapper, "_parse_tg_dependencies", fake_deps),
+        ):
+            merged = tgwrapper._run_all_modules(
+                root, modules, [], "default", False, False, jobs
+            )
+        return merged, events
+
+    def test_parallel_merge_is_identical_to_serial(self, tmpdir):
+        modules = self._modules(tmpdir, "a", "b", "c", "d")
+        delays = {"a": 0.2, "b": 0.1, "c": 0.05}
+        serial, _ = self._run(tmpdir, modules, 1, delays=delays)
+        parallel, events = self._run(tmpdir, modules, 4, delays=delays)
+        assert json.dumps(parallel, sort_keys=False) == json.dumps(
+            serial, sort_keys=False
+        )
+        # All four started before the slowest one finished
+        finish_a = events.index(("finish", "a"))
+        assert all(events.index(("start", m)) < finish_a for m in "abcd")
+
+    def test_dependencies_are_planned_first(self, tmpdir):
+        modules = self._modules(tmpdir, "app", "db", "vpc")
+        deps = {"app": ["vpc", "db"], "db": ["vpc"]}
+        _, events = self._run(tmpdir, modules, 3, deps=deps)
+        assert events == [
+            ("start", "vpc"),
+            ("finish", "vpc"),
+            ("start", "db"),
+            ("finish", "db"),
+            ("start", "app"),
+            ("finish", "app"),
+        ]
+
+    def test_modules_sharing_a_dependency_do_not_overlap(self, tmpdir):
+        modules = self._modules(tmpdir, "a", "b")
+        # Both read outputs from the same module outside the source tree
+        shared = os.path.join(tmpdir, "..", "shared")
+        deps = {"a": [shared], "b": [shared]}
+        _, events = self._run(tmpdir, modules, 2, deps=deps, delays={"a": 0.05})
+        assert events == [
+            ("start", "a"),
+            ("finish", "a"),
+            ("start", "b"),
+            ("finish", "b"),
+        ]
+
+    def test_output_is_replayed_in_module_order(self, tmpdir, capsys):
+        modules = self._modules(tmpdir, "a", "b")
+        self._run(tmpdir, modules, 2, delays={"a": 0.1})
+        out = capsys.readouterr().out
+        assert out.index("planning a") < out.index("Processing Terragrunt module: b")
+        assert out.index("planning b") > out.index("planning a")
+
+    def test_each_parallel_module_gets_its_own_data_dir(self, tmpdir):
+        modules = self._modules(tmpdir, "a", "b")
+        data_dirs = {}
+        with (
+            patch.object(
+                tgwrapper, "tg_initplan", self._fake_initplan([], {}, data_dirs)
+            ),
+            patch.object(
+                tgwrapper,
+                "_parse_tg_dependencies",
+                return_value={"dependencies": {}, "dep_inputs": {}},
+            ),
+        ):
+            tgwrapper._run_all_modules(tmpdir, modules, [], "default", False, False, 2)
+        assert data_dirs["a"] != data_dirs["b"]
+        assert all(os.path.isdir(d) for d in data_dirs.values())
+
+    def test_first_failing_module_error_is_raised(self, tmpdir):
+        modules = self._modules(tmpdir, "a", "b")
+
+        def failing(source, *args, **kwargs):
+            name = os.path.basename(source)
+            if name == "a":
+                time.sleep(0.05)
+            raise RuntimeError(f"plan failed in {name}")
+
+        with (
+            patch.object(tgwrapper, "tg_initplan", failing),
+            patch.object(
+                tgwrapper,
+                "_parse_tg_dependencies",
+                return_value={"dependencies": {}, "dep_inputs": {}},
+            ),
+        ):
+            with pytest.raises(RuntimeError, match="plan failed in a"):
+                tgwrapper._run_all_modules(
+                    tmpdir, modules, [], "default", False, False, 2
+                )
+
+
+class TestIncrementalRunAllModules:
+    """Tests for reusing cached plans of unchanged child modules."""
+
+    @pytest.fixture
+    def stack(self, tmpdir, monkeypatch):
+        """A stack of vpc, app (depends on vpc) and db, with cache enabled."""
+        monkeypatch.setenv("TERRAVISION_PLAN_CACHE", "on")
+        monkeypatch.setattr(
+            tgwrapper.plan_cache, "PLAN_CACHE_DIR", os.path.join(tmpdir, "cache")
+        )
+        monkeypatch.setattr(tgwrapper.plan_cache, "_tf_version", lambda: "v1.9.0")
+        monkeypatch.setattr(tgwrapper, "check_terragrunt_version", lambda: "0.67.0")
+        root = os.path.join(tmpdir, "live")
+        hcl = {
+            "vpc": 'terraform {\n  source = "../../modules//vpc"\n}\n',
+            "app": 'dependency "vpc" {\n  config_path = "../vpc"\n}\n',
+            "db": "inputs = {}\n",
+        }
+        modules = []
+        for name in ("app", "db", "vpc"):
+            path = os.path.join(root, name)
+            cache = os.path.join(path, ".terragrunt-cache", "h1", "h2")
+            os.makedirs(cache)
+            with open(os.path.join(cache, "backend.tf"), "w") as f:
+                f.write("# Generated by Terragrunt\n")
+            with open(os.path.join(path, "terragrunt.hcl"), "w") as f:
+                f.write(hcl[name])
+            modules.append(path)
+        os.makedirs(os.path.join(tmpdir, "modules", "vpc"))
+        with open(os.path.join(tmpdir, "modules", "vpc", "main.tf"), "w") as f:
+            f.write('resource "aws_vpc" "this" {}\n')
+        with open(os.path.join(tmpdir, "root.hcl"), "w") as f:
+            f.write("locals {}\n")
+        return root, modules
+
+    @staticmethod
+    def _run(root, modules, upgrade=False):
+        planned = []
+
+        def fake_initplan(source, varfile, workspace, debug, upgrade, tf_data_dir=""):
+            name = os.path.basename(source)
+            planned.append(name)
+            plan = {
+                "resource_changes": [
+                    {"address": f"aws_instance.{name}", "type": "aws_instance"}
+                ]
+            }
+            graph = {"objects": [{"_gvid": 0, "name": f"aws_instance.{name}"}]}
+            return tgwrapper._module_tfdata(
+                tgwrapper._find_terragrunt_cache_dir(source), plan, graph
+            )
+
+        with patch.object(tgwrapper, "tg_initplan", fake_initplan):
+            merged = tgwrapper._run_all_modules(
+                root, modules, [], "default", False, upgrade
+            )
+        return merged, planned
+
+    def test_unchanged_stack_is_not_replanned(self, stack):
+        root, modules = stack
+        first, planned = self._run(root, modules)
+        assert planned == ["app", "db", "vpc"]
+        second, planned = self._run(root, modules)
+        assert planned == []
+        assert second["tfgraph"] == first["tfgraph"]
+        assert second["tf_resources_created"] == first["tf_resources_created"]
+        assert second["codepath"] == first["codepath"]
+
+    def test_changed_module_and_its_dependents_are_replanned(self, stack):
+        root, modules = stack
+        self._run(root, modules)
+        with open(os.path.join(root, "vpc", "terragrunt.hcl"), "a") as f:
+            f.write('inputs = { cidr = "10.1.0.0/16" }\n')
+        _, planned = self._run(root, modules)
+        assert planned == ["app", "vpc"]
+
+    def test_local_source_and_parent_config_changes_are_detected(self, stack):
+        root, modules = stack
+        self._run(root, modules)
+        source_tf = os.path.join(root, "..", "modules", "vpc", "main.tf")
+        with open(source_tf, "a") as f:
+            f.write('resource "aws_subnet" "a" {}\n')
+        _, planned = self._run(root, modules)
+        assert planned == ["app", "vpc"]
+        with open(os.path.join(root, "..", "root.hcl"), "a") as f:
+            f.write("# shared settings changed\n")
+        _, planned = self._run(root, modules)
+        assert planned == ["app", "db", "vpc"]
+
+    def test_upgrade_replans_everything(self, stack):
+        root, modules = stack
+        self._run(root, modules)
+        _, planned = self._run(root, modules, upgrade=True)
+        assert planned == ["app", "db", "vpc"]
+
+    def test_missing_terragrunt_cache_forces_replan(self, stack):
+        root, modules = stack
+        self._run(root, modules)
+        shutil.rmtree(os.path.join(root, "db", ".terragrunt-cache", "h1"))
+        os.makedirs(os.path.join(root, "db", ".terragrunt-cache"), exist_ok=True)
+
+        def fake_initplan(source, *args, **kwargs):
+            raise RuntimeError("replanned " + os.path.basename(source))
+
+        with patch.object(tgwrapper, "tg_initplan", fake_initplan):
+            with pytest.raises(RuntimeError, match="replanned db"):
+                tgwrapper._run_all_modules(root, modules, [], "default", False, False)
+
+
 class TestTgIntegration:
     """Single comprehensive integration test for Terragrunt.
 
@@ -1,12 +1,20 @@
 """Unit tests for tfwrapper helper functions."""
 
+import json
+from pathlib import Path
+
 import pytest
 
 from modules import helpers
 from modules.tfwrapper import (
     find_node_in_gvid_table,
     setup_tfdata,
+    tf_makegraph,
+    _build_edge_adjacency,
+    _build_gvid_index,
+    _GraphdictKeyIndex,
     _normalize_for_gvid_match,
+    _process_edges,
 )
 
 
@@ -120,3 +128,150 @@ def test_for_each_key_appended_when_address_lacks_it():
     """Defensive: honour `index` if a plan ever omits it from `address`."""
     nodes = _nodes_for(_resource_change("aws_subnet.private", index="web"))
     assert nodes == ["aws_subnet.private[web]"]
+
+
+# ---------------------------------------------------------------------------
+# Indexed edge walk (_process_edges / tf_makegraph)
+# ---------------------------------------------------------------------------
+
+
+def test_gvid_index_keeps_first_occurrence():
+    table = ["aws_instance.web", "aws_s3_bucket.data", "aws_instance.web"]
+    index = _build_gvid_index(table)
+    assert index["aws_instance.web"] == 0
+    assert find_node_in_gvid_table("aws_instance.web[0]~1", table, index) == 0
+
+
+def test_edge_adjacency_preserves_edge_order():
+    edges = [
+        {"head": 0, "tail": 2},
+        {"head": 1, "tail": 0},
+        {"head": 0, "tail": 1},
+    ]
+    assert _build_edge_adjacency(edges) == {0: [2, 1], 1: [0]}
+    assert _build_edge_adjacency(None) == {}
+
+
+def test_process_edges_expands_generic_connection_to_single_instance():
+    tfdata = {
+        "graphdict": {"aws_instance.web": [], "aws_s3_bucket.data[0]~1": []},
+        "tfgraph": {"edges": [{"head": 0, "tail": 1}]},
+    }
+    _process_edges(tfdata, ["aws_instance.web", "aws_s3_bucket.data"], [])
+    assert tfdata["graphdict"]["aws_instance.web"] == ["aws_s3_bucket.data[0]~1"]
+
+
+def test_process_edges_reverse_arrow_adds_missing_node():
+    tfdata = {
+        "graphdict": {
+            "aws_s3_bucket.site": [],
+            "module.cdn.aws_cloudfront_distribution.this": [],
+        },
+        "tfgraph": {"edges": [{"head": 0, "tail": 1}]},
+    }
+    gvid_table = ["aws_s3_bucket.site", "aws_cloudfront_distribution.this"]
+    _process_edges(tfdata, gvid_table, ["aws_cloudfront"])
+    assert tfdata["graphdict"]["aws_cloudfront_distribution.this"] == [
+        "aws_s3_bucket.site"
+    ]
+    assert tfdata["graphdict"]["aws_s3_bucket.site"] == []
+
+
+def test_graphdict_key_index_sees_added_keys():
+    key_index = _GraphdictKeyIndex(["aws_vpc.main"])
+    assert not key_index.any_key_contains("aws_subnet.a")
+    key_index.add("module.net.aws_subnet.a[0]~1")
+    assert key_index.any_key_contains("aws_subnet.a")
+    assert key_index.keys_starting_with("module.net.") == [
+        "module.net.aws_subnet.a[0]~1"
+    ]
+
+
+def test_tf_makegraph_matches_recorded_bastion_graph():
+    with open(Path(__file__).parent / "json" / "bastion-tfdata.json") as f:
+        recorded = json.load(f)
+    tfdata = {
+        "tf_resources_created": recorded["tf_resources_created"],
+        "tfgraph": recorded["tfgraph"],
+    }
+    tfdata = tf_makegraph(tfdata, False)
+    assert tfdata["graphdict"] == recorded["original_graphdict"]
+
+
+# ---------------------------------------------------------------------------
+# _decode_plan: show -json and graph run concurrently
+# ---------------------------------------------------------------------------
+
+
+def _fake_tf_binary(tmp_path, show_script, graph_script):
+    """Write an executable standing in for terraform show/graph."""
+    binary = tmp_path / "fake-terraform"
+    binary.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "show" ]; then\n'
+        f"{show_script}\n"
+        "else\n"
+        f"{graph_script}\n"
+        "fi\n"
+    )
+    binary.chmod(0o755)
+    return str(binary)
+
+
+def _decode_paths(tmp_path):
+    tfplan = tmp_path / "tfplan.bin"
+    tfplan.write_text("binary plan")
+    return str(tfplan), str(tmp_path / "tfplan.json"), str(tmp_path / "tfgraph.dot")
+
+
+def test_decode_plan_returns_plan_and_converted_graph(tmp_path, monkeypatch):
+    import modules.tfwrapper as tfwrapper
+
+    binary = _fake_tf_binary(
+        tmp_path,
+        "echo '{\"resource_changes\": []}'",
+        "echo 'digraph { }'",
+    )
+    monkeypatch.setattr(helpers, "get_tf_binary", lambda: binary)
+    monkeypatch.setattr(
+        tfwrapper, "convert_dot_to_json", lambda path: {"dot": open(path).read()}
+    )
+    plandata, graphdata = tfwrapper._decode_plan(*_decode_paths(tmp_path), False)
+    assert plandata == {"resource_changes": []}
+    assert graphdata == {"dot": "digraph { }\n"}
+
+
+def test_decode_plan_show_failure_exits_and_stops_graph(tmp_path, monkeypatch):
+    import time
+
+    import modules.tfwrapper as tfwrapper
+
+    binary = _fake_tf_binary(
+        tmp_path,
+        "echo 'bad plan' >&2; exit 3",
+        "exec sleep 30",
+    )
+    monkeypatch.setattr(helpers, "get_tf_binary", lambda: binary)
+    started = time.monotonic()
+    with pytest.raises(SystemExit) as excinfo:
+        tfwrapper._decode_plan(*_decode_paths(tmp_path), False)
+    assert excinfo.value.code == 3
+    # The sleeping graph command was terminated rather than waited for
+    assert time.monotonic() - started < 10
+
+
+def test_decode_plan_graph_failure_reports_graph_error(tmp_path, monkeypatch, capsys):
+    import modules.tfwrapper as tfwrapper
+
+    binary = _fake_tf_binary(
+        tmp_path,
+        "echo '{}'",
+        "echo 'no graph' >&2; exit 2",
+    )
+    monkeypatch.setattr(helpers, "get_tf_binary", lambda: binary)
+    with pytest.raises(SystemExit) as excinfo:
+        tfwrapper._decode_plan(*_decode_paths(tmp_path), False)
+    assert excinfo.value.code == 2
+    out = capsys.readouterr().out
+    assert "graph' command" in out
+    assert "no graph" in out